@@ -1,24 +1,57 @@
 from fastapi import APIRouter, HTTPException, File, UploadFile, Query
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 import os
 from backend.service.redis_service import RedisClient
 from backend.service.resume_service import ResumeService
 from backend.service.job_service import JobService
 from backend.service.matching_service import MatchingService
+from backend.service.tiered_cache import get_cache_stats
+from backend.service.prefetch_service import JobPrefetcher
+from backend.core.database import get_db_pool_stats
 from backend.core.logger import logger
 
 router = APIRouter(prefix="/api")
 
-# Service instances
-resume_service = ResumeService()
-job_service = JobService()
-matching_service = MatchingService(resume_service, job_service)
+# Service instances, created on first use (or during warm-up) instead of at import
+@lru_cache
+def get_resume_service() -> ResumeService:
+    return ResumeService()
+
+@lru_cache
+def get_job_service() -> JobService:
+    return JobService()
+
+@lru_cache
+def get_matching_service() -> MatchingService:
+    return MatchingService(get_resume_service(), get_job_service())
+
+@lru_cache
+def get_job_prefetcher() -> JobPrefetcher:
+    return JobPrefetcher(get_job_service())
+
+def shutdown_services():
+    """Release resources held by the services that were created"""
+    if get_job_service.cache_info().currsize:
+        get_job_service().shutdown()
 
 @router.get("/")
 async def hello_world():
     logger.info("Hello World") 
     return {"message": "Hello World"}
 
+@router.get("/metrics", tags=["metrics"])
+async def get_metrics():
+    """
+    Metrics for this worker: LinkedIn fetch queue depth and latency, cache hit rates, database pool.
+    """
+    metrics = {"caches": get_cache_stats(), "db_pool": get_db_pool_stats()}
+    if get_job_service.cache_info().currsize:
+        metrics["linkedin"] = get_job_service().linkedin_scheduler.stats()
+    if get_job_prefetcher.cache_info().currsize:
+        metrics["prefetch"] = get_job_prefetcher().stats()
+    return metrics
+
 @router.post("/resumes/upload", tags=["resumes"])
 async def upload_resume(
     file: UploadFile = File(...),
@@ -41,7 +74,7 @@ async def upload_resume(
         
         try:
             # Process resume
-            resume_data = await resume_service.process_resume_file(
+            resume_data = await get_resume_service().process_resume_file(
                 file_path,
                 user_id,
                 file.content_type
@@ -55,7 +88,7 @@ async def upload_resume(
     
 
             # Store database and redis cache
-            resume_id = await resume_service.save_resume(resume_data)
+            resume_id = await get_resume_service().save_resume(resume_data)
             
             return {
                 "message": "Resume uploaded and processed successfully",
@@ -81,7 +114,7 @@ async def get_latest_resume_by_user_id(user_id: str = Query(..., description="Us
     """
     # logger.info(f"Getting latest resume for user {user_id}")
     try:
-        resume = await resume_service.get_resume_by_user_id(user_id)
+        resume = await get_resume_service().get_resume_by_user_id(user_id)
         return resume
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting resume: {str(e)}")
@@ -94,17 +127,19 @@ async def search_jobs_and_match(
     job_type: List[str] = Query(["F", "C"], description="Job type codes (F=Full-time, C=Contract)"),
     remote: List[str] = Query(["2"], description="Remote work codes"),
     limit: int = Query(50, description="Maximum number of jobs to return"),
-    user_id: str = Query(..., description="User ID for matching with uploaded resume")
+    user_id: str = Query(..., description="User ID for matching with uploaded resume"),
+    top_k: Optional[int] = Query(None, description="Only return the best top_k matches"),
+    min_score: Optional[float] = Query(None, description="Only return matches scoring at least this")
 ):
     """
     Search for jobs and match them with the user's most recently uploaded resume.
-    Returns jobs sorted by match score.
+    Returns jobs sorted by match score; match details are only built for the matches returned.
     """
     logger.info(f"Searching for jobs and matching with user {user_id}")
     try:
         # Get user's most recent resume
         # logger.info(f"Getting latest resume for user {user_id}")
-        resume = await resume_service.get_resume_by_user_id(user_id)
+        resume = await get_resume_service().get_resume_by_user_id(user_id)
         if not resume:
             raise HTTPException(
                 status_code=404,
@@ -121,26 +156,28 @@ async def search_jobs_and_match(
             "limit": limit
         }
         
-        # Search for jobs
-        logger.info(f"Searching for jobs with params {search_params}")
-        jobs = await job_service.search_jobs_parallel([search_params])
-        
-        # Store jobs in database and cache if not already present
-        for job in jobs:
-           await job_service.save_job(job)
-            
+        # Serve prefetched jobs for saved searches; otherwise search now (newly processed
+        # jobs are bulk-saved to the database and cache) and save the search for prefetching
+        jobs = await get_job_prefetcher().get_prefetched_jobs(search_params)
+        if jobs is None:
+            logger.info(f"Searching for jobs with params {search_params}")
+            jobs = await get_job_prefetcher().search_live(search_params)
+        else:
+            await get_job_prefetcher().record_search(search_params)
         
         # Match jobs with resume
         # logger.info(f"Matching resume to jobs for user {user_id}")
-        matches = await matching_service.match_resume_to_jobs(  
+        matches = await get_matching_service().match_resume_to_jobs(  
             # Assuming resume path is stored
             jobs,
-            user_id
+            user_id,
+            k=top_k,
+            min_score=min_score
         )
         
         # Store match results
         logger.info(f"Storing match results for user {user_id}")
-        await matching_service.store_match_results(matches)
+        await get_matching_service().store_match_results(matches)
         
         return {
             "message": "Jobs found and matched successfully",
@@ -163,12 +200,12 @@ async def get_job(job_id: str):
     try:
         # Try to get from cache/database
         # print("Getting job by id", job_id)
-        job = await job_service.get_job_by_id(job_id)
+        job = await get_job_service().get_job_by_id(job_id)
         if not job:
             # If not found, fetch from LinkedIn
-            job = await job_service.get_job_by_id(job_id)
+            job = await get_job_service().get_job_by_id(job_id)
             if job:
-                await job_service.save_job(job)
+                await get_job_service().save_job(job)
         
         return job
         
@@ -178,6 +215,31 @@ async def get_job(job_id: str):
             detail=f"Error retrieving job: {str(e)}"
         )
 
+@router.get("/matches/stored", tags=["matching"])
+async def get_stored_matches(
+    user_id: str = Query(..., description="User ID to match stored jobs for"),
+    limit: int = Query(20, description="Maximum number of matches to return"),
+    min_score: float = Query(50, description="Minimum match score to return")
+):
+    """
+    Best matches for a user's resume among all jobs already stored, without searching LinkedIn.
+    """
+    try:
+        matches = await get_matching_service().get_stored_matches_for_user(user_id, limit, min_score)
+        return {
+            "user_id": user_id,
+            "total_matches": len(matches),
+            "matches": matches
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error matching stored jobs: {str(e)}"
+        )
+
 @router.get("/matches/history", tags=["matching"])
 async def get_match_history(
     user_id: str = Query(..., description="User ID to get match history for"),
@@ -189,7 +251,7 @@ async def get_match_history(
     """
     # logger.info(f"Getting match history for user {user_id}")
     try:
-        matches = await matching_service.get_job_and_matches_for_resume(user_id, limit, min_score)
+        matches = await get_matching_service().get_job_and_matches_for_resume(user_id, limit, min_score)
         return {
             "user_id": user_id,
             "total_matches": len(matches),
@@ -1,8 +1,12 @@
 # app/config.py
 from pydantic import BaseModel
 from functools import lru_cache
+from pathlib import Path
 import os
 
+# Repository root; relative data paths are resolved against it, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 
 class Settings(BaseModel):
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
@@ -10,6 +14,21 @@ class Settings(BaseModel):
     DB_NAME: str = os.getenv("DB_NAME", "job_search_match")
     DB_USER: str = os.getenv("DB_USER", "job_search_match")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "job_search_match")
+    # Async connection pool
+    DB_POOL_MIN_SIZE: int = os.getenv("DB_POOL_MIN_SIZE", 2)
+    DB_POOL_MAX_SIZE: int = os.getenv("DB_POOL_MAX_SIZE", 10)
+    # Seconds a request waits for a free pooled connection
+    DB_POOL_TIMEOUT: float = os.getenv("DB_POOL_TIMEOUT", 30)
+    # Server-side limit per statement, in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000)
+    # Matrix form of the job features (see backend/repository/jobFeatureStore.py)
+    JOB_FEATURE_STORE_PATH: str = os.getenv("JOB_FEATURE_STORE_PATH", "data/job_feature_store.npz")
+    # 'reader': never writes the file, and reloads it when the owner replaces it.
+    # 'owner': writes the file and pulls rows other processes saved from Postgres.
+    # Set 'owner' on exactly one process (e.g. the prefetch worker); API workers stay readers.
+    JOB_FEATURE_STORE_ROLE: str = os.getenv("JOB_FEATURE_STORE_ROLE", "reader")
+    # Precompiled skills taxonomy (see backend/utils/skills_taxonomy.py); a cache, safe to delete
+    SKILL_TAXONOMY_ARTIFACT_PATH: str = os.getenv("SKILL_TAXONOMY_ARTIFACT_PATH", "data/skills_taxonomy.pkl")
 
 @lru_cache
 def get_settings():
@@ -1,10 +1,12 @@
 # app/core/database.py
-import psycopg2
-import redis
+import asyncio
+import psycopg
 import json
-from psycopg2.extras import RealDictCursor
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from contextlib import contextmanager
 from datetime import datetime
+from typing import Optional
 
 from backend.core.config import settings
 from backend.service.redis_service import RedisClient
@@ -18,22 +20,27 @@ class Database:
         self.connection = None
         self.cursor = None
 
+def _connection_kwargs():
+    """Connection parameters shared by the pool and one-off connections"""
+    kwargs = {
+        "host": settings.DB_HOST,
+        "port": settings.DB_PORT,
+        "dbname": settings.DB_NAME,
+        "user": settings.DB_USER,
+        "password": settings.DB_PASSWORD,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        kwargs["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return kwargs
+
 def get_db_connection():
     """
     Create and return a connection to the PostgreSQL database.
+    Only used by blocking startup code; request handlers go through the async pool.
     """
     try:
-        connection = psycopg2.connect(
-            host=settings.DB_HOST,
-            port=settings.DB_PORT,
-            dbname=settings.DB_NAME,
-            user=settings.DB_USER,
-            password=settings.DB_PASSWORD
-        )
         # Set autocommit to False to manage transactions explicitly
-        connection.autocommit = False
-        
-        return connection
+        return psycopg.connect(autocommit=False, **_connection_kwargs())
     except Exception as e:
         logger.error(f"Database connection error: {str(e)}")
         raise Exception(f"Failed to connect to database: {str(e)}")
@@ -50,9 +57,10 @@ def get_db_cursor(commit=True):
             results = cursor.fetchall()
     """
     connection = None
+    cursor = None
     try:
         connection = get_db_connection()
-        cursor = connection.cursor(cursor_factory=RealDictCursor) # return results as dictionaries
+        cursor = connection.cursor(row_factory=dict_row) # return results as dictionaries
         yield cursor  # yield: return the cursor object to the caller
         if commit:
             connection.commit()
@@ -63,24 +71,70 @@ def get_db_cursor(commit=True):
         raise
     finally:
         if connection:
-            cursor.close()
+            if cursor:
+                cursor.close()
             connection.close()
 
+# Async connection pool shared by all repositories, opened on startup or first use
+_pool: Optional[AsyncConnectionPool] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+async def open_db_pool() -> AsyncConnectionPool:
+    """Open the shared connection pool and wait until min_size connections are ready"""
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            pool = AsyncConnectionPool(
+                kwargs=_connection_kwargs(),
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                timeout=settings.DB_POOL_TIMEOUT,
+                open=False,
+            )
+            await pool.open(wait=True)
+            _pool = pool
+            logger.info(f"Database pool opened (min={settings.DB_POOL_MIN_SIZE}, max={settings.DB_POOL_MAX_SIZE})")
+    return _pool
+
+async def close_db_pool():
+    """Close the shared connection pool"""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+        logger.info("Database pool closed")
+
+def get_db_pool_stats() -> dict:
+    """
+    Pool metrics: size, available connections, waiting requests, wait times, errors.
+    See psycopg_pool's get_stats() for the full list of keys.
+    """
+    if _pool is None:
+        return {}
+    return _pool.get_stats()
+
 async def execute_query(query, params=None, fetch_one=False):
     """
     Execute a query and return results.
     # Example usage:
-    resume = execute_query(
+    resume = await execute_query(
         "SELECT * FROM user_resumes WHERE resume_id = %s", 
         (resume_id,), 
         fetch_one=True
     )
     """
-    with get_db_cursor() as cursor:
-        cursor.execute(query, params or ())
-        if fetch_one:
-            return cursor.fetchone()
-        return cursor.fetchall()
+    pool = await open_db_pool()
+    # The pooled connection commits on success and rolls back on error
+    async with pool.connection() as connection:
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(query, params or ())
+            if fetch_one:
+                return await cursor.fetchone()
+            return await cursor.fetchall()
 
 async def execute_with_commit(query, params=None):
     """
@@ -88,13 +142,34 @@ async def execute_with_commit(query, params=None):
     Returns True if successful, False otherwise.
     """
     try:
-        with get_db_cursor(commit=True) as cursor:
-            cursor.execute(query, params or ())
+        pool = await open_db_pool()
+        async with pool.connection() as connection:
+            await connection.execute(query, params or ())
             return True
     except Exception as e:
         logger.error(f"Error executing query with commit: {str(e)}")
         return False
 
+async def execute_copy_merge(staging_sql, copy_sql, rows, merge_query, merge_params=None):
+    """
+    Bulk write in one transaction: create a temp staging table, COPY rows into it,
+    then run merge_query (typically INSERT ... SELECT ... ON CONFLICT ... RETURNING)
+    and return its rows.
+    
+    staging_sql must create the temp table with ON COMMIT DROP.
+    """
+    pool = await open_db_pool()
+    async with pool.connection() as connection:
+        async with connection.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(staging_sql)
+            async with cursor.copy(copy_sql) as copy:
+                for row in rows:
+                    await copy.write_row(row)
+            await cursor.execute(merge_query, merge_params or ())
+            if cursor.description is None:
+                return []
+            return await cursor.fetchall()
+
 # Redis cache helpers
 def cache_set(key, value, expiry=3600):
     """
@@ -202,6 +277,8 @@ def initialize_database():
             created_at TIMESTAMP NOT NULL DEFAULT NOW()
         )
         """)
+        # Taken from a sequence on every insert and update; the job feature store syncs jobs in this order
+        cursor.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS sync_seq BIGSERIAL")
         
         # Create match_results table to store match history
         logger.info("Creating match_results table if not exists...")
@@ -227,6 +304,7 @@ def initialize_database():
         CREATE INDEX IF NOT EXISTS idx_user_resumes_resume_id ON user_resumes(resume_id);
         CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs(job_id);
         CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+        CREATE INDEX IF NOT EXISTS idx_jobs_sync_seq ON jobs(sync_seq);
         CREATE INDEX IF NOT EXISTS idx_match_results_resume_id ON match_results(resume_id);
         CREATE INDEX IF NOT EXISTS idx_match_results_job_id ON match_results(job_id);
         """)
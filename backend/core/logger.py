@@ -5,6 +5,8 @@ import os
 from dotenv import load_dotenv
 
 load_dotenv()
+# Log file written next to the console output; tests point this at a temporary file
+LOG_FILE = os.getenv('LOG_FILE', 'app.log')
 betterstack_handler = LogtailHandler(
     source_token=os.getenv('BS_TOKEN'),
     host=os.getenv('BS_HOST')
@@ -16,7 +18,7 @@ formatter = logging.Formatter(
 )
 
 stream_handler = logging.StreamHandler(sys.stdout)
-file_handler = logging.FileHandler('app.log')
+file_handler = logging.FileHandler(LOG_FILE)
 
 # set handlers to the logger
 
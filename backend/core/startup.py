@@ -0,0 +1,57 @@
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+from dotenv import load_dotenv
+from backend.core.logger import logger
+
+load_dotenv()
+
+# 'lazy': load NLTK data, models and services on first use
+# 'eager': load them in one timed warm-up before the app starts serving
+STARTUP_MODE = os.getenv('STARTUP_MODE', 'lazy').lower()
+# Also authenticate with LinkedIn during an eager warm-up
+WARM_UP_LINKEDIN = os.getenv('WARM_UP_LINKEDIN', 'false').lower() == 'true'
+
+def _warm_up_nltk():
+    from backend.utils.text_processor import ensure_nltk_data
+    ensure_nltk_data()
+
+def _warm_up_services():
+    from backend.api.routes import get_matching_service
+    get_matching_service()
+
+def _warm_up_job_feature_store():
+    # The store is created, loaded from disk and compacted on first use; do it now instead
+    from backend.repository.jobFeatureStore import get_job_feature_store
+    get_job_feature_store().snapshot()
+
+def _warm_up_linkedin():
+    from backend.api.routes import get_job_service
+    get_job_service().linkedin_api
+
+def warm_up_steps() -> List[Tuple[str, Callable[[], None]]]:
+    steps = [
+        ("nltk_data", _warm_up_nltk),
+        ("services", _warm_up_services),
+        ("job_feature_store", _warm_up_job_feature_store)
+    ]
+    if WARM_UP_LINKEDIN:
+        steps.append(("linkedin_login", _warm_up_linkedin))
+    return steps
+
+def warm_up(steps: List[Tuple[str, Callable[[], None]]] = None) -> Dict[str, float]:
+    """
+    Run each warm-up step once and return its duration in seconds.
+    A failing step is logged and skipped; the resource will load lazily on first use instead.
+    """
+    timings = {}
+    for name, step in (steps if steps is not None else warm_up_steps()):
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {str(e)}")
+        timings[name] = time.perf_counter() - start
+        logger.info(f"Warm-up step {name} took {timings[name]:.3f}s")
+    logger.info(f"Warm-up finished in {sum(timings.values()):.3f}s")
+    return timings
@@ -1,9 +1,13 @@
 from fastapi import FastAPI, Request
-from backend.api.routes import router
-from backend.core.database import initialize_database
+from backend.api.routes import router, shutdown_services, get_job_prefetcher
+from backend.core.database import initialize_database, open_db_pool, close_db_pool
+from backend.repository.jobFeatureStore import start_feature_store_maintenance, stop_feature_store_maintenance
 from contextlib import asynccontextmanager
 from backend.api.auth import auth_router
 from backend.core.logger import logger
+from backend.core.startup import STARTUP_MODE, warm_up
+from backend.service.tiered_cache import start_invalidation_listener, stop_invalidation_listener
+from backend.service.prefetch_service import PREFETCH_MODE, start_prefetcher, stop_prefetcher
 from backend.core.middleware import log_middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -11,7 +15,23 @@ from starlette.middleware.base import BaseHTTPMiddleware
 async def lifespan(app: FastAPI):
     # Startup
     initialize_database()
+    await open_db_pool()
+    # Drop in-process cache entries when other workers write them
+    start_invalidation_listener()
+    # Sync (owner) or reload (reader) the job feature store in the background
+    start_feature_store_maintenance()
+    if STARTUP_MODE == 'eager':
+        warm_up()
+    # Refresh saved searches in the background (or leave it to a separate prefetch worker)
+    if PREFETCH_MODE == 'in_process':
+        start_prefetcher(get_job_prefetcher())
     yield
+    # Shutdown
+    await stop_prefetcher()
+    await stop_invalidation_listener()
+    await stop_feature_store_maintenance()
+    shutdown_services()
+    await close_db_pool()
 
 
 app = FastAPI(title="Job Search and Match Service API", lifespan=lifespan)
@@ -0,0 +1,387 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy.sparse import csr_matrix, diags
+from backend.core.config import PROJECT_ROOT, settings
+from backend.utils.skills_taxonomy import get_skill_taxonomy
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+ROLE_OWNER = 'owner'
+ROLE_READER = 'reader'
+# Number of upserts buffered in memory before the owner writes the store back to disk
+JOB_FEATURE_STORE_FLUSH_EVERY = int(os.getenv('JOB_FEATURE_STORE_FLUSH_EVERY', 50))
+# Seconds between maintenance runs: the owner syncs from Postgres and flushes, readers reload a newer file
+JOB_FEATURE_STORE_SYNC_INTERVAL = float(os.getenv('JOB_FEATURE_STORE_SYNC_INTERVAL', 60))
+# jobs.sync_seq values re-read behind the sync cursor on every sync. A job write takes its
+# sync_seq before it commits, so a slow transaction can commit after later values were synced.
+JOB_FEATURE_STORE_SYNC_OVERLAP = int(os.getenv('JOB_FEATURE_STORE_SYNC_OVERLAP', 1000))
+
+def resolve_store_path(path: Optional[str] = None) -> Path:
+    """Configured store path, with relative paths anchored at the project root"""
+    path = Path(path or settings.JOB_FEATURE_STORE_PATH)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+class JobFeatureStore:
+    """
+    Matrix form of the job features stored in Postgres, one row per job_id.
+
+    - keywords: CSR matrix of word frequencies (rows = jobs, columns = word vocabulary)
+    - skills: packed bitset matrix (rows = jobs, bit columns = skill vocabulary)
+    - required_experience: required years per job (NaN when missing or unparseable)
+
+    Rows are appended or replaced incrementally as jobs are saved and the whole
+    store is persisted to a single .npz file, so matching can score a resume against
+    every known job without querying Postgres or parsing JSONB.
+
+    One process owns the file: it writes it, and pulls the rows other processes saved
+    from Postgres (JobRepository.sync_feature_store). Readers keep their own saves in memory, never
+    write the file, and reload it when the owner replaces it.
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_every: int = JOB_FEATURE_STORE_FLUSH_EVERY,
+                 role: Optional[str] = None):
+        self.path = resolve_store_path(path)
+        self.flush_every = flush_every
+        self.role = (role or settings.JOB_FEATURE_STORE_ROLE).lower()
+        self._lock = threading.RLock()
+        # Serializes writers so two flushes never interleave
+        self._flush_lock = threading.Lock()
+        # Bumped whenever rows are renumbered (the store is reset or reloaded), so derived
+        # indexes keyed by row position know to rebuild
+        self.generation = 0
+        self._reset()
+        # Modification time of the file the store was last loaded from or written to
+        self._file_mtime: Optional[float] = None
+        # Reader: rows upserted here since the last reload, re-applied on top of a newer file
+        self._local_rows: Dict[str, Dict] = {}
+        self.load()
+
+    def _reset(self):
+        self.generation += 1
+        self.job_ids: List[str] = []
+        self.row_index: Dict[str, int] = {}
+        self.word_vocabulary: Dict[str, int] = {}
+        # Skill columns start as the canonical taxonomy skill IDs; skills outside the taxonomy are appended
+        self.skill_vocabulary: Dict[str, int] = dict(get_skill_taxonomy().skill_ids)
+        self._keywords = csr_matrix((0, 0), dtype=np.float64)
+        self._pending_rows: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # Skill bits and experience are grown by doubling so appends stay cheap
+        self._skill_bits = np.zeros((0, 0), dtype=np.uint8)
+        self._required_experience = np.zeros(0, dtype=np.float64)
+        # jobs.sync_seq each row was last synced at (0 for rows upserted locally)
+        self._sync_seq = np.zeros(0, dtype=np.int64)
+        self._unflushed = 0
+        # Last snapshot handed out; dropped on every write so the next one is rebuilt
+        self._snapshot: Optional[Dict] = None
+        # Owner: highest jobs.sync_seq synced from Postgres
+        self.synced_seq: Optional[int] = None
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def __contains__(self, job_id):
+        return job_id in self.row_index
+
+    def upsert(self, job_id: str, features: Dict) -> int:
+        """Add or replace the row for a job and return its row index"""
+        features = features or {}
+        with self._lock:
+            if self.role != ROLE_OWNER:
+                self._local_rows[job_id] = features
+            row = self.row_index.get(job_id)
+            if row is None:
+                row = len(self.job_ids)
+                self.job_ids.append(job_id)
+                self.row_index[job_id] = row
+
+            # Keywords
+            word_frequencies = features.get("word_frequencies", {}) or {}
+            columns = []
+            counts = []
+            for word, count in word_frequencies.items():
+                column = self.word_vocabulary.setdefault(word, len(self.word_vocabulary))
+                columns.append(column)
+                counts.append(float(count))
+            self._pending_rows[row] = (np.asarray(columns, dtype=np.int32), np.asarray(counts, dtype=np.float64))
+
+            # Skills
+            skill_columns = [
+                self.skill_vocabulary.setdefault(skill.lower(), len(self.skill_vocabulary))
+                for skill in (features.get("skills", []) or [])
+            ]
+            self._ensure_capacity(row + 1)
+            bits = np.zeros(self._skill_bits.shape[1] * 8, dtype=bool)
+            bits[skill_columns] = True
+            self._skill_bits[row] = np.packbits(bits)
+
+            # Experience (NaN when unparseable, and for jobs without features so they score zero)
+            try:
+                self._required_experience[row] = float(features.get("required_experience_years", 0) or 0) if features else np.nan
+            except (TypeError, ValueError):
+                self._required_experience[row] = np.nan
+
+            self._unflushed += 1
+            self._snapshot = None
+            return row
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the dense per-job arrays to fit the given rows and the current skill vocabulary"""
+        capacity, width = self._skill_bits.shape
+        needed_width = (len(self.skill_vocabulary) + 7) // 8
+        if rows <= capacity and needed_width <= width:
+            return
+        new_capacity = max(rows, capacity * 2, 64) if rows > capacity else capacity
+        new_width = max(needed_width, width * 2, 8) if needed_width > width else width
+        skill_bits = np.zeros((new_capacity, new_width), dtype=np.uint8)
+        skill_bits[:capacity, :width] = self._skill_bits
+        required_experience = np.zeros(new_capacity, dtype=np.float64)
+        required_experience[:capacity] = self._required_experience
+        sync_seq = np.zeros(new_capacity, dtype=np.int64)
+        sync_seq[:capacity] = self._sync_seq
+        self._skill_bits = skill_bits
+        self._required_experience = required_experience
+        self._sync_seq = sync_seq
+
+    def _compact(self):
+        """Merge pending row writes into the CSR keyword matrix"""
+        if not self._pending_rows and self._keywords.shape == (len(self.job_ids), len(self.word_vocabulary)):
+            return
+        shape = (len(self.job_ids), len(self.word_vocabulary))
+        base = self._keywords.copy()
+        base.resize(shape)
+
+        # Drop the old contents of rows that are being replaced
+        replaced = [row for row in self._pending_rows if row < self._keywords.shape[0]]
+        if replaced:
+            keep = np.ones(shape[0])
+            keep[replaced] = 0.0
+            base = (diags(keep) @ base).tocsr()
+            base.eliminate_zeros()
+
+        rows = sorted(self._pending_rows)
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        for row in rows:
+            indptr[row + 1] = len(self._pending_rows[row][0])
+        indptr = np.cumsum(indptr)
+        indices = np.concatenate([self._pending_rows[row][0] for row in rows]) if rows else np.zeros(0, dtype=np.int32)
+        data = np.concatenate([self._pending_rows[row][1] for row in rows]) if rows else np.zeros(0)
+        updates = csr_matrix((data, indices, indptr), shape=shape)
+
+        self._keywords = (base + updates).tocsr()
+        self._pending_rows = {}
+
+    def snapshot(self) -> Dict:
+        """Return a consistent view of the store for scoring
+
+        The vocabularies and arrays are copies (the arrays read-only), so later upserts
+        never show through. The same snapshot is reused until the store next changes.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._compact()
+                rows = len(self.job_ids)
+                skill_bits = self._skill_bits[:rows].copy()
+                required_experience = self._required_experience[:rows].copy()
+                skill_bits.setflags(write=False)
+                required_experience.setflags(write=False)
+                self._snapshot = {
+                    "generation": self.generation,
+                    "job_ids": list(self.job_ids),
+                    "row_index": dict(self.row_index),
+                    "word_vocabulary": dict(self.word_vocabulary),
+                    "skill_vocabulary": dict(self.skill_vocabulary),
+                    # _compact replaces the matrix rather than writing into it
+                    "keywords": self._keywords,
+                    "skill_bits": skill_bits,
+                    "required_experience": required_experience
+                }
+            return self._snapshot
+
+    async def maybe_flush(self) -> bool:
+        """Persist the store (off the event loop) once enough upserts have been buffered"""
+        if self.role == ROLE_OWNER and self._unflushed >= self.flush_every:
+            return await self.flush_async()
+        return False
+
+    async def flush_async(self) -> bool:
+        """flush() in a worker thread, so writing the file does not block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def flush(self) -> bool:
+        """
+        Write the store to disk (atomically replacing the previous file); only the owner writes.
+        Arrays are copied under the lock and written outside it, so upserts are not held up by disk I/O.
+        """
+        if self.role != ROLE_OWNER:
+            return False
+        try:
+            with self._flush_lock:
+                with self._lock:
+                    self._compact()
+                    rows = len(self.job_ids)
+                    flushed = self._unflushed
+                    arrays = {
+                        "job_ids": np.array(self.job_ids, dtype=str),
+                        "words": np.array(list(self.word_vocabulary), dtype=str),
+                        "skills": np.array(list(self.skill_vocabulary), dtype=str),
+                        # The CSR matrix is replaced, never modified, by _compact
+                        "keyword_data": self._keywords.data,
+                        "keyword_indices": self._keywords.indices,
+                        "keyword_indptr": self._keywords.indptr,
+                        "skill_bits": self._skill_bits[:rows].copy(),
+                        "required_experience": self._required_experience[:rows].copy(),
+                        "sync_seq": self._sync_seq[:rows].copy(),
+                        "synced_seq": np.array([] if self.synced_seq is None else [self.synced_seq], dtype=np.int64),
+                    }
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        np.savez(f, **arrays)
+                    os.replace(tmp_path, self.path)
+                finally:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                with self._lock:
+                    self._unflushed = max(0, self._unflushed - flushed)
+                    self._file_mtime = self.path.stat().st_mtime
+            return True
+        except Exception as e:
+            logger.error(f"Error flushing job feature store: {str(e)}")
+            return False
+
+    def reload_if_changed(self) -> bool:
+        """Reader: load the file if the owner replaced it, keeping rows saved here that it lacks"""
+        if self.role == ROLE_OWNER:
+            return False
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if self._file_mtime is not None and mtime <= self._file_mtime:
+            return False
+        with self._lock:
+            local_rows = self._local_rows
+            loaded = self.load()
+            # Rows the owner already synced from Postgres are in the file now
+            self._local_rows = {job_id: features for job_id, features in local_rows.items() if job_id not in self.row_index}
+            for job_id, features in list(self._local_rows.items()):
+                self.upsert(job_id, features)
+        return loaded
+
+    def apply_synced_rows(self, rows: List[Dict]) -> int:
+        """
+        Owner: upsert job rows read from Postgres (job_id, features, sync_seq).
+        Rows already synced at the same or a later sync_seq are skipped, so re-reading
+        an overlap window is harmless. Returns the number of rows applied.
+        """
+        applied = 0
+        with self._lock:
+            for row in rows:
+                existing = self.row_index.get(row["job_id"])
+                if existing is None or self._sync_seq[existing] < row["sync_seq"]:
+                    # upsert may grow the arrays, so index them only afterwards
+                    synced_row = self.upsert(row["job_id"], row["features"])
+                    self._sync_seq[synced_row] = row["sync_seq"]
+                    applied += 1
+                self.synced_seq = max(self.synced_seq or 0, row["sync_seq"])
+        return applied
+
+    def load(self) -> bool:
+        """Load the store from disk if a previous snapshot exists"""
+        if not self.path.exists():
+            return False
+        try:
+            with self._lock, np.load(self.path, allow_pickle=False) as data:
+                mtime = self.path.stat().st_mtime
+                self._reset()
+                self.job_ids = data["job_ids"].tolist()
+                self.row_index = {job_id: row for row, job_id in enumerate(self.job_ids)}
+                self.word_vocabulary = {word: column for column, word in enumerate(data["words"].tolist())}
+                self.skill_vocabulary = {skill: column for column, skill in enumerate(data["skills"].tolist())}
+                self._keywords = csr_matrix(
+                    (data["keyword_data"], data["keyword_indices"], data["keyword_indptr"]),
+                    shape=(len(self.job_ids), len(self.word_vocabulary))
+                )
+                self._skill_bits = data["skill_bits"].copy()
+                self._required_experience = data["required_experience"].copy()
+                if "sync_seq" in data.files:
+                    self._sync_seq = data["sync_seq"].copy()
+                    if len(data["synced_seq"]):
+                        self.synced_seq = int(data["synced_seq"][0])
+                else:
+                    self._sync_seq = np.zeros(len(self.job_ids), dtype=np.int64)
+                self._file_mtime = mtime
+            return True
+        except Exception as e:
+            logger.error(f"Error loading job feature store: {str(e)}")
+            self._reset()
+            return False
+
+
+_store: Optional[JobFeatureStore] = None
+_store_lock = threading.Lock()
+
+def get_job_feature_store() -> JobFeatureStore:
+    """The process-wide store, created (and loaded from disk) on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobFeatureStore()
+    return _store
+
+async def maintain_job_feature_store(store: Optional[JobFeatureStore] = None):
+    """
+    Keep the store current; runs until cancelled. The owner pulls rows saved by other
+    processes from Postgres and writes the file; readers reload it when it changes.
+    Disk work runs in a worker thread.
+    """
+    from backend.repository.jobRepository import JobRepository
+
+    store = store or get_job_feature_store()
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            if store.role == ROLE_OWNER:
+                if await JobRepository.sync_feature_store(store):
+                    await store.flush_async()
+            else:
+                await loop.run_in_executor(None, store.reload_if_changed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job feature store maintenance error: {str(e)}")
+        await asyncio.sleep(JOB_FEATURE_STORE_SYNC_INTERVAL)
+
+_maintenance_task: Optional[asyncio.Task] = None
+
+def start_feature_store_maintenance():
+    """Start store maintenance on the running event loop (once per process)"""
+    global _maintenance_task
+    if _maintenance_task is None or _maintenance_task.done():
+        _maintenance_task = asyncio.get_running_loop().create_task(maintain_job_feature_store())
+    return _maintenance_task
+
+async def stop_feature_store_maintenance():
+    """Stop maintenance and, in the owner, write out buffered rows"""
+    global _maintenance_task
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        try:
+            await _maintenance_task
+        except asyncio.CancelledError:
+            pass
+        _maintenance_task = None
+    if _store is not None:
+        await _store.flush_async()
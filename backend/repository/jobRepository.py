@@ -1,30 +1,35 @@
 import json
 import logging
-import os
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from dotenv import load_dotenv
 from backend.core.database import (
     execute_query, 
     execute_with_commit, 
+    execute_copy_merge,
 )
 
-from backend.service.redis_service import RedisClient
+from backend.repository.jobFeatureStore import JobFeatureStore, get_job_feature_store, JOB_FEATURE_STORE_SYNC_OVERLAP
 
 load_dotenv()
 logger = logging.getLogger(__name__)
-redis_client = RedisClient()
 
 class JobRepository:
-    """Repository for job data operations with caching"""
+    """
+    Repository for job data operations.
+    Jobs are cached by JobService.job_cache, which writes through to other workers' memory tiers.
+    """
     
-    CACHE_PREFIX = os.getenv('JOB_KEY_PREFIX', 'job:')
-    CACHE_EXPIRY = 86400  # 24 hours (jobs are less frequently updated)
+    # Columns written by save_job / save_jobs_bulk, in COPY order
+    JOB_COLUMNS = (
+        'job_id', 'title', 'company', 'location', 'workplace_type',
+        'listed_time', 'apply_url', 'description', 'features', 'processed_date'
+    )
     
     @classmethod
     async def save_job(cls, job_data: Dict) -> bool:
         """
-        Save job data to database and cache.
+        Save job data to the database (JobService.save_job also caches it).
         
         Args:
             job_data: Dictionary containing job information
@@ -41,15 +46,6 @@ class JobRepository:
             bool: True if save was successful, False otherwise
         """
         try:
-            
-            job_data_copy = job_data.copy()
-            # Convert datetime objects to strings for JSON serialization
-            if isinstance(job_data_copy.get('processed_date'), datetime):
-                job_data_copy['processed_date'] = job_data_copy['processed_date'].isoformat()
-            
-            if isinstance(job_data_copy.get('listed_time'), datetime):
-                job_data_copy['listed_time'] = job_data_copy['listed_time'].isoformat()
-            
             query = """
                 INSERT INTO jobs (
                     job_id, title, company, location, workplace_type,
@@ -58,7 +54,8 @@ class JobRepository:
                 ON CONFLICT (job_id) 
                 DO UPDATE SET
                     features = EXCLUDED.features,
-                    processed_date = EXCLUDED.processed_date
+                    processed_date = EXCLUDED.processed_date,
+                    sync_seq = nextval(pg_get_serial_sequence('jobs', 'sync_seq'))
                 RETURNING job_id
             """
             
@@ -81,12 +78,13 @@ class JobRepository:
             result = await execute_with_commit(query, values)
             
             if result:
-                # Update cache
+                # Keep the matrix form of the job features in sync
                 try:
-                    cache_key = redis_client.generate_cache_key(cls.CACHE_PREFIX, job_data['job_id'])
-                    redis_client.set(cache_key, job_data_copy, cls.CACHE_EXPIRY)
+                    job_feature_store = get_job_feature_store()
+                    job_feature_store.upsert(job_data['job_id'], job_data['features'])
+                    await job_feature_store.maybe_flush()
                 except Exception as e:
-                    logger.error(f"Error updating cache: {str(e)}")
+                    logger.error(f"Error updating job feature store: {str(e)}")
             
             return result is not None
         
@@ -94,13 +92,95 @@ class JobRepository:
             logger.error(f"Error saving job: {str(e)}")
             return False
     
+    @classmethod
+    async def save_jobs_bulk(cls, jobs: List[Dict]) -> Dict[str, List[str]]:
+        """
+        Save many jobs in one round trip: COPY them into a temp table and merge
+        into jobs with a single INSERT ... SELECT ... ON CONFLICT.
+        
+        Args:
+            jobs: List of job dictionaries with the same fields as save_job
+            
+        Returns:
+            dict: job_ids that were "inserted", "updated" or "failed".
+            If the bulk statement fails, jobs are retried one by one so a single
+            bad row does not lose the whole batch.
+            Caching the saved jobs is left to the caller (JobService.save_jobs).
+        """
+        result = {"inserted": [], "updated": [], "failed": []}
+        
+        # ON CONFLICT cannot touch the same row twice in one statement; the last copy of a job wins
+        unique_jobs = {}
+        for job_data in jobs:
+            if job_data and job_data.get('job_id'):
+                unique_jobs[job_data['job_id']] = job_data
+        if not unique_jobs:
+            return result
+        
+        columns = ', '.join(cls.JOB_COLUMNS)
+        staging_sql = "CREATE TEMP TABLE jobs_staging (LIKE jobs INCLUDING DEFAULTS) ON COMMIT DROP"
+        copy_sql = f"COPY jobs_staging ({columns}) FROM STDIN"
+        merge_query = f"""
+            INSERT INTO jobs ({columns})
+            SELECT {columns} FROM jobs_staging
+            ON CONFLICT (job_id)
+            DO UPDATE SET
+                features = EXCLUDED.features,
+                processed_date = EXCLUDED.processed_date,
+                sync_seq = nextval(pg_get_serial_sequence('jobs', 'sync_seq'))
+            RETURNING job_id, (xmax = 0) AS inserted
+        """
+        rows = [
+            tuple(
+                json.dumps(job_data['features']) if column == 'features' else job_data[column]
+                for column in cls.JOB_COLUMNS
+            )
+            for job_data in unique_jobs.values()
+        ]
+        
+        try:
+            merged = await execute_copy_merge(staging_sql, copy_sql, rows, merge_query)
+        except Exception as e:
+            if len(unique_jobs) == 1:
+                logger.error(f"Error saving job: {str(e)}")
+                result["failed"].extend(unique_jobs)
+                return result
+            logger.error(f"Bulk job save failed, saving jobs one by one: {str(e)}")
+            for job_data in unique_jobs.values():
+                for status, job_ids in (await cls.save_jobs_bulk([job_data])).items():
+                    result[status].extend(job_ids)
+            return result
+        
+        for row in merged:
+            result["inserted" if row['inserted'] else "updated"].append(row['job_id'])
+        
+        saved = set(result["inserted"]) | set(result["updated"])
+        job_feature_store = get_job_feature_store()
+        for job_id, job_data in unique_jobs.items():
+            if job_id not in saved:
+                result["failed"].append(job_id)
+                continue
+            
+            # Keep the matrix form of the job features in sync
+            try:
+                job_feature_store.upsert(job_id, job_data['features'])
+            except Exception as e:
+                logger.error(f"Error updating job feature store: {str(e)}")
+        
+        try:
+            await job_feature_store.maybe_flush()
+        except Exception as e:
+            logger.error(f"Error flushing job feature store: {str(e)}")
+        
+        return result
+    
     @classmethod
     async def get_job_by_id(cls, job_id: str) -> Optional[Dict]:
         """Get job by ID"""
         try:
             query = "SELECT * FROM jobs WHERE job_id = %s"
             # print(f"Getting job by ID: {job_id}")
-            print(f"Query: {query}")
+            logger.debug(f"Query: {query}")
             result = await execute_query(query, (job_id,), fetch_one=True)
             
             if result:
@@ -117,6 +197,56 @@ class JobRepository:
             logger.error(f"Error getting job by ID: {str(e)}")
             return None
     
+    @classmethod
+    async def sync_feature_store(cls, store: JobFeatureStore, batch_size: int = 1000,
+                                 overlap: int = JOB_FEATURE_STORE_SYNC_OVERLAP) -> int:
+        """
+        Upsert into the feature store every job saved (by any process) since its last sync,
+        paging through jobs in sync_seq order (assigned by Postgres on every insert and update).
+        The last `overlap` sequence values are read again in case their transactions committed
+        late; rows the store already has are skipped. Returns the number of rows applied.
+        """
+        query = """
+            SELECT job_id, features, sync_seq FROM jobs
+            WHERE sync_seq > %s
+            ORDER BY sync_seq LIMIT %s
+        """
+        cursor = max(0, (store.synced_seq or 0) - overlap)
+        applied = 0
+        while True:
+            rows = [dict(row) for row in await execute_query(query, (cursor, batch_size))]
+            for row in rows:
+                if isinstance(row['features'], str):
+                    row['features'] = json.loads(row['features'])
+            applied += store.apply_synced_rows(rows)
+            if len(rows) < batch_size:
+                return applied
+            cursor = rows[-1]['sync_seq']
+    
+    @classmethod
+    async def get_jobs_by_ids(cls, job_ids: List[str]) -> List[Dict]:
+        """Get many jobs in one query; jobs that do not exist are left out"""
+        if not job_ids:
+            return []
+        try:
+            query = "SELECT * FROM jobs WHERE job_id = ANY(%s)"
+            results = await execute_query(query, (list(job_ids),))
+            
+            jobs = []
+            for row in results:
+                job_data = dict(row)
+                
+                # Parse features JSON field if it's a string
+                if job_data.get('features') and isinstance(job_data['features'], str):
+                    job_data['features'] = json.loads(job_data['features'])
+                
+                jobs.append(job_data)
+            
+            return jobs
+        except Exception as e:
+            logger.error(f"Error getting jobs by ID: {str(e)}")
+            return []
+
     @classmethod
     async def search_jobs(cls, criteria: Dict, limit: int = 20, offset: int = 0) -> List[Dict]:
         """
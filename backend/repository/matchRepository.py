@@ -6,10 +6,13 @@ from typing import List, Dict, Optional
 from backend.core.database import (
     execute_query, 
     execute_with_commit, 
+    execute_copy_merge,
 )
-from backend.service.redis_service import RedisClient
+from backend.service.redis_service import AsyncRedisClient
+from backend.service.tiered_cache import TieredCache
 logger = logging.getLogger(__name__)
-redis_client = RedisClient()
+# Cache calls are awaited so they do not block the event loop
+redis_client = AsyncRedisClient()
 
 class MatchRepository:
     """Repository for match results with caching"""
@@ -17,6 +20,9 @@ class MatchRepository:
     CACHE_PREFIX = "match"
     CACHE_EXPIRY = 43200  # 12 hours
     
+    # Memory -> Redis -> Postgres for single match results, keyed "resume_id:job_id"
+    match_cache = TieredCache("matches", f"{CACHE_PREFIX}:", CACHE_EXPIRY, redis_client)
+    
     @classmethod
     async def save_match_result(cls, match_data: Dict) -> bool:
         """Save match result to database and cache"""
@@ -52,8 +58,7 @@ class MatchRepository:
             
             if success:
                 # Update cache
-                cache_key = redis_client.generate_cache_key(cls.CACHE_PREFIX, f"{match_data['resume_id']}:{match_data['job_id']}")
-                redis_client.set(cache_key, match_data, cls.CACHE_EXPIRY)
+                await cls.match_cache.set(f"{match_data['resume_id']}:{match_data['job_id']}", match_data)
             
             return success
             
@@ -61,6 +66,80 @@ class MatchRepository:
             logger.error(f"Error saving match result: {str(e)}")
             return False
     
+    @classmethod
+    async def save_match_results_bulk(cls, matches: List[Dict]) -> List[bool]:
+        """
+        Save many match results with one COPY + merge statement and cache them
+        with one pipelined Redis batch.
+        
+        Args:
+            matches: List of match dictionaries with the same fields as save_match_result
+            
+        Returns:
+            list: One success flag per input match, in input order
+        """
+        if not matches:
+            return []
+        
+        # ON CONFLICT cannot touch the same row twice in one statement; the last copy of a pair wins
+        now = datetime.now()
+        unique_matches = {}
+        for match_data in matches:
+            unique_matches[(match_data['resume_id'], match_data['job_id'])] = match_data
+        
+        columns = (
+            "resume_id, job_id, match_score, matched_skills, missing_skills, "
+            "required_experience_years, resume_experience_years, created_at"
+        )
+        staging_sql = "CREATE TEMP TABLE match_results_staging (LIKE match_results INCLUDING DEFAULTS) ON COMMIT DROP"
+        copy_sql = f"COPY match_results_staging ({columns}) FROM STDIN"
+        merge_query = f"""
+            INSERT INTO match_results ({columns})
+            SELECT {columns} FROM match_results_staging
+            ON CONFLICT (resume_id, job_id)
+            DO UPDATE SET
+                match_score = EXCLUDED.match_score,
+                matched_skills = EXCLUDED.matched_skills,
+                missing_skills = EXCLUDED.missing_skills,
+                required_experience_years = EXCLUDED.required_experience_years,
+                resume_experience_years = EXCLUDED.resume_experience_years,
+                created_at = EXCLUDED.created_at
+            RETURNING resume_id, job_id
+        """
+        rows = [
+            (
+                match_data['resume_id'],
+                match_data['job_id'],
+                match_data['match_score'],
+                json.dumps(match_data['matched_skills']),
+                json.dumps(match_data['missing_skills']),
+                match_data['required_experience_years'],
+                match_data['resume_experience_years'],
+                now
+            )
+            for match_data in unique_matches.values()
+        ]
+        
+        try:
+            merged = await execute_copy_merge(staging_sql, copy_sql, rows, merge_query)
+            saved = set((row['resume_id'], row['job_id']) for row in merged)
+        except Exception as e:
+            logger.error(f"Error saving match results: {str(e)}")
+            saved = set()
+        
+        if saved:
+            # Update cache
+            try:
+                await cls.match_cache.set_many({
+                    f"{resume_id}:{job_id}": match_data
+                    for (resume_id, job_id), match_data in unique_matches.items()
+                    if (resume_id, job_id) in saved
+                })
+            except Exception as e:
+                logger.error(f"Error updating match cache: {str(e)}")
+        
+        return [(match_data['resume_id'], match_data['job_id']) in saved for match_data in matches]
+    
     @classmethod
     async def get_job_and_matches_by_resume_id(cls, resume_id: str, limit: int = 20, min_score: float = 50.0) -> List[Dict]:
         """Get all match results for a resume, ordered by match score"""
@@ -106,17 +185,10 @@ class MatchRepository:
         Returns:
             dict: Match result data or None if not found
         """
-        try:
-            # Check cache first
-            cache_key = redis_client.generate_cache_key(cls.CACHE_PREFIX, f"{resume_id}:{job_id}")
-            cached_data = redis_client.get(cache_key)
-            
-            if cached_data:
-                return cached_data
-            
+        async def load():
             # If not in cache, get from database
             query = "SELECT * FROM match_results WHERE resume_id = %s AND job_id = %s"
-            result = execute_query(query, (resume_id, job_id), fetch_one=True)
+            result = await execute_query(query, (resume_id, job_id), fetch_one=True)
             
             if result:
                 # Process data
@@ -128,13 +200,13 @@ class MatchRepository:
                 if match_data.get('matched_skills') and isinstance(match_data['matched_skills'], str):
                     match_data['matched_skills'] = json.loads(match_data['matched_skills'])
                 
-                # Update cache
-                redis_client.set(cache_key, match_data, cls.CACHE_EXPIRY)
-                
                 return match_data
             
             return None
         
+        try:
+            # Memory first, then Redis, then the database (which fills both cache tiers)
+            return await cls.match_cache.get(f"{resume_id}:{job_id}", load)
         except Exception as e:
             logger.error(f"Error getting match result: {str(e)}")
             return None
@@ -158,8 +230,7 @@ class MatchRepository:
                 params = (resume_id, job_id)
                 
                 # Delete from cache
-                cache_key = redis_client.generate_cache_key(cls.CACHE_PREFIX, f"{resume_id}:{job_id}")
-                redis_client.delete(cache_key)
+                await cls.match_cache.invalidate(f"{resume_id}:{job_id}")
                 
             elif resume_id:
                 # Delete all matches for a resume
@@ -180,7 +251,7 @@ class MatchRepository:
                 # No identifiers provided
                 return False
             
-            return execute_with_commit(query, params)
+            return await execute_with_commit(query, params)
         
         except Exception as e:
             logger.error(f"Error deleting match results: {str(e)}")
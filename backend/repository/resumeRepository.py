@@ -1,24 +1,36 @@
 import json
 import logging
+import os
 from datetime import datetime
 from typing import Optional, Dict
 
 from backend.core.database import (
     execute_query, 
     execute_with_commit, 
-    cache_get, 
-    cache_set, 
-    cache_delete,
-    generate_cache_key,
 )
+from backend.utils.resume_profile import ResumeProfile, resume_profile_version
+from backend.service.tiered_cache import TieredCache
 
 logger = logging.getLogger(__name__)
 
+# Number of resume match profiles kept in process
+RESUME_PROFILE_CACHE_SIZE = int(os.getenv('RESUME_PROFILE_CACHE_SIZE', 1024))
+
 class ResumeRepository:
     """Repository for resume data operations with caching"""
     
     CACHE_PREFIX = "resume"
     CACHE_EXPIRY = 86400  # 24 hours
+    PROFILE_CACHE_PREFIX = "resume_profile"
+    
+    # Memory -> Redis -> Postgres for resumes by resume_id, and for each user's current resume
+    resume_cache = TieredCache("resumes", f"{CACHE_PREFIX}:", CACHE_EXPIRY)
+    user_resume_cache = TieredCache("user_resumes", f"{CACHE_PREFIX}_user:", CACHE_EXPIRY)
+    
+    # Memory -> Redis for resume match profiles (ResumeProfile.to_dict) by resume_id.
+    # Resume IDs are never reused for different features, and save_resume refreshes the profile.
+    profile_cache = TieredCache("resume_profiles", f"{PROFILE_CACHE_PREFIX}:", CACHE_EXPIRY,
+                                max_entries=RESUME_PROFILE_CACHE_SIZE)
     
     @classmethod
     async def save_resume(cls, resume_data: Dict) -> bool:
@@ -59,9 +71,17 @@ class ResumeRepository:
             result = await execute_with_commit(query, values)
             
             if result:
-                # Update cache with resume_id, user_id, raw_text, processed_date, features for the resume to be used by the matching service
-                cache_key = generate_cache_key(cls.CACHE_PREFIX, resume_data['resume_id'])
-                cache_set(cache_key, resume_data['features'], cls.CACHE_EXPIRY)
+                # Write the resume through both cache tiers; the user's current resume reloads on next read
+                await cls.resume_cache.set(resume_data['resume_id'], {
+                    "resume_id": resume_data['resume_id'],
+                    "user_id": resume_data['user_id'],
+                    "features": resume_data['features'],
+                    "raw_text": resume_data.get('raw_text', '')
+                })
+                await cls.user_resume_cache.invalidate(resume_data['user_id'])
+                
+                # Precompute the resume side of matching once per save
+                await cls.save_resume_profile(ResumeProfile.from_features(resume_data['resume_id'], resume_data['features']))
             
             return result is not None
         
@@ -70,9 +90,31 @@ class ResumeRepository:
             return False
     
     @classmethod
-    async def get_resume_by_userid(cls, user_id: str) -> Optional[Dict]:
-        """Get resume by user ID from database"""
+    async def save_resume_profile(cls, profile: ResumeProfile):
+        """Cache a resume's match profile in both tiers"""
+        try:
+            await cls.profile_cache.set(profile.resume_id, profile.to_dict())
+        except Exception as e:
+            logger.error(f"Error caching resume profile: {str(e)}")
+    
+    @classmethod
+    async def get_resume_profile(cls, resume_id: str) -> Optional[ResumeProfile]:
+        """
+        Cached match profile for a resume: in-process first, then Redis.
+        Returns None when neither has a profile built with the current taxonomy.
+        """
         try:
+            cached_data = await cls.profile_cache.get(resume_id)
+            if isinstance(cached_data, dict) and cached_data.get("version") == resume_profile_version():
+                return ResumeProfile.from_dict(cached_data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Error reading cached resume profile: {str(e)}")
+        return None
+    
+    @classmethod
+    async def get_resume_by_userid(cls, user_id: str) -> Optional[Dict]:
+        """Get resume by user ID (memory, then Redis, then database)"""
+        async def load():
             query = """
                 SELECT * FROM user_resumes WHERE user_id = %s
             """
@@ -80,6 +122,9 @@ class ResumeRepository:
             if result:
                 return dict(result)
             return None
+        
+        try:
+            return await cls.user_resume_cache.get(user_id, load)
         except Exception as e:
             logger.error(f"Error getting resume by user ID: {e}")
             return None
@@ -95,14 +140,7 @@ class ResumeRepository:
         Returns:
             dict: Resume data or None if not found
         """
-        try:
-            # Check cache first
-            cache_key = generate_cache_key(cls.CACHE_PREFIX, resume_id)
-            cached_data = cache_get(cache_key)
-            
-            if cached_data:
-                return cached_data
-            
+        async def load():
             # If not in cache, get from database
             query = "SELECT * FROM user_resumes WHERE resume_id = %s"
             result = await execute_query(query, (resume_id,), fetch_one=True)
@@ -123,6 +161,9 @@ class ResumeRepository:
             
             return None
         
+        try:
+            # Memory first, then Redis, then the database
+            return await cls.resume_cache.get(resume_id, load)
         except Exception as e:
             logger.error(f"Error getting resume by ID: {str(e)}")
             return None
@@ -171,14 +212,19 @@ class ResumeRepository:
             bool: True if deletion was successful, False otherwise
         """
         try:
+            # Remember the owner so their cached current resume can be dropped too
+            resume = await cls.get_resume_by_id(resume_id)
+            
             # Delete from database
             query = "DELETE FROM user_resumes WHERE resume_id = %s"
-            success = execute_with_commit(query, (resume_id,))
+            success = await execute_with_commit(query, (resume_id,))
             
             if success:
                 # Delete from cache
-                cache_key = generate_cache_key(cls.CACHE_PREFIX, resume_id)
-                cache_delete(cache_key)
+                await cls.resume_cache.invalidate(resume_id)
+                if resume and resume.get('user_id'):
+                    await cls.user_resume_cache.invalidate(resume['user_id'])
+                await cls.profile_cache.invalidate(resume_id)
             
             return success
         
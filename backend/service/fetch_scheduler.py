@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# LinkedIn request budget: sustained calls per second, and how many may go out back to back
+LINKEDIN_RATE_LIMIT = float(os.getenv('LINKEDIN_RATE_LIMIT', 2))
+LINKEDIN_BURST = int(os.getenv('LINKEDIN_BURST', 5))
+# Retries after the first attempt, with full-jitter exponential backoff between them
+UPSTREAM_MAX_RETRIES = int(os.getenv('UPSTREAM_MAX_RETRIES', 2))
+UPSTREAM_BACKOFF_BASE = float(os.getenv('UPSTREAM_BACKOFF_BASE', 0.5))
+UPSTREAM_BACKOFF_MAX = float(os.getenv('UPSTREAM_BACKOFF_MAX', 8))
+# Consecutive failed calls that open the circuit, and how long it stays open before a trial call
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+
+# Number of recent calls the latency percentiles are computed over
+LATENCY_WINDOW = 500
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+def is_transient(error: BaseException) -> bool:
+    """Errors worth retrying: connection failures, timeouts, and rate-limit (429) or server (5xx) responses"""
+    if isinstance(error, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None) or getattr(error, 'status_code', None)
+    return isinstance(status, int) and (status == 429 or 500 <= status < 600)
+
+class TokenBucket:
+    """Allows rate calls per second on average, and up to burst at once after a quiet period"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for a token; callers are served in arrival order"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+class CircuitBreaker:
+    """
+    Closed: calls go through. After failure_threshold consecutive failures it opens and
+    rejects calls for reset_timeout seconds, then lets one trial call through (half-open);
+    success closes it again, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_running):
+            raise CircuitOpenError("upstream circuit is open")
+        if state == "half_open":
+            self._trial_running = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def cancel_trial(self):
+        """The trial call was abandoned without an outcome; let the next call try instead"""
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+class UpstreamScheduler:
+    """
+    Runs blocking upstream calls (e.g. linkedin_api) in a bounded thread pool, under a
+    token-bucket rate limit, with jittered retries of transient errors and a circuit breaker.
+    The breaker sees one outcome per call, after its retries.
+
+    Usage:
+        details = await scheduler.call(linkedin_api.get_job, job_id)
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rate: float, burst: int,
+                 max_retries: int = UPSTREAM_MAX_RETRIES, breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"{name}-upstream")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._queue_waits = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {"calls": 0, "succeeded": 0, "failed": 0, "retries": 0, "rejected": 0}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def call(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) in the worker pool and return its result.
+        Raises CircuitOpenError while the circuit is open, fn's exception straight away if it
+        is not transient, or its last exception once retries run out.
+        """
+        self._stats["calls"] += 1
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._stats["rejected"] += 1
+            raise
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    result = await self._call_once(fn, *args)
+                except Exception as e:
+                    if not is_transient(e):
+                        # The upstream answered; the error is about this request, not the upstream's health
+                        self.breaker.record_success()
+                        self._stats["failed"] += 1
+                        raise
+                    if attempt == self.max_retries:
+                        self.breaker.record_failure()
+                        self._stats["failed"] += 1
+                        raise
+                    self._stats["retries"] += 1
+                    delay = random.uniform(0, min(UPSTREAM_BACKOFF_MAX, UPSTREAM_BACKOFF_BASE * 2 ** attempt))
+                    logger.warning(f"{self.name} call failed ({str(e)}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                self._stats["succeeded"] += 1
+                return result
+        except asyncio.CancelledError:
+            self.breaker.cancel_trial()
+            raise
+
+    async def _call_once(self, fn: Callable[..., Any], *args) -> Any:
+        queued = time.monotonic()
+        self._waiting += 1
+        waiting = True
+        try:
+            async with self._get_semaphore():
+                await self.bucket.acquire()
+                self._waiting -= 1
+                waiting = False
+                self._queue_waits.append(time.monotonic() - queued)
+                self._running += 1
+                started = time.monotonic()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+                finally:
+                    self._running -= 1
+                    self._latencies.append(time.monotonic() - started)
+        finally:
+            # Cancelled while still queued
+            if waiting:
+                self._waiting -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls, call counts, circuit state and latency percentiles (seconds)"""
+        stats = dict(self._stats)
+        stats.update({
+            "queue_depth": self._waiting,
+            "in_flight": self._running,
+            "circuit": self.breaker.state,
+            "latency_p50": _percentile(self._latencies, 0.5),
+            "latency_p95": _percentile(self._latencies, 0.95),
+            "queue_wait_p50": _percentile(self._queue_waits, 0.5),
+            "queue_wait_p95": _percentile(self._queue_waits, 0.95),
+        })
+        return stats
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -1,13 +1,15 @@
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from fastapi import HTTPException
-from redis import Redis
 from linkedin_api import Linkedin
 from dotenv import load_dotenv
-from backend.service.redis_service import RedisClient
+from backend.service.redis_service import AsyncRedisClient
+from backend.service.tiered_cache import TieredCache, get_many_together
+from backend.service.fetch_scheduler import UpstreamScheduler, CircuitOpenError, LINKEDIN_RATE_LIMIT, LINKEDIN_BURST
 from backend.repository.jobRepository import JobRepository
-from backend.utils.feature_extractors import FeatureExtractor
+from backend.utils.feature_extractors import FeatureExtractor, create_feature_pool, extract_job_features_in_worker
 from backend.core.database import initialize_database
 from concurrent.futures import ThreadPoolExecutor
 
@@ -24,63 +26,165 @@ LINKEDIN_PASSWORD = os.getenv('LINKEDIN_PASSWORD')
 # Job Cache Settings
 JOB_CACHE_EXPIRY = int(os.getenv('JOB_CACHE_EXPIRY', 3600))
 JOB_KEY_PREFIX = os.getenv('JOB_KEY_PREFIX', 'job:')
+# Encoding for cached job payloads (see backend/utils/cache_serializers.py)
+JOB_CACHE_SERIALIZER = os.getenv('JOB_CACHE_SERIALIZER', 'auto')
+
+# Negative cache: job IDs we fetched and discarded, with the reason, so repeat searches skip them
+JOB_SKIP_KEY_PREFIX = os.getenv('JOB_SKIP_KEY_PREFIX', 'job_skip:')
+SKIP_BLACKLISTED = 'blacklisted'
+SKIP_NOT_FOUND = 'not_found'
+SKIP_FETCH_FAILED = 'fetch_failed'
+JOB_SKIP_TTLS = {
+    SKIP_BLACKLISTED: int(os.getenv('JOB_SKIP_TTL_BLACKLISTED', 604800)),  # 7 days
+    SKIP_NOT_FOUND: int(os.getenv('JOB_SKIP_TTL_NOT_FOUND', 86400)),  # 24 hours
+    SKIP_FETCH_FAILED: int(os.getenv('JOB_SKIP_TTL_FETCH_FAILED', 600)),  # 10 minutes, errors are often transient
+}
 
 # Search Settings
 MAX_SEARCH_WORKERS = int(os.getenv('MAX_SEARCH_WORKERS', 5))
+# Concurrent LinkedIn calls (searches and job detail fetches)
 MAX_PROCESS_WORKERS = int(os.getenv('MAX_PROCESS_WORKERS', 20))
 
+# Feature extraction: scan each description once and keep per-section skills
+SINGLE_PASS_SKILLS = os.getenv('SINGLE_PASS_SKILLS', 'false').lower() == 'true'
+# Worker processes for job feature extraction (0 runs it on the search thread pool instead)
+FEATURE_EXTRACTION_WORKERS = int(os.getenv('FEATURE_EXTRACTION_WORKERS', os.cpu_count() or 1))
+
 # Filtering
 BLACK_LIST: List[str] = os.getenv('BLACK_LIST', '[]').strip('[]').split(',')
 BLACK_LIST = [company.strip().strip('"\'') for company in BLACK_LIST if company.strip()]
 
 class JobService:
-    def __init__(self, redis_client=None):
+    def __init__(self, async_redis_client=None):
         self.job_repo = JobRepository()
-        self.feature_extractor = FeatureExtractor()
-        self.redis_client = redis_client or RedisClient()
+        self.feature_extractor = FeatureExtractor(single_pass_skills=SINGLE_PASS_SKILLS)
+        # Async so cache calls do not block the event loop
+        self.async_redis_client = async_redis_client or AsyncRedisClient(serializer=JOB_CACHE_SERIALIZER)
+        # Hot jobs are served from process memory, with Redis behind it
+        self.job_cache = TieredCache("jobs", JOB_KEY_PREFIX, JOB_CACHE_EXPIRY, self.async_redis_client)
+        # Jobs to discard without asking LinkedIn again; each entry carries its own TTL
+        self.job_skip_cache = TieredCache("job_skips", JOB_SKIP_KEY_PREFIX,
+                                          max(JOB_SKIP_TTLS.values()), self.async_redis_client)
         self.executor = ThreadPoolExecutor(max_workers=MAX_SEARCH_WORKERS)
+        # Every LinkedIn call goes through here: rate limited, bounded, retried, circuit-broken
+        self.linkedin_scheduler = UpstreamScheduler("linkedin", MAX_PROCESS_WORKERS, LINKEDIN_RATE_LIMIT, LINKEDIN_BURST)
+        # Created on first use so importing the service does not fork workers
+        self.feature_pool = None
+        # Logged in on first use so constructing the service does not hit LinkedIn
+        self._linkedin_api = None
+        self._linkedin_lock = threading.Lock()
+
+    @property
+    def linkedin_api(self) -> Linkedin:
+        """LinkedIn API client, authenticated on first access"""
+        if self._linkedin_api is None:
+            with self._linkedin_lock:
+                if self._linkedin_api is None:
+                    try:
+                        self._linkedin_api = Linkedin(LINKEDIN_USERNAME, LINKEDIN_PASSWORD)
+                    except Exception as e:
+                        raise HTTPException(
+                            status_code=500,
+                            detail=f"Failed to initialize LinkedIn API: {str(e)}"
+                        )
+        return self._linkedin_api
+
+    @linkedin_api.setter
+    def linkedin_api(self, api):
+        self._linkedin_api = api
+            
+    def _format_job_features(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        job_features = {
+            "required_experience_years": features["required_experience_years"],
+            "skills": features["skills"],
+            "word_frequencies": dict(list(features["word_frequencies"].items())[:100])
+        }
+        for key in ("section_skills", "skill_bits", "skill_ids_version"):
+            if key in features:
+                job_features[key] = features[key]
+        return job_features
+
+    def extract_job_features(self, text: str) -> Dict[str, Any]:
+        """Extract features from job description"""
+        try:
+            return self._format_job_features(self.feature_extractor.extract_job_features(text))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error extracting job features: {str(e)}"
+            ) 
+
+    def get_feature_pool(self):
+        """Process pool for feature extraction, or None when it is disabled"""
+        if self.feature_pool is None and FEATURE_EXTRACTION_WORKERS > 0:
+            self.feature_pool = create_feature_pool(FEATURE_EXTRACTION_WORKERS, SINGLE_PASS_SKILLS)
+        return self.feature_pool
+
+    async def extract_job_features_async(self, text: str) -> Dict[str, Any]:
+        """Extract features off the event loop, in the feature process pool when enabled"""
         try:
-            self.linkedin_api = Linkedin(LINKEDIN_USERNAME, LINKEDIN_PASSWORD)
+            loop = asyncio.get_running_loop()
+            pool = self.get_feature_pool()
+            if pool is not None:
+                features = await loop.run_in_executor(pool, extract_job_features_in_worker, text)
+            else:
+                features = await loop.run_in_executor(self.executor, self.feature_extractor.extract_job_features, text)
+            return self._format_job_features(features)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to initialize LinkedIn API: {str(e)}"
+                detail=f"Error extracting job features: {str(e)}"
             )
-            
-    def extract_job_features(self, text: str) -> Dict[str, Any]:
-        """Extract features from job description"""
+
+    def extract_job_features_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Extract features for many job descriptions across the feature process pool, in input order"""
         try:
-            features = self.feature_extractor.extract_job_features(text)
-            return {
-                "required_experience_years": features["required_experience_years"],
-                "skills": features["skills"],
-                "word_frequencies": dict(list(features["word_frequencies"].items())[:100])
-            }
+            features = self.feature_extractor.extract_job_features_batch(texts, executor=self.get_feature_pool())
+            return [self._format_job_features(job_features) for job_features in features]
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Error extracting job features: {str(e)}"
-            ) 
+            )
+
+    def shutdown(self):
+        """Stop the worker pools"""
+        if self.feature_pool is not None:
+            self.feature_pool.shutdown(wait=False, cancel_futures=True)
+            self.feature_pool = None
+        self.executor.shutdown(wait=False)
+        self.linkedin_scheduler.shutdown()
             
-    async def search_jobs(self, search_params: Dict) -> List[Dict]:
-        """Search for jobs with given parameters and process them"""
+    async def search_jobs(self, search_params: Dict, failures: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Search for jobs with given parameters and process them.
+        The IDs of jobs that could not be fetched (LinkedIn failed or was unavailable) are
+        appended to failures, so callers can tell a complete result from a partial one.
+        """
         try:
             # Create a wrapper function to handle keyword arguments
             def search_wrapper():
                 return self.linkedin_api.search_jobs(**search_params)
             
-            # Run LinkedIn API call in thread pool since it's blocking
-            jobs = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                search_wrapper  # Pass the wrapper function without arguments
+            # Run LinkedIn API call in the upstream worker pool since it's blocking
+            jobs = await self.linkedin_scheduler.call(search_wrapper)
+            
+            # Look up the whole page, and the jobs already discarded, in one cache round trip
+            cached_jobs, skipped_jobs = await self.get_cached_jobs_and_skips(
+                [job["entityUrn"].split(":")[-1] for job in jobs if job.get("entityUrn")]
             )
             
             # Process jobs concurrently
-            tasks = [self.process_job(job) for job in jobs]
-            processed_jobs = await asyncio.gather(*tasks)
+            tasks = [self._process_job(job, cached_jobs, skipped_jobs, failures) for job in jobs]
+            processed = await asyncio.gather(*tasks)
+            
+            # Save the newly processed jobs in one bulk upsert
+            new_jobs = [job for job, is_new in processed if job is not None and is_new]
+            if new_jobs:
+                await self.save_jobs(new_jobs)
             
             # Filter out None results and return valid jobs
-            return [job for job in processed_jobs if job is not None]
+            return [job for job, _ in processed if job is not None]
             
         except Exception as e:
             raise HTTPException(
@@ -88,11 +192,11 @@ class JobService:
                 detail=f"Error searching jobs: {str(e)}"
             )
 
-    async def search_jobs_parallel(self, search_params_list: List[Dict]) -> List[Dict]:
-        """Search for jobs with multiple parameter sets in parallel"""
+    async def search_jobs_parallel(self, search_params_list: List[Dict], failures: Optional[List[str]] = None) -> List[Dict]:
+        """Search for jobs with multiple parameter sets in parallel (failures as in search_jobs)"""
         try:
             # Create tasks for each search parameter set
-            tasks = [self.search_jobs(params) for params in search_params_list]
+            tasks = [self.search_jobs(params, failures) for params in search_params_list]
             
             # Run all searches concurrently
             results = await asyncio.gather(*tasks)
@@ -115,63 +219,105 @@ class JobService:
                 detail=f"Error in parallel job search: {str(e)}"
             )
 
-    def _get_cache_key(self, job_id: str) -> str:
-        """Generate Redis key with prefix"""
-        return f"{JOB_KEY_PREFIX}{job_id}"
-
-    def is_job_processed(self, job_id: str) -> bool:
-        """Check if job has been processed and cached"""
-        try:
-            exists = self.redis_client.exists(self._get_cache_key(job_id))
-            return exists
-        except Exception as e:
-            print(f"Error checking if job is processed: {e}")
-            return False
-
-    def cache_job(self, job_id: str, job_details: Dict):
+    async def cache_job(self, job_id: str, job_details: Dict):
         """Cache job details"""
         try:
-            # Only serialize if not already a string
-            if isinstance(job_details, dict):
-                serialized_data = json.dumps(job_details)
-            else:
-                serialized_data = job_details
-                
-            self.redis_client.set(
-                self._get_cache_key(job_id),
-                serialized_data,
-                ex=JOB_CACHE_EXPIRY
-            )
+            # Write-through to both tiers; dicts are encoded by the client's serializer
+            await self.job_cache.set(job_id, job_details)
         except Exception as e:
             print(f"Error caching job {job_id}: {e}")
 
-    def get_cached_job(self, job_id: str) -> Optional[Dict]:        
+    def _parse_cached_job(self, cached_data) -> Optional[Dict]:
+        """Turn a cached value into a job dict"""
+        if cached_data:
+            if isinstance(cached_data, bytes):
+                # If it's bytes, decode and parse JSON
+                return json.loads(cached_data.decode('utf-8'))
+            elif isinstance(cached_data, str):
+                # If it's string, parse JSON
+                return json.loads(cached_data)
+            elif isinstance(cached_data, dict):
+                # If it's already a dict, return as is
+                return cached_data
+        return None
+
+    async def get_cached_job(self, job_id: str) -> Optional[Dict]:        
         """Get cached job details"""
         try:
-            cached_data = self.redis_client.get(self._get_cache_key(job_id))
-            if cached_data:
-                if isinstance(cached_data, bytes):
-                    # If it's bytes, decode and parse JSON
-                    return json.loads(cached_data.decode('utf-8'))
-                elif isinstance(cached_data, str):
-                    # If it's string, parse JSON
-                    return json.loads(cached_data)
-                elif isinstance(cached_data, dict):
-                    # If it's already a dict, return as is
-                    return cached_data
-            return None
+            return self._parse_cached_job(await self.job_cache.get(job_id))
         except Exception as e:
             print(f"Error retrieving cached job {job_id}: {e}")
             return None
 
-    def get_job_details_by_id(self, job_id: str) -> Dict:
-        """Get detailed job information from LinkedIn API"""
+    async def get_cached_jobs(self, job_ids: List[str]) -> Dict[str, Dict]:
+        """Get cached details for many jobs (memory, then one Redis round trip), keyed by job_id (misses are left out)"""
         try:
-            return self.linkedin_api.get_job(job_id)
+            values = await self.job_cache.get_many(job_ids)
         except Exception as e:
-            print(f"Error getting job details from LinkedIn: {e}")
+            print(f"Error retrieving cached jobs: {e}")
+            return {}
+        return self._parse_cached_jobs(values)
+
+    async def get_cached_jobs_and_skips(self, job_ids: List[str]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        Cached details and skip reasons for many jobs with one Redis round trip:
+        ({job_id: job}, {job_id: reason}) for the jobs found in each cache.
+        """
+        try:
+            values, skips = await get_many_together((self.job_cache, job_ids), (self.job_skip_cache, job_ids))
+        except Exception as e:
+            print(f"Error retrieving cached jobs: {e}")
+            return {}, {}
+        skipped_jobs = {}
+        for job_id, skip in skips.items():
+            reason = self._active_skip_reason(skip)
+            if reason:
+                skipped_jobs[job_id] = reason
+        return self._parse_cached_jobs(values), skipped_jobs
+
+    def _active_skip_reason(self, skip) -> Optional[str]:
+        """Reason from a negative cache entry, unless the company has since been taken off the blacklist"""
+        if not isinstance(skip, dict):
+            return None
+        if skip.get("reason") == SKIP_BLACKLISTED and skip.get("company") not in BLACK_LIST:
+            return None
+        return skip.get("reason")
+
+    async def get_job_skip_reason(self, job_id: str) -> Optional[str]:
+        """Why a job was discarded recently, or None"""
+        try:
+            return self._active_skip_reason(await self.job_skip_cache.get(job_id))
+        except Exception as e:
+            print(f"Error retrieving skipped job {job_id}: {e}")
             return None
 
+    async def skip_job(self, job_id: str, reason: str, company: Optional[str] = None):
+        """Remember that a job was discarded, for the TTL of its reason"""
+        try:
+            await self.job_skip_cache.set(job_id, {
+                "reason": reason,
+                "company": company,
+                "skipped_at": datetime.now().isoformat()
+            }, ttl=JOB_SKIP_TTLS[reason])
+        except Exception as e:
+            print(f"Error caching skipped job {job_id}: {e}")
+
+    def _parse_cached_jobs(self, values: Dict[str, Any]) -> Dict[str, Dict]:
+        cached_jobs = {}
+        for job_id, cached_data in values.items():
+            try:
+                job = self._parse_cached_job(cached_data)
+            except Exception as e:
+                print(f"Error retrieving cached job {job_id}: {e}")
+                continue
+            if job:
+                cached_jobs[job_id] = job
+        return cached_jobs
+
+    async def get_job_details_by_id(self, job_id: str) -> Dict:
+        """Get detailed job information from LinkedIn API, off the event loop and within the LinkedIn rate limit"""
+        return await self.linkedin_scheduler.call(self.linkedin_api.get_job, job_id)
+
     def extract_metadata(self, details: Dict) -> Dict:
         """Extract basic metadata from job details"""
         return {
@@ -209,66 +355,106 @@ class JobService:
         return apply_method.get('companyApplyUrl', 'N/A')
 
     async def process_job(self, job: Dict) -> Optional[Dict]:
-        """Process a single job posting"""
+        """Process a single job posting and save it if it is new"""
+        job_result, is_new = await self._process_job(job)
+        if job_result is not None and is_new:
+            await self.save_job(job_result)
+        return job_result
+    
+    async def _process_job(self, job: Dict, cached_jobs: Optional[Dict[str, Dict]] = None,
+                           skipped_jobs: Optional[Dict[str, str]] = None,
+                           failures: Optional[List[str]] = None) -> Tuple[Optional[Dict], bool]:
+        """
+        Process a single job posting without saving it.
+        Returns (job, is_new); is_new is False when the job came from the cache or database.
+        cached_jobs and skipped_jobs are the result of a batched cache lookup covering this job, if one was done.
+        The job ID is appended to failures if the job could not be fetched.
+        """
         try:
             # Safely extract job_id
             if not job.get("entityUrn"):
-                return None
+                return None, False
                 
             job_id = job["entityUrn"].split(":")[-1]
+            is_new = False
             
-            # Check cache first
-            if self.is_job_processed(job_id):
-                cached_job = self.get_cached_job(job_id)
-                if cached_job:
-                    return cached_job
-            
-            # Check database
-            db_job = await self.job_repo.get_job_by_id(job_id)
-            if db_job:
-                return db_job
+            async def load():
+                nonlocal is_new
+                # Check database
+                db_job = await self.job_repo.get_job_by_id(job_id)
+                if db_job:
+                    return db_job
+                job_result, skip_reason, company = await self._fetch_job(job_id)
+                if skip_reason:
+                    await self.skip_job(job_id, skip_reason, company)
+                # No skip reason without a job means LinkedIn was unavailable
+                if job_result is None and skip_reason in (None, SKIP_FETCH_FAILED) and failures is not None:
+                    failures.append(job_id)
+                is_new = job_result is not None
+                return job_result
             
-            # Get full job details
-            details = self.get_job_details_by_id(job_id)
-            if not details:
-                return None
-            
-            # Extract metadata
-            metadata = self.extract_metadata(details)
-            
-            # Skip blacklisted companies
-            if metadata['company'] in BLACK_LIST:
-                return None
-            
-            # Get job description and process it
-            job_desc = details.get('description', {}).get('text', '')
-            job_features = self.extract_job_features(job_desc)
-            
-            # Prepare final result
-            job_result = {
-                "job_id": job_id,
-                "title": metadata['title'],
-                "company": metadata['company'],
-                "location": metadata['location'],
-                "workplace_type": metadata['workplace_type'],
-                "listed_time": metadata['listed_time'],
-                "apply_url": self.get_apply_url(details),
-                "description": job_desc,
-                "features": job_features,
-                "processed_date": datetime.now().isoformat()
-            }
-            
-            # Cache the result
-            self.cache_job(job_id, job_result)
-            
-            # Save to database
-            await self.job_repo.save_job(job_result)
-            
-            return job_result
+            # Cache first; on a miss, concurrent requests for the same job share one
+            # database lookup / LinkedIn fetch, and only the request that ran it saves the job
+            if cached_jobs is not None:
+                cached_job = cached_jobs.get(job_id)
+                if cached_job:
+                    return cached_job, False
+                if skipped_jobs and job_id in skipped_jobs:
+                    return None, False
+                job_result = self._parse_cached_job(await self.job_cache.load(job_id, load))
+            else:
+                if await self.get_job_skip_reason(job_id):
+                    return None, False
+                job_result = self._parse_cached_job(await self.job_cache.get(job_id, load))
+            return job_result, is_new
             
         except Exception as e:
             print(f"Error processing job: {e}")
-            return None 
+            if failures is not None:
+                failures.append(job.get("entityUrn", "").split(":")[-1])
+            return None, False
+
+    async def _fetch_job(self, job_id: str) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+        """
+        Fetch a job from LinkedIn and extract its features.
+        Returns (job, None, company), or (None, skip reason, company) when the job is discarded.
+        """
+        # Get full job details
+        try:
+            details = await self.get_job_details_by_id(job_id)
+        except CircuitOpenError:
+            # LinkedIn is failing as a whole; nothing is known about this job
+            return None, None, None
+        except Exception as e:
+            print(f"Error getting job details from LinkedIn: {e}")
+            return None, SKIP_FETCH_FAILED, None
+        if not details:
+            return None, SKIP_NOT_FOUND, None
+        
+        # Extract metadata
+        metadata = self.extract_metadata(details)
+        
+        # Skip blacklisted companies
+        if metadata['company'] in BLACK_LIST:
+            return None, SKIP_BLACKLISTED, metadata['company']
+        
+        # Get job description and process it
+        job_desc = details.get('description', {}).get('text', '')
+        job_features = await self.extract_job_features_async(job_desc)
+        
+        # Prepare final result
+        return {
+            "job_id": job_id,
+            "title": metadata['title'],
+            "company": metadata['company'],
+            "location": metadata['location'],
+            "workplace_type": metadata['workplace_type'],
+            "listed_time": metadata['listed_time'],
+            "apply_url": self.get_apply_url(details),
+            "description": job_desc,
+            "features": job_features,
+            "processed_date": datetime.now().isoformat()
+        }, None, metadata['company']
 
     async def get_job_by_id(self, job_id: str) -> Dict:
         """Get job details by ID"""
@@ -287,7 +473,7 @@ class JobService:
                 return db_job
                 
             # If not found, fetch from LinkedIn API
-            details = self.linkedin_api.get_job(job_id)
+            details = await self.get_job_details_by_id(job_id)
             if not details:
                 raise HTTPException(
                     status_code=404,
@@ -311,15 +497,38 @@ class JobService:
             )
     
     async def save_job(self, job_data: dict) -> str:
-        """Save job to database"""
+        """Save job to database and write it through the job cache"""
         try:
             success = await self.job_repo.save_job(job_data)
             if not success:
                 raise Exception(f"Failed to save job {job_data.get('job_id')}")
+            # Other workers drop their local copy, so an upsert that changed the features is seen everywhere
+            await self.job_cache.set(job_data["job_id"], job_data)
             return job_data["job_id"]
         except Exception as e:
+            # Processing already cached the job; drop it so the next request fetches and saves it again
+            if job_data.get("job_id"):
+                await self.job_cache.invalidate(job_data["job_id"])
             raise HTTPException(status_code=500, detail=f"Error saving job: {str(e)}")
 
+    async def save_jobs(self, jobs: List[Dict]) -> Dict[str, List[str]]:
+        """Save many jobs to the database in one round trip, then write them through the job cache"""
+        job_ids = [job["job_id"] for job in jobs if job and job.get("job_id")]
+        try:
+            result = await self.job_repo.save_jobs_bulk(jobs)
+        except Exception as e:
+            # Processing already cached these jobs; drop them so the next request fetches and saves them again
+            await self.job_cache.invalidate(*job_ids)
+            raise HTTPException(status_code=500, detail=f"Error saving jobs: {str(e)}")
+        if result["failed"]:
+            print(f"Failed to save jobs: {result['failed']}")
+        saved = set(result["inserted"]) | set(result["updated"])
+        await self.job_cache.invalidate(*[job_id for job_id in job_ids if job_id not in saved])
+        await self.job_cache.set_many({
+            job["job_id"]: job for job in jobs if job and job.get("job_id") in saved
+        })
+        return result
+
 # Example usage
 async def main():
     initialize_database()
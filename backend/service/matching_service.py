@@ -1,24 +1,90 @@
-from typing import Dict, List, Any
+import heapq
+import logging
+import os
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from fastapi import HTTPException
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 from backend.service.resume_service import ResumeService
 from backend.service.job_service import JobService
 from backend.repository.matchRepository import MatchRepository
+from backend.repository.resumeRepository import ResumeRepository
+from backend.repository.jobFeatureStore import JobFeatureStore, get_job_feature_store
 from backend.core.database import initialize_database
+from backend.utils.vector_utils import (
+    build_vocabulary,
+    to_sparse_matrix,
+    batch_cosine_similarity,
+    batch_overlap_ratio,
+    packed_popcount,
+)
+from backend.utils.ann_index import ANNIndex, create_ann_index, hash_word_vector, hash_keyword_matrix
+from backend.utils.skills_taxonomy import get_skill_taxonomy
+from backend.utils.resume_profile import ResumeProfile
+
+logger = logging.getLogger(__name__)
+
+# Candidate retrieval settings
+ANN_BACKEND = os.getenv('ANN_BACKEND', 'auto')
+ANN_DIM = int(os.getenv('ANN_DIM', 512))
+ANN_CANDIDATES = int(os.getenv('ANN_CANDIDATES', 200))
+
+def select_top_k(scored_items: Iterable[Tuple[float, Any]], k: Optional[int] = None, min_score: Optional[float] = None) -> List[Tuple[float, Any]]:
+    """
+    Stream (score, item) pairs through a min-heap bounded to k entries and return
+    the survivors, best first. Items below min_score are dropped; ties keep input order.
+    """
+    if k is not None and k <= 0:
+        return []
+    heap = []
+    for position, (score, item) in enumerate(scored_items):
+        if min_score is not None and score < min_score:
+            continue
+        entry = (score, -position, item)
+        if k is None or len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [(score, item) for score, _, item in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
 
 class MatchingService:
+    # Weights for the overall match score
+    MATCH_WEIGHTS = {
+        "skills": 0.5,
+        "experience": 0.3,
+        "keywords": 0.2
+    }
+    
     def __init__(self, resume_service: ResumeService, job_service: JobService):
         self.resume_service = resume_service
         self.job_service = job_service
         self.match_repo = MatchRepository()
+        # Canonical skill IDs for bitset skill matching
+        self.skill_taxonomy = get_skill_taxonomy()
+        self.ann_index: Optional[ANNIndex] = None
+        self._ann_store: Optional[JobFeatureStore] = None
+        # Store generation the index was built from; rows are renumbered when it changes
+        self._ann_generation: Optional[int] = None
+    
+    def build_resume_profile(self, resume: Dict) -> ResumeProfile:
+        """Match profile for a resume, derived from its features"""
+        return ResumeProfile.from_features(resume.get("resume_id"), resume.get("features", {}), self.skill_taxonomy)
+    
+    async def get_resume_profile(self, resume: Dict) -> ResumeProfile:
+        """Cached match profile for a resume, built from its features (and cached) on a cache miss"""
+        resume_id = resume.get("resume_id")
+        profile = await ResumeRepository.get_resume_profile(resume_id) if resume_id else None
+        if profile is None:
+            profile = self.build_resume_profile(resume)
+            if resume_id:
+                await ResumeRepository.save_resume_profile(profile)
+        return profile
     
     async def store_match_results(self, matches: List[Dict]):
         """Store match results in the database"""
         try:
-            for match in matches:
-                # Add user_id to match data
-                match_data = {
+            match_data = [
+                {
                     "resume_id": match["resume_id"],
                     "job_id": match["job_id"],
                     "match_score": match["match_score"],
@@ -27,9 +93,13 @@ class MatchingService:
                     "required_experience_years": match["required_experience_years"],
                     "resume_experience_years": match["resume_experience_years"]
                 }
-                success = await self.match_repo.save_match_result(match_data)
-                if not success:
-                    raise Exception(f"Failed to save match result for job {match['job_id']}")
+                for match in matches
+            ]
+            # One database statement and one Redis round trip for all matches
+            statuses = await self.match_repo.save_match_results_bulk(match_data)
+            failed = [match["job_id"] for match, success in zip(matches, statuses) if not success]
+            if failed:
+                raise Exception(f"Failed to save match results for jobs {', '.join(map(str, failed))}")
                     
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error storing match results: {str(e)}")
@@ -46,19 +116,38 @@ class MatchingService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error getting matches: {str(e)}")
     
-    async def match_resume_to_jobs(self, jobs: List[Dict], user_id: str = "1") -> List[Dict[str, Any]]:
-        """Match a resume against multiple jobs and return ranked matches"""
+    async def get_stored_matches_for_user(self, user_id: str, limit: int = 20, min_score: float = 50.0) -> List[Dict[str, Any]]:
+        """Best matches for a user's resume among the jobs already stored, without searching LinkedIn"""
+        resume = await self.resume_service.get_resume_by_user_id(user_id)
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        return await self.get_top_stored_matches(resume, limit, min_score)
+    
+    async def match_resume_to_jobs(self, jobs: List[Dict], user_id: str = "1", k: Optional[int] = None, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Match a resume against multiple jobs and return ranked matches.
+        With k and/or min_score, only the best k jobs scoring at least min_score
+        get their match details built.
+        """
         try:
             # Get resume by current user ID
             resume = await self.resume_service.get_resume_by_user_id(user_id)
             if not resume:
                 raise HTTPException(status_code=404, detail="Resume not found")
             
-            # Calculate match scores for each job
-            matches = []
-            for job in jobs:
-                match_result = self.match_resume_with_job(resume, job)
-                matches.append(match_result)
+            # Score all jobs at once, loading the resume profile once for the whole call
+            profile = await self.get_resume_profile(resume)
+            scores = self.score_jobs_batch(resume, jobs, profile)
+            
+            if k is not None or min_score is not None:
+                # Keep only (score, index) pairs in a bounded heap, then build details for the survivors
+                top = select_top_k(((float(score), i) for i, score in enumerate(scores)), k, min_score)
+                return [self._build_match_result(resume, jobs[i], score, profile) for score, i in top]
+            
+            matches = [
+                self._build_match_result(resume, job, score, profile)
+                for job, score in zip(jobs, scores)
+            ]
             
             # Sort by match score descending
             matches.sort(key=lambda x: x["match_score"], reverse=True)
@@ -73,22 +162,10 @@ class MatchingService:
     def match_resume_with_job(self, resume: Dict, job: Dict) -> Dict[str, Any]:
         """Match a single resume with a single job"""
         try:
-            # Calculate match score
-            match_score = self._calculate_match_score(resume, job)
+            profile = self.build_resume_profile(resume)
+            match_score = float(self.score_jobs_batch(resume, [job], profile)[0])
             
-            # Get match details
-            match_details = self._get_match_details(resume, job)
-            
-            return {
-                "resume_id": resume["resume_id"],
-                "job_id": job["job_id"],
-                "match_score": int(match_score),
-                "matched_skills": match_details["matched_skills"],
-                "missing_skills": match_details["missing_skills"],
-                "required_experience_years": match_details["experience_years"]["required"],
-                "resume_experience_years": match_details["experience_years"]["resume"],
-                "job": job
-            }
+            return self._build_match_result(resume, job, match_score, profile)
             
         except Exception as e:
             raise HTTPException(
@@ -96,6 +173,96 @@ class MatchingService:
                 detail=f"Error matching resume with job: {str(e)}"
             )
     
+    def _build_match_result(self, resume: Dict, job: Dict, match_score: float,
+                            profile: Optional[ResumeProfile] = None) -> Dict[str, Any]:
+        """Assemble the match result for a resume/job pair from an already computed score"""
+        match_details = self._get_match_details(resume, job, profile)
+        
+        return {
+            "resume_id": resume["resume_id"],
+            "job_id": job["job_id"],
+            "match_score": int(match_score),
+            "matched_skills": match_details["matched_skills"],
+            "missing_skills": match_details["missing_skills"],
+            "required_experience_years": match_details["experience_years"]["required"],
+            "resume_experience_years": match_details["experience_years"]["resume"],
+            "job": job
+        }
+    
+    def score_jobs_batch(self, resume: Dict, jobs: List[Dict], profile: Optional[ResumeProfile] = None) -> np.ndarray:
+        """
+        Score a resume against many jobs at once.
+        
+        Builds sparse matrices over a vocabulary shared by the resume and all jobs,
+        so skill, experience and keyword scores are computed in a few array operations
+        instead of once per job. Returns the same values as _calculate_match_score.
+        profile is the resume's match profile (see get_resume_profile); built here if not given.
+        """
+        if not jobs:
+            return np.zeros(0)
+        
+        resume_features = resume.get("features", {}) or {}
+        if not resume_features:
+            return np.zeros(len(jobs))
+        profile = profile or self.build_resume_profile(resume)
+        job_features = [job.get("features", {}) or {} for job in jobs]
+        
+        # Skills: share of each job's skills found in the resume
+        skill_scores = self._calculate_skill_match_batch(profile, job_features)
+        
+        # Experience
+        experience_scores = self._calculate_experience_match_batch(
+            profile.experience_years,
+            [features.get("required_experience_years", 0) for features in job_features]
+        )
+        
+        # Keywords: cosine similarity of word frequencies against the unit resume vector
+        job_words = [features.get("word_frequencies", {}) or {} for features in job_features]
+        word_vocabulary = build_vocabulary([profile.keywords] + job_words)
+        keyword_scores = batch_cosine_similarity(
+            to_sparse_matrix([profile.keywords], word_vocabulary),
+            to_sparse_matrix(job_words, word_vocabulary),
+            query_norm=1.0 if profile.keywords else 0.0
+        )
+        
+        total_scores = (
+            skill_scores * self.MATCH_WEIGHTS["skills"] +
+            experience_scores * self.MATCH_WEIGHTS["experience"] +
+            keyword_scores * self.MATCH_WEIGHTS["keywords"]
+        )
+        
+        # Jobs without features score zero, as in _calculate_match_score
+        has_features = np.array([bool(features) for features in job_features])
+        return np.where(has_features, np.round(total_scores * 100, 2), 0.0)
+    
+    def _calculate_skill_match_batch(self, profile: ResumeProfile, job_features: List[Dict]) -> np.ndarray:
+        """Skill scores for many jobs: packed bitset popcounts when every skill has a taxonomy ID"""
+        resume_bits = profile.skill_bits
+        job_bits = [self.skill_taxonomy.bitset_from_features(features) for features in job_features]
+        if resume_bits is not None and all(bits is not None for bits in job_bits):
+            if not resume_bits:
+                return np.zeros(len(job_features))
+            width = (len(self.skill_taxonomy.canonical_skills) + 7) // 8
+            job_matrix = np.frombuffer(
+                b''.join(bits.to_bytes(width, 'little') for bits in job_bits), dtype=np.uint8
+            ).reshape(len(job_bits), width)
+            resume_row = np.frombuffer(resume_bits.to_bytes(width, 'little'), dtype=np.uint8)
+            job_skill_counts = packed_popcount(job_matrix)
+            overlap = packed_popcount(job_matrix & resume_row)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(job_skill_counts > 0, overlap / job_skill_counts, 0.0)
+        
+        # Skills outside the taxonomy: sparse overlap over a per-batch vocabulary
+        resume_skills = profile.skills
+        if not resume_skills:
+            return np.zeros(len(job_features))
+        job_skills = [set(s.lower() for s in features.get("skills", []) or []) for features in job_features]
+        skill_vocabulary = build_vocabulary([resume_skills] + job_skills)
+        return batch_overlap_ratio(
+            to_sparse_matrix([resume_skills], skill_vocabulary, binary=True),
+            to_sparse_matrix(job_skills, skill_vocabulary, binary=True)
+        )
+    
     def _calculate_match_score(self, resume: Dict, job: Dict) -> float:
         """Calculate overall match score between resume and job"""
         try:
@@ -108,33 +275,29 @@ class MatchingService:
                 return 0.0
             
             # Calculate individual scores
-            skill_score = self._calculate_skill_match(
-                resume_features.get("skills", []),
-                job_features.get("skills", [])
-            )
-            
-            print("skill_score", skill_score)
+            resume_bits = self.skill_taxonomy.bitset_from_features(resume_features)
+            job_bits = self.skill_taxonomy.bitset_from_features(job_features)
+            if resume_bits is not None and job_bits is not None:
+                skill_score = self._calculate_skill_match_bits(resume_bits, job_bits)
+            else:
+                skill_score = self._calculate_skill_match(
+                    resume_features.get("skills", []),
+                    job_features.get("skills", [])
+                )
             
             experience_score = self._calculate_experience_match(
                 resume_features.get("work_experience_years", 0),
                 job_features.get("required_experience_years", 0)
             )
             
-            print("experience_score", experience_score)
-            
             keyword_score = self._calculate_keyword_match(
                 resume_features.get("word_frequencies", {}),
                 job_features.get("word_frequencies", {})
             )
-            
-            print("keyword_score", keyword_score)
+            logger.debug(f"Match scores: skills {skill_score}, experience {experience_score}, keywords {keyword_score}")
             
             # Weighted average of scores
-            weights = {
-                "skills": 0.5,
-                "experience": 0.3,
-                "keywords": 0.2
-            }
+            weights = self.MATCH_WEIGHTS
             
             total_score = (
                 skill_score * weights["skills"] +
@@ -145,7 +308,7 @@ class MatchingService:
             return round(total_score * 100, 2)  # Convert to percentage with 2 decimal places
             
         except Exception as e:
-            print(f"Error calculating match score: {e}")
+            logger.error(f"Error calculating match score: {e}")
             return 0.0
     
     def _calculate_skill_match(self, resume_skills: List[str], job_skills: List[str]) -> float:
@@ -166,6 +329,12 @@ class MatchingService:
             
         return len(matched_skills) / len(job_skills_set)
     
+    def _calculate_skill_match_bits(self, resume_bits: int, job_bits: int) -> float:
+        """Same as _calculate_skill_match on skill bitsets: popcount(resume & job) / popcount(job)"""
+        if not resume_bits or not job_bits:
+            return 0.0
+        return (resume_bits & job_bits).bit_count() / job_bits.bit_count()
+    
     def _calculate_experience_match(self, resume_years: float, required_years: float) -> float:
         """Calculate match score based on years of experience"""
         try:
@@ -190,6 +359,148 @@ class MatchingService:
             print(f"Resume years: {resume_years}, Required years: {required_years}")
             return 0.0
     
+    def _sync_ann_index(self, store: JobFeatureStore) -> ANNIndex:
+        """
+        Build the ANN index on first use and add any jobs appended to the store since.
+        Rebuilt from scratch when the store renumbered its rows (e.g. a reader reloaded the file).
+        """
+        snapshot = store.snapshot()
+        if self.ann_index is None or self._ann_store is not store or self._ann_generation != snapshot["generation"]:
+            self.ann_index = create_ann_index(ANN_BACKEND, ANN_DIM)
+            self._ann_store = store
+            self._ann_generation = snapshot["generation"]
+        
+        # Rows replaced in the store keep their old vector; candidates are rescored exactly anyway
+        indexed = len(self.ann_index)
+        if indexed < len(snapshot["job_ids"]):
+            vectors = hash_keyword_matrix(snapshot["keywords"][indexed:], snapshot["word_vocabulary"], ANN_DIM)
+            self.ann_index.add(snapshot["job_ids"][indexed:], vectors)
+        return self.ann_index
+    
+    def retrieve_candidate_jobs(self, resume: Dict, k: int = ANN_CANDIDATES, store: Optional[JobFeatureStore] = None) -> List[str]:
+        """Return the job_ids of the k stored jobs whose keyword vectors are closest to the resume"""
+        index = self._sync_ann_index(store or get_job_feature_store())
+        resume_words = (resume.get("features", {}) or {}).get("word_frequencies", {}) or {}
+        query = hash_word_vector(resume_words, ANN_DIM)
+        return list(dict.fromkeys(job_id for job_id, _ in index.search(query, k)))
+    
+    def match_resume_to_stored_jobs(self, resume: Dict, k: int = ANN_CANDIDATES, store: Optional[JobFeatureStore] = None,
+                                    profile: Optional[ResumeProfile] = None) -> Tuple[List[str], np.ndarray]:
+        """Pull top-k candidates from the ANN index, then rescore them exactly"""
+        candidates = self.retrieve_candidate_jobs(resume, k, store)
+        return self.score_resume_against_store(resume, store, job_ids=candidates, profile=profile)
+    
+    async def get_top_stored_matches(self, resume: Dict, limit: int = 20, min_score: float = 50.0,
+                                     store: Optional[JobFeatureStore] = None) -> List[Dict[str, Any]]:
+        """
+        Best stored jobs for a resume: candidates retrieved from the ANN index and rescored
+        exactly from the job feature store, with job payloads loaded and match details built
+        only for the top `limit` survivors.
+        """
+        profile = await self.get_resume_profile(resume)
+        job_ids, scores = self.match_resume_to_stored_jobs(resume, max(ANN_CANDIDATES, limit), store, profile)
+        top = select_top_k(zip(scores.tolist(), job_ids), limit, min_score)
+        
+        # One query for the survivors' payloads; jobs deleted since they were stored are left out
+        jobs = {job["job_id"]: job for job in await self.job_service.job_repo.get_jobs_by_ids([job_id for _, job_id in top])}
+        return [
+            self._build_match_result(resume, jobs[job_id], score, profile)
+            for score, job_id in top
+            if job_id in jobs
+        ]
+    
+    def score_resume_against_store(self, resume: Dict, store: Optional[JobFeatureStore] = None, job_ids: Optional[List[str]] = None,
+                                   profile: Optional[ResumeProfile] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Score a resume against the jobs in the job feature store.
+        
+        Uses the store's precomputed keyword matrix and skill bitsets, so no job
+        rows are read from Postgres. Scores every stored job unless job_ids is given.
+        Returns (job_ids, scores) in store row order or in the order of job_ids.
+        """
+        snapshot = (store or get_job_feature_store()).snapshot()
+        keywords = snapshot["keywords"]
+        skill_bits = snapshot["skill_bits"]
+        required_experience = snapshot["required_experience"]
+        if job_ids is None:
+            job_ids = list(snapshot["job_ids"])
+        else:
+            job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id in snapshot["row_index"]]
+            rows = np.array([snapshot["row_index"][job_id] for job_id in job_ids], dtype=np.int64)
+            keywords = keywords[rows]
+            skill_bits = skill_bits[rows]
+            required_experience = required_experience[rows]
+        
+        resume_features = resume.get("features", {}) or {}
+        if not job_ids or not resume_features:
+            return job_ids, np.zeros(len(job_ids))
+        
+        profile = profile or self.build_resume_profile(resume)
+        
+        # Skills: AND the resume bitset with every job row and count the bits
+        resume_skills = profile.skills
+        resume_bits = np.zeros(skill_bits.shape[1] * 8, dtype=bool)
+        resume_bits[[snapshot["skill_vocabulary"][s] for s in resume_skills if s in snapshot["skill_vocabulary"]]] = True
+        job_skill_counts = packed_popcount(skill_bits)
+        overlap = packed_popcount(skill_bits & np.packbits(resume_bits))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill_scores = np.where(job_skill_counts > 0, overlap / job_skill_counts, 0.0)
+        if not resume_skills:
+            skill_scores = np.zeros(len(job_ids))
+        
+        # Experience
+        experience_scores = self._calculate_experience_match_batch(
+            profile.experience_years,
+            required_experience
+        )
+        
+        # Keywords: the resume vector is unit length, including words outside the store vocabulary
+        keyword_scores = batch_cosine_similarity(
+            to_sparse_matrix([profile.keywords], snapshot["word_vocabulary"]),
+            keywords,
+            query_norm=1.0 if profile.keywords else 0.0
+        )
+        
+        total_scores = (
+            skill_scores * self.MATCH_WEIGHTS["skills"] +
+            experience_scores * self.MATCH_WEIGHTS["experience"] +
+            keyword_scores * self.MATCH_WEIGHTS["keywords"]
+        )
+        return job_ids, np.round(total_scores * 100, 2)
+    
+    def _calculate_experience_match_batch(self, resume_years: float, required_years: List[float]) -> np.ndarray:
+        """Vectorized _calculate_experience_match for one resume against many jobs"""
+        try:
+            resume_years = float(resume_years or 0)
+        except (TypeError, ValueError):
+            return np.zeros(len(required_years))
+        # Profiles mark unparseable resume experience as NaN
+        if np.isnan(resume_years):
+            return np.zeros(len(required_years))
+        
+        # Unparseable requirements score zero, like the per-job error path
+        required = np.zeros(len(required_years))
+        valid = np.ones(len(required_years), dtype=bool)
+        for i, years in enumerate(required_years):
+            try:
+                required[i] = float(years or 0)
+            except (TypeError, ValueError):
+                valid[i] = False
+        # NaN marks requirements the feature store could not parse
+        valid &= ~np.isnan(required)
+        required = np.nan_to_num(required)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            partial = 0.5 + ((resume_years - (required - 2)) / 4)
+            ratio = np.maximum(0.0, resume_years / required)
+        
+        scores = np.where(
+            (required == 0) | (resume_years >= required),
+            1.0,
+            np.where(resume_years >= (required - 2), partial, ratio)
+        )
+        return np.where(valid, scores, 0.0)
+    
     def _calculate_keyword_match(self, resume_words: Dict[str, int], job_words: Dict[str, int]) -> float:
         """Calculate match score based on keyword frequency similarity"""
         if not resume_words or not job_words:
@@ -220,17 +531,24 @@ class MatchingService:
         
         return max(0.0, min(1.0, similarity))
     
-    def _get_match_details(self, resume: Dict, job: Dict) -> Dict[str, Any]:
+    def _get_match_details(self, resume: Dict, job: Dict, profile: Optional[ResumeProfile] = None) -> Dict[str, Any]:
         """Get detailed breakdown of the match"""
         resume_features = resume.get("features", {})
         job_features = job.get("features", {})
         
         # Get matched and missing skills
-        resume_skills = set(s.lower() for s in resume_features.get("skills", []))
-        job_skills = set(s.lower() for s in job_features.get("skills", []))
-        
-        matched_skills = resume_skills.intersection(job_skills)
-        missing_skills = job_skills - resume_skills
+        profile = profile or self.build_resume_profile(resume)
+        resume_bits = profile.skill_bits
+        job_bits = self.skill_taxonomy.bitset_from_features(job_features)
+        if resume_bits is not None and job_bits is not None:
+            matched_skills = self.skill_taxonomy.bitset_to_skills(resume_bits & job_bits)
+            missing_skills = self.skill_taxonomy.bitset_to_skills(job_bits & ~resume_bits)
+        else:
+            resume_skills = profile.skills
+            job_skills = set(s.lower() for s in job_features.get("skills", []))
+            
+            matched_skills = resume_skills.intersection(job_skills)
+            missing_skills = job_skills - resume_skills
         
         return {
             "matched_skills": sorted(list(matched_skills)),
@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from backend.service.redis_service import AsyncRedisClient
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 'in_process': every API worker runs the prefetch loop (a Redis lock stops two workers refreshing the same search)
+# 'off': the API only reads prefetched results; run `python -m backend.service.prefetch_service` as a separate worker
+PREFETCH_MODE = os.getenv('PREFETCH_MODE', 'off').lower()
+# Seconds between refreshes of a saved search, randomized by +/- PREFETCH_JITTER so searches do not refresh in lockstep
+PREFETCH_INTERVAL = float(os.getenv('PREFETCH_INTERVAL', 1800))
+PREFETCH_JITTER = float(os.getenv('PREFETCH_JITTER', 0.2))
+# Seconds between checks for searches that are due
+PREFETCH_TICK = float(os.getenv('PREFETCH_TICK', 60))
+# Saved searches are the most recent distinct user queries; older or unrequested ones are dropped
+PREFETCH_MAX_SEARCHES = int(os.getenv('PREFETCH_MAX_SEARCHES', 50))
+PREFETCH_SEARCH_MAX_AGE = int(os.getenv('PREFETCH_SEARCH_MAX_AGE', 604800))  # 7 days
+# Prefetched results are served for this long; after that requests search LinkedIn again
+PREFETCH_RESULT_TTL = int(os.getenv('PREFETCH_RESULT_TTL', 2 * PREFETCH_INTERVAL))
+PREFETCH_KEY_PREFIX = os.getenv('PREFETCH_KEY_PREFIX', 'prefetch:')
+# Failed or incomplete refreshes are tried again sooner than a full interval, but not in a tight loop
+PREFETCH_RETRY_DELAY = max(PREFETCH_TICK, PREFETCH_INTERVAL / 10)
+# Upper bound on one refresh; the search lock expires after it in case a worker dies mid-refresh
+PREFETCH_LOCK_TTL = int(os.getenv('PREFETCH_LOCK_TTL', 600))
+
+def search_key(search_params: Dict) -> str:
+    """Stable identifier for a set of search parameters (list order does not matter)"""
+    canonical = {
+        name: sorted(value) if isinstance(value, list) else value
+        for name, value in search_params.items()
+    }
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - PREFETCH_JITTER, 1 + PREFETCH_JITTER)
+
+class PrefetchRegistry:
+    """
+    Saved searches in Redis, shared by API workers and prefetch workers:
+        searches  sorted set  key -> last time a user ran the search
+        params    hash        key -> search parameters (JSON)
+        due       sorted set  key -> next refresh time
+        results:  string      job_ids found by the last refresh (JSON), expiring after PREFETCH_RESULT_TTL
+    """
+
+    def __init__(self, redis_client: Optional[AsyncRedisClient] = None, prefix: str = PREFETCH_KEY_PREFIX):
+        self.redis_client = redis_client or AsyncRedisClient()
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    async def record_search(self, search_params: Dict, now: Optional[float] = None) -> str:
+        """Save a user's search for prefetching (or mark it as requested again); returns its key"""
+        now = time.time() if now is None else now
+        key = search_key(search_params)
+        pipe = self.redis_client.client.pipeline(transaction=False)
+        pipe.zadd(self._key("searches"), {key: now})
+        pipe.hset(self._key("params"), key, json.dumps(search_params))
+        # New searches are due right away; known ones keep their schedule
+        pipe.zadd(self._key("due"), {key: now}, nx=True)
+        await pipe.execute()
+        return key
+
+    async def store_results(self, key: str, job_ids: List[str], now: Optional[float] = None):
+        """Save the job_ids a refresh found and schedule the next refresh"""
+        now = time.time() if now is None else now
+        pipe = self.redis_client.client.pipeline(transaction=False)
+        pipe.set(self._key(f"results:{key}"), json.dumps(job_ids), ex=PREFETCH_RESULT_TTL)
+        pipe.zadd(self._key("due"), {key: now + _jittered(PREFETCH_INTERVAL)})
+        await pipe.execute()
+
+    async def get_results(self, key: str) -> Optional[List[str]]:
+        """job_ids from the last refresh, or None if the search has no fresh prefetched results"""
+        data = await self.redis_client.client.get(self._key(f"results:{key}"))
+        return json.loads(data) if data is not None else None
+
+    async def reschedule(self, key: str, delay: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        await self.redis_client.client.zadd(self._key("due"), {key: now + _jittered(delay)})
+
+    async def prune(self, now: Optional[float] = None) -> List[str]:
+        """Drop searches nobody ran within PREFETCH_SEARCH_MAX_AGE, and the oldest beyond PREFETCH_MAX_SEARCHES"""
+        now = time.time() if now is None else now
+        client = self.redis_client.client
+        stale = await client.zrangebyscore(self._key("searches"), "-inf", now - PREFETCH_SEARCH_MAX_AGE)
+        overflow = await client.zrange(self._key("searches"), 0, -(PREFETCH_MAX_SEARCHES + 1))
+        removed = sorted(set(key.decode() for key in stale + overflow))
+        if removed:
+            pipe = client.pipeline(transaction=False)
+            pipe.zrem(self._key("searches"), *removed)
+            pipe.zrem(self._key("due"), *removed)
+            pipe.hdel(self._key("params"), *removed)
+            await pipe.execute()
+        return removed
+
+    async def due_searches(self, now: Optional[float] = None) -> List[Tuple[str, Dict]]:
+        """(key, search_params) for saved searches whose refresh time has passed, most overdue first"""
+        now = time.time() if now is None else now
+        client = self.redis_client.client
+        keys = [key.decode() for key in await client.zrangebyscore(self._key("due"), "-inf", now)]
+        if not keys:
+            return []
+        params = await client.hmget(self._key("params"), keys)
+        return [(key, json.loads(data)) for key, data in zip(keys, params) if data is not None]
+
+    async def acquire(self, key: str) -> Optional[str]:
+        """
+        Claim a search for refreshing, so only one worker refreshes it at a time.
+        Returns the lock token to release it with, or None if another worker holds it.
+        """
+        token = uuid.uuid4().hex
+        if await self.redis_client.client.set(self._key(f"lock:{key}"), token, nx=True, ex=PREFETCH_LOCK_TTL):
+            return token
+        return None
+
+    async def release(self, key: str, token: str) -> bool:
+        """Release our claim; a lock that expired and was taken by another worker is left alone"""
+        return await self.redis_client.delete_if_equals(self._key(f"lock:{key}"), token)
+
+class JobPrefetcher:
+    """
+    Refreshes saved searches in the background: LinkedIn search, detail fetches,
+    feature extraction and saving all happen through job_service.search_jobs, off the
+    request path. Requests for a saved search then read pre-featurized jobs from the
+    cache and database instead of searching LinkedIn.
+    """
+
+    def __init__(self, job_service, registry: Optional[PrefetchRegistry] = None):
+        self.job_service = job_service
+        self.registry = registry or PrefetchRegistry(job_service.async_redis_client)
+        self._stats = {"refreshed": 0, "refresh_failures": 0, "partial_results": 0, "jobs_prefetched": 0,
+                       "served_prefetched": 0, "served_live": 0}
+
+    async def search_live(self, search_params: Dict) -> List[Dict]:
+        """
+        Search LinkedIn now for a search without prefetched results, and save it for prefetching.
+        If jobs in the search could not be fetched from LinkedIn, its results are incomplete
+        and are not kept as prefetched results.
+        """
+        failures = []
+        jobs = await self.job_service.search_jobs_parallel([search_params], failures)
+        await self.record_search(search_params, jobs, complete=not failures)
+        return jobs
+
+    async def record_search(self, search_params: Dict, jobs: Optional[List[Dict]] = None, complete: bool = True):
+        """
+        Remember a user's search for prefetching. jobs are the results of a live search
+        just run for it, saved as prefetched results so repeat requests are served from them
+        (unless they are empty or the search was not complete).
+        """
+        try:
+            key = await self.registry.record_search(search_params)
+            if jobs is not None:
+                self._stats["served_live"] += 1
+                if jobs and complete:
+                    await self.registry.store_results(key, [job['job_id'] for job in jobs if job.get('job_id')])
+                else:
+                    self._stats["partial_results"] += 1
+        except Exception as e:
+            logger.error(f"Error recording search for prefetch: {str(e)}")
+
+    async def get_prefetched_jobs(self, search_params: Dict) -> Optional[List[Dict]]:
+        """Jobs from the last refresh of this search (cache, then database), or None if it has none"""
+        try:
+            job_ids = await self.registry.get_results(search_key(search_params))
+        except Exception as e:
+            logger.error(f"Error reading prefetched results: {str(e)}")
+            return None
+        if job_ids is None:
+            return None
+
+        jobs = await self.job_service.get_cached_jobs(job_ids)
+        missing = [job_id for job_id in job_ids if job_id not in jobs]
+        if missing:
+            for job in await self.job_service.job_repo.get_jobs_by_ids(missing):
+                jobs[job['job_id']] = job
+        self._stats["served_prefetched"] += 1
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+    async def refresh(self, key: str, search_params: Dict) -> Optional[int]:
+        """
+        Run one saved search now; returns the number of jobs found, or None if another worker has it.
+        A run that found nothing, or that could not fetch some of its jobs from LinkedIn, is retried
+        sooner and leaves the previous results in place (returns None).
+        """
+        token = await self.registry.acquire(key)
+        if token is None:
+            return None
+        try:
+            failures = []
+            jobs = await self.job_service.search_jobs(search_params, failures)
+            if not jobs or failures:
+                self._stats["partial_results"] += 1
+                logger.warning(f"Prefetch of search {key} was incomplete, keeping its previous results")
+                await self.registry.reschedule(key, PREFETCH_RETRY_DELAY)
+                return None
+            await self.registry.store_results(key, [job['job_id'] for job in jobs if job.get('job_id')])
+            self._stats["refreshed"] += 1
+            self._stats["jobs_prefetched"] += len(jobs)
+            return len(jobs)
+        except Exception as e:
+            self._stats["refresh_failures"] += 1
+            logger.error(f"Error prefetching search {key}: {str(e)}")
+            await self.registry.reschedule(key, PREFETCH_RETRY_DELAY)
+            return None
+        finally:
+            await self.registry.release(key, token)
+
+    async def run_once(self) -> Dict[str, Optional[int]]:
+        """Refresh every due search, one at a time (the LinkedIn scheduler bounds each search's fetches)"""
+        await self.registry.prune()
+        results = {}
+        for key, search_params in await self.registry.due_searches():
+            results[key] = await self.refresh(key, search_params)
+        return results
+
+    async def run_forever(self):
+        """Refresh due searches every PREFETCH_TICK seconds (jittered); runs until cancelled"""
+        while True:
+            try:
+                results = await self.run_once()
+                if results:
+                    logger.info(f"Prefetched {len(results)} searches: {results}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Prefetch error: {str(e)}")
+            await asyncio.sleep(_jittered(PREFETCH_TICK))
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+_prefetch_task: Optional[asyncio.Task] = None
+
+def start_prefetcher(prefetcher: JobPrefetcher):
+    """Run the prefetch loop on the running event loop (once per process)"""
+    global _prefetch_task
+    if _prefetch_task is None or _prefetch_task.done():
+        _prefetch_task = asyncio.get_running_loop().create_task(prefetcher.run_forever())
+    return _prefetch_task
+
+async def stop_prefetcher():
+    global _prefetch_task
+    if _prefetch_task is not None:
+        _prefetch_task.cancel()
+        try:
+            await _prefetch_task
+        except asyncio.CancelledError:
+            pass
+        _prefetch_task = None
+
+async def main():
+    """Standalone prefetch worker: python -m backend.service.prefetch_service"""
+    from backend.core.database import initialize_database, open_db_pool, close_db_pool
+    from backend.repository.jobFeatureStore import start_feature_store_maintenance, stop_feature_store_maintenance
+    from backend.service.job_service import JobService
+
+    initialize_database()
+    await open_db_pool()
+    job_service = JobService()
+    start_feature_store_maintenance()
+    try:
+        await JobPrefetcher(job_service).run_forever()
+    finally:
+        job_service.shutdown()
+        await stop_feature_store_maintenance()
+        await close_db_pool()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
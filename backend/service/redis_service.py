@@ -1,8 +1,14 @@
+import asyncio
 import redis
 import os
-from typing import Optional
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from backend.utils.lazy_module import LazyModule 
+from backend.utils import cache_serializers
+from backend.utils.cache_serializers import CacheSerializer, get_serializer
 import json
 # pip install redis hiredis 
 
@@ -11,37 +17,159 @@ from datetime import timedelta
 
 import json
 import redis
+import redis.asyncio as aioredis
+
+# Connection settings shared by every RedisClient
+REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
+REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+REDIS_DB = int(os.getenv('REDIS_DB', 0))
+REDIS_PASSWORD = os.getenv('REDIS_PASSWORD') or None
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', 5))
+# Encoding for dict/list values: 'legacy' (plain JSON), 'json', 'msgpack', 'msgpack+zstd', 'auto', ...
+REDIS_SERIALIZER = os.getenv('REDIS_SERIALIZER', 'legacy')
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles datetime objects"""
     def default(self, obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
         return super().default(obj)
-    
+
+def _serialize(value, serializer: Optional[CacheSerializer] = None):
+    """Serialize dicts and lists (to JSON without a serializer), leave other values to redis-py"""
+    if isinstance(value, (dict, list)):
+        if serializer is not None:
+            return serializer.dumps(value)
+        return json.dumps(value, cls=DateTimeEncoder)
+    return value
+
+def _deserialize(data):
+    """Decode a stored value: serializer-encoded entries by their format byte, else JSON when possible"""
+    if data:
+        if cache_serializers.is_encoded(data):
+            return cache_serializers.decode(data)
+        # Check if it's bytes and decode it first
+        if isinstance(data, bytes):
+            try:
+                return json.loads(data.decode('utf-8'))
+            except json.JSONDecodeError:
+                return data.decode('utf-8')
+        return data
+    return None
+
+# One connection pool per (host, port, db), shared by all clients in the process
+_pools: Dict[Tuple[str, int, int], Any] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(host=None, port=None, db=None):
+    """Shared, thread-safe connection pool for a Redis server and database"""
+    key = (host or REDIS_HOST, port or REDIS_PORT, REDIS_DB if db is None else db)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = redis.ConnectionPool(
+                    host=key[0],
+                    port=key[1],
+                    db=key[2],
+                    password=REDIS_PASSWORD,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                )
+                _pools[key] = pool
+    return pool
+
+class RedisPipeline:
+    """
+    Non-transactional pipeline with RedisClient's serialization.
+    Commands are queued and sent in one round trip by execute(); get results are decoded.
+    """
+    def __init__(self, pipeline, serializer: Optional[CacheSerializer] = None):
+        self._pipeline = pipeline
+        self._serializer = serializer
+        self._decode: List[bool] = []
+        self.results: List[Any] = []
+
+    def get(self, key):
+        self._pipeline.get(key)
+        self._decode.append(True)
+        return self
+
+    def set(self, key, value, ex=None):
+        self._pipeline.set(name=key, value=_serialize(value, self._serializer), ex=ex)
+        self._decode.append(False)
+        return self
+
+    def exists(self, key):
+        self._pipeline.exists(key)
+        self._decode.append(False)
+        return self
+
+    def pttl(self, key):
+        """Remaining lifetime in milliseconds (-1 without expiry, -2 if the key is missing)"""
+        self._pipeline.pttl(key)
+        self._decode.append(False)
+        return self
+
+    def delete(self, key):
+        self._pipeline.delete(key)
+        self._decode.append(False)
+        return self
+
+    def execute(self) -> List[Any]:
+        raw = self._pipeline.execute() if self._decode else []
+        self.results = [_deserialize(value) if decode else value for value, decode in zip(raw, self._decode)]
+        self._decode = []
+        return self.results
+
 class RedisClient:
-    def __init__(self, host='localhost', port=6379, db=0):
+    def __init__(self, host=None, port=None, db=None, client=None, serializer: Optional[str] = None):
         # db 0 is default for redis among 16 other logical databases
-        self.client = redis.Redis(host=host, port=port, db=db)
+        # Clients share one connection pool per server instead of opening their own
+        self.client = client or redis.Redis(connection_pool=get_connection_pool(host, port, db))
+        # Encoding for values this client writes; entries in any format are always readable
+        self.serializer = get_serializer(serializer or REDIS_SERIALIZER)
 
     def get(self, key):
         """Get value from Redis and deserialize if it's JSON"""
-        data = self.client.get(key)
-        if data:
-            # Check if it's bytes and decode it first
-            if isinstance(data, bytes):
-                try:
-                    return json.loads(data.decode('utf-8'))
-                except json.JSONDecodeError:
-                    return data.decode('utf-8')
-            return data
-        return None
+        return _deserialize(self.client.get(key))
     
     def set(self, key, value, ex=None):
         """Set value in Redis with optional expiry, serializing if needed"""
         # Serialize value if it's a dict or list
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value, cls=DateTimeEncoder)
-        self.client.set(name=key, value=value, ex=ex)
+        self.client.set(name=key, value=_serialize(value, self.serializer), ex=ex)
+    
+    def mget(self, keys: Iterable[str]) -> List[Any]:
+        """Get several values in one round trip; missing keys come back as None"""
+        keys = list(keys)
+        if not keys:
+            return []
+        return [_deserialize(data) for data in self.client.mget(keys)]
+    
+    def mset_with_ttl(self, mapping: Dict[str, Any], ex=None):
+        """Set several keys with the same expiry in one pipelined round trip"""
+        if not mapping:
+            return
+        with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+    
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue commands and send them in one round trip when the block exits.
+        
+        Usage:
+            with redis_client.pipeline() as pipe:
+                pipe.get("a").exists("b")
+            pipe.results  # decoded replies, in command order
+        """
+        pipe = RedisPipeline(self.client.pipeline(transaction=False), self.serializer)
+        yield pipe
+        pipe.execute()
     
     def exists(self, key):
         """Check if key exists in Redis"""
@@ -56,6 +184,119 @@ class RedisClient:
         return f"{prefix}:{identifier}"
 
 
+# Deletes KEYS[1] only while it still holds ARGV[1], in one atomic step
+_DELETE_IF_EQUALS_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Async pools per event loop, created on first use inside it: asyncio connections
+# belong to the loop that opened them and cannot be reused from another one
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int, int], Any]]" = weakref.WeakKeyDictionary()
+
+def get_async_connection_pool(host=None, port=None, db=None):
+    """Shared asyncio connection pool for a Redis server and database on the running event loop"""
+    key = (host or REDIS_HOST, port or REDIS_PORT, REDIS_DB if db is None else db)
+    pools = _async_pools.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get(key)
+    if pool is None:
+        pool = aioredis.ConnectionPool(
+            host=key[0],
+            port=key[1],
+            db=key[2],
+            password=REDIS_PASSWORD,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+        pools[key] = pool
+    return pool
+
+class AsyncRedisPipeline(RedisPipeline):
+    """RedisPipeline for redis.asyncio: queue commands, then await execute()"""
+    async def execute(self) -> List[Any]:
+        raw = await self._pipeline.execute() if self._decode else []
+        self.results = [_deserialize(value) if decode else value for value, decode in zip(raw, self._decode)]
+        self._decode = []
+        return self.results
+
+class AsyncRedisClient:
+    """
+    asyncio counterpart of RedisClient with the same JSON/datetime serialization,
+    for use inside coroutines so cache calls do not block the event loop.
+    """
+    def __init__(self, host=None, port=None, db=None, client=None, serializer: Optional[str] = None):
+        self._client = client
+        self._address = (host, port, db)
+        # event loop -> client on that loop's pool, created on first use
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        # Encoding for values this client writes; entries in any format are always readable
+        self.serializer = get_serializer(serializer or REDIS_SERIALIZER)
+    
+    @property
+    def client(self):
+        """The given client, or a redis.asyncio client on the running event loop's connection pool"""
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = aioredis.Redis(connection_pool=get_async_connection_pool(*self._address))
+            self._loop_clients[loop] = client
+        return client
+
+    async def get(self, key):
+        """Get value from Redis and deserialize if it's JSON"""
+        return _deserialize(await self.client.get(key))
+    
+    async def set(self, key, value, ex=None):
+        """Set value in Redis with optional expiry, serializing if needed"""
+        await self.client.set(name=key, value=_serialize(value, self.serializer), ex=ex)
+    
+    async def mget(self, keys: Iterable[str]) -> List[Any]:
+        """Get several values in one round trip; missing keys come back as None"""
+        keys = list(keys)
+        if not keys:
+            return []
+        return [_deserialize(data) for data in await self.client.mget(keys)]
+    
+    async def mset_with_ttl(self, mapping: Dict[str, Any], ex=None):
+        """Set several keys with the same expiry in one pipelined round trip"""
+        if not mapping:
+            return
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+    
+    @asynccontextmanager
+    async def pipeline(self):
+        """Queue commands and send them in one round trip when the block exits"""
+        pipe = AsyncRedisPipeline(self.client.pipeline(transaction=False), self.serializer)
+        yield pipe
+        await pipe.execute()
+    
+    async def exists(self, key):
+        """Check if key exists in Redis"""
+        return await self.client.exists(key) > 0
+    
+    async def delete(self, *keys):
+        """Delete keys from Redis"""
+        await self.client.delete(*keys)
+    
+    async def delete_if_equals(self, key, value: str) -> bool:
+        """
+        Delete key only if it still holds value (e.g. a lock token), so a lock that expired
+        and was taken by another worker is left alone; True if the key was deleted
+        """
+        return bool(await self.client.eval(_DELETE_IF_EQUALS_SCRIPT, 1, key, value))
+        
+    def generate_cache_key(self, prefix, identifier):
+        """Generate a consistent cache key with a prefix and identifier"""
+        return f"{prefix}:{identifier}"
+
+
 # class RedisService:
 #     def __init__(self):
 #         """Initialize Redis connection with environment variables"""
@@ -12,10 +12,12 @@ from typing import Dict, Any
 from backend.core.database import initialize_database
 from ..utils.file_processors import extract_text_from_file, SUPPORTED_MIME_TYPES
 
+# Feature extraction: scan each resume once and keep per-section skills
+SINGLE_PASS_SKILLS = os.getenv('SINGLE_PASS_SKILLS', 'false').lower() == 'true'
 
 class ResumeService:
     def __init__(self):
-        self.feature_extractor = FeatureExtractor()
+        self.feature_extractor = FeatureExtractor(single_pass_skills=SINGLE_PASS_SKILLS)
         self.supported_mime_types = SUPPORTED_MIME_TYPES
         self.resume_repo = ResumeRepository()
         
@@ -23,11 +25,15 @@ class ResumeService:
         """Extract features from resume text"""
         try:
             features = self.feature_extractor.extract_resume_features(text)
-            return {
+            resume_features = {
                 "work_experience_years": features["work_experience_years"],
                 "skills": features["skills"],
                 "word_frequencies": dict(list(features["word_frequencies"].items())[:100])
             }
+            for key in ("section_skills", "skill_bits", "skill_ids_version"):
+                if key in features:
+                    resume_features[key] = features[key]
+            return resume_features
         except Exception as e:
             raise HTTPException(
                 status_code=500,
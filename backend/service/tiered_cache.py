@@ -0,0 +1,437 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+from backend.service.redis_service import AsyncRedisClient
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# In-process tier defaults
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv('LOCAL_CACHE_MAX_ENTRIES', 1024))
+LOCAL_CACHE_TTL = float(os.getenv('LOCAL_CACHE_TTL', 60))
+# Workers tell each other to drop local copies on this Redis pub/sub channel
+CACHE_INVALIDATION_CHANNEL = os.getenv('CACHE_INVALIDATION_CHANNEL', 'cache:invalidate')
+
+# Single-flight loading: one worker holds a short Redis lock while it runs the loader for a key
+LOAD_LOCK_TTL_MS = int(os.getenv('LOAD_LOCK_TTL_MS', 10000))
+# Other workers poll Redis for the value this long before loading it themselves
+LOAD_LOCK_WAIT = float(os.getenv('LOAD_LOCK_WAIT', 5))
+LOAD_LOCK_POLL_INTERVAL = float(os.getenv('LOAD_LOCK_POLL_INTERVAL', 0.05))
+# Probabilistic early refresh (XFetch); higher values refresh earlier, 0 disables it
+XFETCH_BETA = float(os.getenv('XFETCH_BETA', 1.0))
+
+# Identifies this process so it ignores its own invalidation messages
+_ORIGIN = uuid.uuid4().hex
+
+class LocalTTLCache:
+    """Thread-safe, size-bounded LRU whose entries also expire after ttl seconds"""
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES, ttl: float = LOCAL_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, value); expired entries count as missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class TieredCache:
+    """
+    Read-through / write-through cache: in-process LRU, then Redis, then a loader (Postgres).
+
+    Values held in the local tier are shared between callers; treat them as read-only.
+    Writes and invalidations are published so other workers drop their local copy.
+
+    Loads are single-flight: concurrent callers in a process share one loader call per
+    key, and a short Redis lock makes other workers wait for that result instead of
+    loading it too. Redis hits close to expiry are refreshed early in the background
+    (XFetch), so hot keys rarely expire under load.
+    """
+
+    def __init__(self, name: str, key_prefix: str, redis_ttl: int,
+                 redis_client: Optional[AsyncRedisClient] = None,
+                 max_entries: int = LOCAL_CACHE_MAX_ENTRIES, local_ttl: float = LOCAL_CACHE_TTL):
+        self.name = name
+        self.key_prefix = key_prefix
+        self.redis_ttl = redis_ttl
+        self.redis_client = redis_client or AsyncRedisClient()
+        self.local = LocalTTLCache(max_entries, local_ttl)
+        self._stats = {"local_hits": 0, "redis_hits": 0, "loader_hits": 0, "misses": 0, "redis_errors": 0,
+                       "coalesced_loads": 0, "lock_waits": 0, "early_refreshes": 0}
+        # key -> the load task concurrent callers share, and background refreshes in progress
+        self._loads: Dict[str, asyncio.Task] = {}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        # Moving average of loader run time in seconds, the recompute cost XFetch weighs against the TTL
+        self._load_seconds: Optional[float] = None
+        register_cache(self)
+
+    def redis_key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    async def get(self, key: str, loader: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """Value for key from the first tier that has it; a loader result fills both cache tiers"""
+        found, value = self.local.get(key)
+        if found:
+            self._stats["local_hits"] += 1
+            return value
+
+        try:
+            async with self.redis_client.pipeline() as pipe:
+                pipe.get(self.redis_key(key)).pttl(self.redis_key(key))
+            value, ttl_ms = pipe.results
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error reading {self.name} cache: {str(e)}")
+            value, ttl_ms = None, -2
+        if value is not None:
+            self._stats["redis_hits"] += 1
+            self.local.set(key, value)
+            if loader is not None and self._should_refresh_early(ttl_ms):
+                self._refresh_in_background(key, loader)
+            return value
+
+        if loader is not None:
+            return await self.load(key, loader)
+        self._stats["misses"] += 1
+        return None
+
+    async def load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run loader for a key known to be missing from the cache, filling both tiers.
+        Concurrent calls for the same key share one loader call.
+        """
+        task = self._loads.get(key)
+        if task is not None:
+            self._stats["coalesced_loads"] += 1
+        else:
+            task = self._start_load(key, loader, refresh=False)
+        # Shielded so one caller being cancelled does not cancel the load for the others
+        return await asyncio.shield(task)
+
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]], refresh: bool) -> asyncio.Task:
+        tasks = self._refreshes if refresh else self._loads
+        task = asyncio.get_running_loop().create_task(self._load_locked(key, loader, refresh))
+        tasks[key] = task
+
+        def done(finished: asyncio.Task):
+            if tasks.get(key) is finished:
+                del tasks[key]
+        task.add_done_callback(done)
+        return task
+
+    async def _load_locked(self, key: str, loader: Callable[[], Awaitable[Any]], refresh: bool) -> Any:
+        """
+        Load under the key's Redis lock. Without the lock, wait for the worker holding it
+        to fill Redis, and load here only if it does not do so in time.
+        A background refresh skips keys another worker is already refreshing.
+        """
+        lock_key = f"{self.redis_key(key)}:lock"
+        token = uuid.uuid4().hex
+        locked = await self._acquire_lock(lock_key, token)
+        if not locked:
+            if refresh:
+                return None
+            self._stats["lock_waits"] += 1
+            deadline = time.monotonic() + LOAD_LOCK_WAIT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOAD_LOCK_POLL_INTERVAL)
+                try:
+                    value = await self.redis_client.get(self.redis_key(key))
+                except Exception as e:
+                    self._stats["redis_errors"] += 1
+                    logger.error(f"Redis error reading {self.name} cache: {str(e)}")
+                    break
+                if value is not None:
+                    self._stats["redis_hits"] += 1
+                    self.local.set(key, value)
+                    return value
+
+        try:
+            started = time.monotonic()
+            value = await loader()
+            self._record_load_time(time.monotonic() - started)
+            if value is None:
+                if not refresh:
+                    self._stats["misses"] += 1
+                return None
+            if refresh:
+                self._stats["early_refreshes"] += 1
+                # Other workers may hold the old value locally
+                await self.set(key, value)
+            else:
+                self._stats["loader_hits"] += 1
+                self.local.set(key, value)
+                await self._redis_set(key, value)
+            return value
+        finally:
+            if locked:
+                await self._release_lock(lock_key, token)
+
+    async def _acquire_lock(self, lock_key: str, token: str) -> bool:
+        """True if this worker now holds the lock; also True when Redis is down, so loads still run"""
+        try:
+            return bool(await self.redis_client.client.set(lock_key, token, nx=True, px=LOAD_LOCK_TTL_MS))
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error locking {self.name} cache: {str(e)}")
+            return True
+
+    async def _release_lock(self, lock_key: str, token: str):
+        # Only delete our own lock; if it expired and another worker took it, leave theirs alone
+        try:
+            await self.redis_client.delete_if_equals(lock_key, token)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error unlocking {self.name} cache: {str(e)}")
+
+    def _record_load_time(self, seconds: float):
+        if self._load_seconds is None:
+            self._load_seconds = seconds
+        else:
+            self._load_seconds = 0.8 * self._load_seconds + 0.2 * seconds
+
+    def _should_refresh_early(self, ttl_ms: int) -> bool:
+        """
+        XFetch: refresh when the remaining TTL is below load_time * beta * -ln(U).
+        The chance rises sharply as expiry nears and with slower loaders, so usually one
+        request refreshes a hot key shortly before it would expire.
+        """
+        if XFETCH_BETA <= 0 or not self._load_seconds or ttl_ms is None or ttl_ms < 0:
+            return False
+        return ttl_ms / 1000 <= -self._load_seconds * XFETCH_BETA * math.log(1.0 - random.random())
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        if key in self._loads or key in self._refreshes:
+            return
+        task = self._start_load(key, loader, refresh=True)
+
+        def log_error(finished: asyncio.Task):
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.error(f"Error refreshing {self.name} cache: {str(finished.exception())}")
+        task.add_done_callback(log_error)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for many keys (local tier, then one Redis MGET); misses are left out"""
+        return (await get_many_together((self, keys)))[0]
+
+    def _get_many_local(self, keys: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """(values found in the local tier, keys left for Redis)"""
+        found_values = {}
+        remote_keys = []
+        for key in keys:
+            found, value = self.local.get(key)
+            if found:
+                self._stats["local_hits"] += 1
+                found_values[key] = value
+            else:
+                remote_keys.append(key)
+        return found_values, remote_keys
+
+    def _fill_from_redis(self, found_values: Dict[str, Any], remote_keys: List[str], values: List[Any]):
+        for key, value in zip(remote_keys, values):
+            if value is None:
+                self._stats["misses"] += 1
+                continue
+            self._stats["redis_hits"] += 1
+            self.local.set(key, value)
+            found_values[key] = value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        Write-through: update both tiers and tell other workers to drop their local copy.
+        ttl overrides the cache's Redis TTL for this entry (and caps its local lifetime).
+        """
+        self.local.set(key, value, None if ttl is None else min(ttl, self.local.ttl))
+        await self._redis_set(key, value, ttl)
+        await self._publish_invalidation(key)
+
+    async def set_many(self, mapping: Dict[str, Any]):
+        """Write-through for many keys: one pipelined Redis write and one invalidation message"""
+        if not mapping:
+            return
+        for key, value in mapping.items():
+            self.local.set(key, value)
+        try:
+            await self.redis_client.mset_with_ttl(
+                {self.redis_key(key): value for key, value in mapping.items()}, self.redis_ttl
+            )
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error writing {self.name} cache: {str(e)}")
+        await self._publish_invalidation(*mapping)
+
+    async def invalidate(self, *keys: str):
+        """Remove keys from both tiers on every worker"""
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        try:
+            await self.redis_client.delete(*[self.redis_key(key) for key in keys])
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error invalidating {self.name} cache: {str(e)}")
+        await self._publish_invalidation(*keys)
+
+    async def _redis_set(self, key: str, value: Any, ttl: Optional[int] = None):
+        try:
+            await self.redis_client.set(self.redis_key(key), value, ex=self.redis_ttl if ttl is None else ttl)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error writing {self.name} cache: {str(e)}")
+
+    async def _publish_invalidation(self, *keys: str):
+        try:
+            await self.redis_client.client.publish(
+                CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": _ORIGIN, "cache": self.name, "keys": list(keys)})
+            )
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.error(f"Redis error publishing {self.name} invalidation: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit counts and hit rates per tier; each rate is over the lookups that reached that tier"""
+        stats = dict(self._stats)
+        lookups = (stats["local_hits"] + stats["redis_hits"] + stats["loader_hits"]
+                   + stats["misses"] + stats["coalesced_loads"])
+        after_local = lookups - stats["local_hits"]
+        after_redis = after_local - stats["redis_hits"]
+        stats.update({
+            "lookups": lookups,
+            "local_entries": len(self.local),
+            "local_hit_rate": stats["local_hits"] / lookups if lookups else 0.0,
+            "redis_hit_rate": stats["redis_hits"] / after_local if after_local else 0.0,
+            "loader_hit_rate": stats["loader_hits"] / after_redis if after_redis else 0.0,
+            "in_flight_loads": len(self._loads) + len(self._refreshes),
+        })
+        return stats
+
+async def get_many_together(*lookups: Tuple[TieredCache, Iterable[str]]) -> List[Dict[str, Any]]:
+    """
+    get_many for several caches that share a Redis client, with a single MGET for
+    all of their local misses. Returns one dict of found values per (cache, keys) pair.
+    """
+    local_results = [cache._get_many_local(keys) for cache, keys in lookups]
+    redis_keys = [cache.redis_key(key) for (cache, _), (_, remote_keys) in zip(lookups, local_results)
+                  for key in remote_keys]
+    values = []
+    if redis_keys:
+        redis_client = lookups[0][0].redis_client
+        try:
+            values = await redis_client.mget(redis_keys)
+        except Exception as e:
+            for cache, _ in lookups:
+                cache._stats["redis_errors"] += 1
+            logger.error(f"Redis error reading {', '.join(cache.name for cache, _ in lookups)} cache: {str(e)}")
+            values = [None] * len(redis_keys)
+
+    results = []
+    offset = 0
+    for (cache, _), (found_values, remote_keys) in zip(lookups, local_results):
+        cache._fill_from_redis(found_values, remote_keys, values[offset:offset + len(remote_keys)])
+        offset += len(remote_keys)
+        results.append(found_values)
+    return results
+
+# Caches by name, so invalidation messages can find the local tier to evict from
+_caches: Dict[str, TieredCache] = {}
+
+def register_cache(cache: TieredCache):
+    _caches[cache.name] = cache
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tier hit-rate metrics for every tiered cache in this process"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+def handle_invalidation_message(data) -> bool:
+    """Evict the local copies named in an invalidation message from another worker"""
+    try:
+        message = json.loads(data)
+    except (TypeError, ValueError):
+        return False
+    if message.get("origin") == _ORIGIN:
+        return False
+    cache = _caches.get(message.get("cache"))
+    if cache is None:
+        return False
+    for key in message.get("keys", []):
+        cache.local.delete(key)
+    return True
+
+async def listen_for_invalidations(redis_client: Optional[AsyncRedisClient] = None):
+    """Evict local entries as other workers publish writes; runs until cancelled"""
+    redis_client = redis_client or AsyncRedisClient()
+    while True:
+        pubsub = redis_client.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    handle_invalidation_message(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Updates missed while disconnected would leave local copies stale until their TTL
+            logger.error(f"Cache invalidation listener error: {str(e)}")
+            for cache in _caches.values():
+                cache.local.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+_listener_task: Optional[asyncio.Task] = None
+
+def start_invalidation_listener():
+    """Start the pub/sub listener on the running event loop (once per process)"""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.get_running_loop().create_task(listen_for_invalidations())
+    return _listener_task
+
+async def stop_invalidation_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
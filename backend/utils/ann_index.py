@@ -0,0 +1,173 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# Optional ANN backends (pip install faiss-cpu / hnswlib)
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def _word_bucket(word: str, dim: int) -> Tuple[int, float]:
+    """Stable hash of a word into (bucket, sign); Python's hash() is salted per process"""
+    digest = zlib.crc32(word.encode('utf-8'))
+    return digest % dim, (1.0 if (digest >> 31) & 1 else -1.0)
+
+def hash_word_vector(word_frequencies: Dict[str, int], dim: int) -> np.ndarray:
+    """Project a word frequency dict onto a fixed-size, L2-normalized dense vector"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word, count in (word_frequencies or {}).items():
+        bucket, sign = _word_bucket(word, dim)
+        vector[bucket] += sign * float(count)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def hash_keyword_matrix(keywords: csr_matrix, vocabulary: Dict[str, int], dim: int) -> np.ndarray:
+    """Project every row of a keyword CSR matrix the same way as hash_word_vector"""
+    if keywords.shape[0] == 0:
+        return np.zeros((0, dim), dtype=np.float32)
+    rows = np.zeros(len(vocabulary), dtype=np.int64)
+    signs = np.zeros(len(vocabulary), dtype=np.float64)
+    for word, column in vocabulary.items():
+        rows[column], signs[column] = _word_bucket(word, dim)
+    projection = csr_matrix((signs, (np.arange(len(vocabulary)), rows)), shape=(len(vocabulary), dim))
+    vectors = np.asarray((keywords @ projection).todense(), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class ANNIndex(ABC):
+    """Inner-product nearest neighbour index over L2-normalized vectors, keyed by job_id"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids: List[str] = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Append vectors (one row per id) to the index"""
+
+    @abstractmethod
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Up to k (id, inner product) pairs, best first"""
+
+
+class BruteForceIndex(ANNIndex):
+    """Exact search with a single matrix-vector product; the fallback when no ANN library is installed"""
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def add(self, ids, vectors):
+        self.vectors = np.vstack([self.vectors, np.asarray(vectors, dtype=np.float32)])
+        self.ids.extend(ids)
+
+    def search(self, vector, k):
+        if not self.ids or k <= 0:
+            return []
+        scores = self.vectors @ np.asarray(vector, dtype=np.float32)
+        k = min(k, len(self.ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+
+class FaissIndex(ANNIndex):
+    """FAISS flat or IVF inner-product index"""
+
+    def __init__(self, dim: int, kind: str = 'flat', nlist: int = 100, nprobe: int = 8):
+        if faiss is None:
+            raise ImportError("faiss is not installed (pip install faiss-cpu)")
+        super().__init__(dim)
+        self.kind = kind
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.index = faiss.IndexFlatIP(dim)
+
+    def add(self, ids, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.kind == 'ivf' and not isinstance(self.index, faiss.IndexIVFFlat):
+            # IVF needs enough vectors to train its coarse quantizer; stay flat until then
+            if len(self.ids) + len(vectors) >= self.nlist * 39:
+                existing = self.index.reconstruct_n(0, self.index.ntotal) if self.index.ntotal else np.zeros((0, self.dim), dtype=np.float32)
+                training = np.vstack([existing, vectors])
+                quantizer = faiss.IndexFlatIP(self.dim)
+                index = faiss.IndexIVFFlat(quantizer, self.dim, self.nlist, faiss.METRIC_INNER_PRODUCT)
+                index.train(training)
+                index.add(training)
+                index.nprobe = self.nprobe
+                self._quantizer = quantizer  # the IVF index does not own its quantizer
+                self.index = index
+                self.ids.extend(ids)
+                return
+        self.index.add(vectors)
+        self.ids.extend(ids)
+
+    def search(self, vector, k):
+        if not self.ids or k <= 0:
+            return []
+        scores, positions = self.index.search(np.asarray(vector, dtype=np.float32).reshape(1, -1), min(k, len(self.ids)))
+        return [(self.ids[i], float(s)) for s, i in zip(scores[0], positions[0]) if i >= 0]
+
+
+class HnswIndex(ANNIndex):
+    """hnswlib HNSW graph index (inner product space)"""
+
+    def __init__(self, dim: int, max_elements: int = 10000, m: int = 16, ef_construction: int = 200, ef_search: int = 64):
+        if hnswlib is None:
+            raise ImportError("hnswlib is not installed (pip install hnswlib)")
+        super().__init__(dim)
+        self.ef_search = ef_search
+        self.index = hnswlib.Index(space='ip', dim=dim)
+        self.index.init_index(max_elements=max_elements, ef_construction=ef_construction, M=m)
+        self.index.set_ef(ef_search)
+
+    def add(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        needed = len(self.ids) + len(vectors)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, self.index.get_max_elements() * 2))
+        labels = np.arange(len(self.ids), needed)
+        self.index.add_items(vectors, labels)
+        self.ids.extend(ids)
+
+    def search(self, vector, k):
+        if not self.ids or k <= 0:
+            return []
+        k = min(k, len(self.ids))
+        self.index.set_ef(max(self.ef_search, k))
+        labels, distances = self.index.knn_query(np.asarray(vector, dtype=np.float32).reshape(1, -1), k=k)
+        # hnswlib reports inner product distance as 1 - <a, b>
+        return [(self.ids[label], 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+
+def create_ann_index(backend: str = 'auto', dim: int = 512, **kwargs) -> ANNIndex:
+    """
+    Create an ANN index by backend name: 'faiss-flat', 'faiss-ivf', 'hnsw', 'brute' or 'auto'
+    ('auto' picks the first installed of faiss, hnswlib, brute force).
+    """
+    if backend == 'auto':
+        backend = 'faiss-flat' if faiss is not None else 'hnsw' if hnswlib is not None else 'brute'
+    if backend == 'faiss-flat':
+        return FaissIndex(dim, kind='flat', **kwargs)
+    if backend == 'faiss-ivf':
+        return FaissIndex(dim, kind='ivf', **kwargs)
+    if backend == 'hnsw':
+        return HnswIndex(dim, **kwargs)
+    if backend == 'brute':
+        return BruteForceIndex(dim)
+    raise ValueError(f"Unknown ANN backend: {backend}")
@@ -0,0 +1,134 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# First byte of every encoded value. Bytes 0xF5-0xFF never occur in UTF-8, so
+# headerless JSON/text written before serializers existed cannot be mistaken for them.
+FORMAT_JSON = 0xF5
+FORMAT_MSGPACK = 0xF6
+FORMAT_JSON_ZLIB = 0xF7
+FORMAT_MSGPACK_ZLIB = 0xF8
+FORMAT_MSGPACK_ZSTD = 0xF9
+FORMAT_MSGPACK_LZ4 = 0xFA
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+def _to_builtin(obj):
+    """Encode datetimes as ISO strings, like DateTimeEncoder"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+def _json_pack(value) -> bytes:
+    return json.dumps(value, default=_to_builtin, separators=(',', ':')).encode('utf-8')
+
+def _json_unpack(data: bytes):
+    return json.loads(data)
+
+def _msgpack_pack(value) -> bytes:
+    return msgpack.packb(value, default=_to_builtin, use_bin_type=True)
+
+def _msgpack_unpack(data: bytes):
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+def _zstd_compress(data: bytes) -> bytes:
+    # Compressor objects are not thread-safe, so each call gets its own
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+class CacheSerializer:
+    """
+    Encodes cache values as one format byte followed by the packed (and optionally
+    compressed) payload, so any reader can tell how an entry was written.
+    """
+
+    def __init__(self, name: str, format_byte: int,
+                 pack: Callable[[Any], bytes], unpack: Callable[[bytes], Any],
+                 compress: Optional[Callable[[bytes], bytes]] = None,
+                 decompress: Optional[Callable[[bytes], bytes]] = None):
+        self.name = name
+        self.format_byte = format_byte
+        self._pack = pack
+        self._unpack = unpack
+        self._compress = compress
+        self._decompress = decompress
+
+    def dumps(self, value) -> bytes:
+        payload = self._pack(value)
+        if self._compress is not None:
+            payload = self._compress(payload)
+        return bytes((self.format_byte,)) + payload
+
+    def loads(self, data: bytes):
+        payload = data[1:]
+        if self._decompress is not None:
+            payload = self._decompress(payload)
+        return self._unpack(payload)
+
+# Serializers whose libraries are installed, by name and by format byte
+SERIALIZERS: Dict[str, CacheSerializer] = {}
+_BY_FORMAT: Dict[int, CacheSerializer] = {}
+
+def _register(serializer: CacheSerializer):
+    SERIALIZERS[serializer.name] = serializer
+    _BY_FORMAT[serializer.format_byte] = serializer
+
+_register(CacheSerializer('json', FORMAT_JSON, _json_pack, _json_unpack))
+_register(CacheSerializer('json+zlib', FORMAT_JSON_ZLIB, _json_pack, _json_unpack,
+                          lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress))
+if msgpack is not None:
+    _register(CacheSerializer('msgpack', FORMAT_MSGPACK, _msgpack_pack, _msgpack_unpack))
+    _register(CacheSerializer('msgpack+zlib', FORMAT_MSGPACK_ZLIB, _msgpack_pack, _msgpack_unpack,
+                              lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress))
+    if zstandard is not None:
+        _register(CacheSerializer('msgpack+zstd', FORMAT_MSGPACK_ZSTD, _msgpack_pack, _msgpack_unpack,
+                                  _zstd_compress, _zstd_decompress))
+    if lz4_frame is not None:
+        _register(CacheSerializer('msgpack+lz4', FORMAT_MSGPACK_LZ4, _msgpack_pack, _msgpack_unpack,
+                                  lz4_frame.compress, lz4_frame.decompress))
+
+# Preference order for 'auto': smallest entries first, stdlib-only fallback last
+_AUTO_ORDER = ('msgpack+zstd', 'msgpack+lz4', 'msgpack+zlib', 'json+zlib')
+
+def get_serializer(name: Optional[str] = None) -> Optional[CacheSerializer]:
+    """
+    Serializer by name, or the best installed compressed one for 'auto'.
+    None or 'legacy' keeps writing headerless JSON, readable by older code.
+    """
+    if name is None or name == 'legacy':
+        return None
+    if name == 'auto':
+        return next(SERIALIZERS[candidate] for candidate in _AUTO_ORDER if candidate in SERIALIZERS)
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown or unavailable cache serializer: {name} (available: {', '.join(SERIALIZERS)})")
+    return SERIALIZERS[name]
+
+def is_encoded(data) -> bool:
+    """Whether a stored value starts with a serializer format byte"""
+    return isinstance(data, bytes) and len(data) > 0 and data[0] >= FORMAT_JSON
+
+def decode(data: bytes):
+    """Decode a value written by any CacheSerializer, whichever one the reader is configured with"""
+    serializer = _BY_FORMAT.get(data[0])
+    if serializer is None:
+        raise ValueError(f"Cache entry has format byte {data[0]:#x}, but its serializer is not installed")
+    return serializer.loads(data)
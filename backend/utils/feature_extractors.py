@@ -1,19 +1,93 @@
+import multiprocessing
+import os
 import re
+from bisect import bisect_right
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 import logging
 from backend.utils.text_processor import TextProcessor
-from backend.utils.skills_taxonomy import SkillTaxonomy
+from backend.utils.skills_taxonomy import get_skill_taxonomy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Common section headers in resumes - using uppercase since many resumes have section headers in caps
+RESUME_SECTION_PATTERNS = {
+    'experience': r'(?:WORK\s+EXPERIENCE|PROFESSIONAL\s+EXPERIENCE|EMPLOYMENT|WORK\s+HISTORY)',
+    'education': r'(?:EDUCATION|ACADEMIC\s+BACKGROUND|ACADEMIC\s+HISTORY)',
+    'skills': r'(?:TECHNICAL\s+SKILLS|SKILLS|CORE\s+COMPETENCIES|EXPERTISE)',
+    'projects': r'(?:PROJECTS|PERSONAL\s+PROJECTS|ACADEMIC\s+PROJECTS)',
+    'certifications': r'(?:CERTIFICATIONS|CERTIFICATES|ACCREDITATIONS)',
+    'summary': r'(?:SUMMARY|PROFILE|OBJECTIVE|ABOUT\s+ME)'
+}
+
+# Common section headers in job descriptions
+JOB_SECTION_PATTERNS = {
+    'responsibilities': r'(?:Responsibilities|Duties|What\s+You\'ll\s+Do|Role\s+Description|Key\s+Responsibilities)',
+    'requirements': r'(?:Requirements|Qualifications|What\s+You\'ll\s+Need|What\s+We\'re\s+Looking\s+For)',
+    'preferred': r'(?:Preferred\s+Qualifications|Nice\s+to\s+Have|Preferred\s+Skills|Desired\s+Skills)',
+    'benefits': r'(?:Benefits|What\s+We\s+Offer|Perks|Compensation)',
+    'company': r'(?:About\s+Us|Company\s+Overview|Who\s+We\s+Are)'
+}
+
+def _compile_section_regex(section_patterns: Dict[str, str]) -> re.Pattern:
+    """
+    Merge section header patterns into one regex labelled by named groups.
+    The alternation sits in a lookahead so headers overlapping each other
+    (e.g. "Qualifications" inside "Preferred Qualifications") are all reported,
+    just like running each pattern separately. A leading class of the headers'
+    first letters lets the scan skip most positions without trying every branch.
+    """
+    alternation = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in section_patterns.items())
+    first_letters = set()
+    for pattern in section_patterns.values():
+        # Patterns are written as (?:Header|Other\s+Header|...)
+        if not (pattern.startswith('(?:') and pattern.endswith(')')):
+            return re.compile(f'(?=(?:{alternation}))', re.IGNORECASE)
+        first_letters.update(header[0].lower() for header in pattern[3:-1].split('|'))
+    return re.compile(f'(?=[{"".join(sorted(first_letters))}])(?=(?:{alternation}))', re.IGNORECASE)
+
+# Precompiled patterns, built once at import instead of on every call
+SECTION_REGEXES = {
+    'resume': _compile_section_regex(RESUME_SECTION_PATTERNS),
+    'job': _compile_section_regex(JOB_SECTION_PATTERNS)
+}
+WORK_EXPERIENCE_FALLBACK_REGEX = re.compile(r'WORK\s+EXPERIENCE(.*?)(?:PROJECTS|TECHNICAL\s+SKILLS|$)', re.DOTALL | re.IGNORECASE)
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)'
+DATE_RANGE_REGEXES = [
+    # "Month Year - Month Year" or "Month Year - Present"
+    re.compile(_MONTH + r'\s+\d{4}\s*[–\-]\s*' + _MONTH + r'\s+\d{4}', re.IGNORECASE),
+    re.compile(_MONTH + r'\s+\d{4}\s*[–\-]\s*present', re.IGNORECASE)
+]
+DATE_OR_PRESENT_REGEX = re.compile(_MONTH + r'\s+\d{4}|present', re.IGNORECASE)
+POSITION_BLOCK_REGEX = re.compile(
+    r'([^\n]+?(?:engineer|developer|analyst|manager|intern|specialist|consultant|director)[^\n]*?)' +
+    r'([^\n]*?' + _MONTH + r'\s+\d{4}[^\n]*)',
+    re.IGNORECASE
+)
+DATE_RANGE_SPLIT_REGEX = re.compile(r'\s*[–\-]\s*')  # Handle both hyphen and en-dash
+REQUIRED_EXPERIENCE_REGEXES = [
+    # General experience
+    re.compile(r'(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?', re.IGNORECASE),
+    re.compile(r'experience(?:\s*of)?\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)', re.IGNORECASE),
+    re.compile(r'(?:with|having)\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?', re.IGNORECASE),
+    re.compile(r'(?:minimum|at\s+least)\s*(\d+)(?:\+|\s*\+)?\s*(?:years|yrs)', re.IGNORECASE)
+]
+ENTRY_LEVEL_REGEX = re.compile(
+    r'entry[- ]level|junior|no experience required|0-1 years|recent graduate',
+    re.IGNORECASE
+)
+
 class FeatureExtractor:
-    def __init__(self):
+    def __init__(self, single_pass_skills: bool = False):
         self.text_processor = TextProcessor()
-        self.skill_taxonomy = SkillTaxonomy()
+        self.skill_taxonomy = get_skill_taxonomy()
+        # Scan each document once and attribute skill hits to sections by offset,
+        # instead of rescanning every section (the normalized full text is still scanned once)
+        self.single_pass_skills = single_pass_skills
     
     def extract_resume_skills(self, text: str, sections: Dict[str, str]) -> List[str]:
         """Extract all skills from resume text and sections"""
@@ -73,8 +147,10 @@ class FeatureExtractor:
         print("Normalized text length: ", len(normalized_text))
         
         # If sections not provided, try to extract them from the ORIGINAL text
+        section_spans = None
         if not sections:
-            sections = self._extract_resume_sections(resume_text)  # Use original text with capitalization
+            section_spans = self._find_section_spans(resume_text, SECTION_REGEXES['resume'])  # Use original text with capitalization
+            sections = self._sections_from_spans(resume_text, section_spans)
         
         print("Sections found: ", list(sections.keys()))
         
@@ -85,22 +161,36 @@ class FeatureExtractor:
             print(f"Experience years calculated from 'experience' section: {work_experience_years}")
         else:
             # Fallback: Try to find the substring between "WORK EXPERIENCE" and "PROJECTS" or end of text
-            work_exp_match = re.search(r'WORK\s+EXPERIENCE(.*?)(?:PROJECTS|TECHNICAL\s+SKILLS|$)', resume_text, re.DOTALL | re.IGNORECASE)
+            work_exp_match = WORK_EXPERIENCE_FALLBACK_REGEX.search(resume_text)
             if work_exp_match:
                 experience_text = work_exp_match.group(1).strip()
                 work_experience_years = self._calculate_experience_years_from_resume(experience_text)
                 print(f"Experience years calculated from extracted 'WORK EXPERIENCE' section: {work_experience_years}")
                 # Add this to sections
                 sections['experience'] = experience_text
-        
-        skills = self.extract_resume_skills(normalized_text, sections)
+                if section_spans is not None:
+                    section_spans['experience'] = self._strip_span(resume_text, *work_exp_match.span(1))
+        
+        section_skills = None
+        if self._can_scan_once(resume_text, section_spans):
+            section_skills, all_skills = self.extract_skills_by_section(resume_text, section_spans, normalized_text)
+            skills = set(all_skills)
+            for section_name in ['skills', 'experience', 'projects', 'certifications', 'summary']:
+                skills.update(section_skills.get(section_name, []))
+            skills = list(skills)
+        else:
+            skills = self.extract_resume_skills(normalized_text, sections)
         word_frequencies = self._extract_word_frequencies(normalized_text)
         
-        return {
+        features = {
             "work_experience_years": work_experience_years,
             "skills": skills,
             "word_frequencies": word_frequencies
         }
+        if section_skills is not None:
+            features["section_skills"] = section_skills
+        self._add_skill_bits(features)
+        return features
     
     def extract_job_features(self, job_text: str) -> Dict[str, Any]:
         """Extract standardized features from job description"""
@@ -108,83 +198,113 @@ class FeatureExtractor:
         normalized_text = self.text_processor.normalize_text(job_text)
     
         # Extract job sections from original text
-        sections = self._extract_job_sections(job_text)  # Use original for better section detection
+        section_spans = self._find_section_spans(job_text, SECTION_REGEXES['job'])  # Use original for better section detection
+        sections = self._sections_from_spans(job_text, section_spans)
         
         # Extract features
         required_experience_years = self._extract_required_experience(normalized_text)
-        skills = self.extract_job_skills(normalized_text, sections)
+        section_skills = None
+        if self._can_scan_once(job_text, section_spans):
+            section_skills, all_skills = self.extract_skills_by_section(job_text, section_spans, normalized_text)
+            skills = set()
+            for section_name in ['requirements', 'responsibilities', 'preferred']:
+                skills.update(section_skills.get(section_name, []))
+            # If no sections found, use every skill in the text
+            if len(skills) < 3 or not sections:
+                skills.update(all_skills)
+            skills = list(skills)
+        else:
+            skills = self.extract_job_skills(normalized_text, sections)
         word_frequencies = self._extract_word_frequencies(normalized_text)
         
-        return {
+        features = {
             "required_experience_years": required_experience_years,
             "skills": skills,  # Combined required and preferred skills
             "word_frequencies": word_frequencies
         }
+        if section_skills is not None:
+            features["section_skills"] = section_skills
+        self._add_skill_bits(features)
+        return features
+    
+    def _add_skill_bits(self, features: Dict[str, Any]):
+        """Add the skills as a hex bitset over canonical taxonomy skill IDs"""
+        skill_bits = self.skill_taxonomy.skills_to_bitset(features["skills"])
+        if skill_bits is not None:
+            features["skill_bits"] = format(skill_bits, 'x')
+            features["skill_ids_version"] = self.skill_taxonomy.skill_ids_version
+    
+    def extract_job_features_batch(self, texts: List[str], workers: Optional[int] = None,
+                                   executor: Optional[ProcessPoolExecutor] = None) -> List[Dict[str, Any]]:
+        """
+        Extract features for many job descriptions across worker processes.
+        Results are returned in input order. Pass a long-lived executor from
+        create_feature_pool() to avoid paying the worker start-up cost per call;
+        otherwise a pool of `workers` processes is created for this batch.
+        Runs inline when there is no executor and workers <= 1.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        chunksize = max(1, len(texts) // ((workers or os.cpu_count() or 1) * 4))
+        if executor is not None:
+            return list(executor.map(extract_job_features_in_worker, texts, chunksize=chunksize))
+        if workers is None or workers <= 1 or len(texts) == 1:
+            return [self.extract_job_features(text) for text in texts]
+        with create_feature_pool(min(workers, len(texts)), self.single_pass_skills) as pool:
+            return list(pool.map(extract_job_features_in_worker, texts, chunksize=chunksize))
+    
+    def _can_scan_once(self, text: str, section_spans: Optional[Dict[str, Tuple[int, int]]]) -> bool:
+        """Single-pass extraction needs section offsets, and offsets that survive lowercasing"""
+        return self.single_pass_skills and section_spans is not None and len(text.lower()) == len(text)
+    
+    def extract_skills_by_section(self, text: str, section_spans: Dict[str, Tuple[int, int]],
+                                  normalized_text: Optional[str] = None) -> Tuple[Dict[str, List[str]], Set[str]]:
+        """
+        Scan text once and attribute each skill hit to the section containing it, then scan
+        normalized_text once for the full-text skills, as the section-by-section path does.
+        Returns (skills per section, all skills found in the normalized text).
+        """
+        ordered = sorted((start, end, name) for name, (start, end) in section_spans.items() if end > start)
+        starts = [start for start, _, _ in ordered]
+        by_section = {name: set() for name in section_spans}
+        
+        for hit_start, hit_end, skill in self.skill_taxonomy.find_skill_spans(text):
+            i = bisect_right(starts, hit_start) - 1
+            if i >= 0 and hit_end <= ordered[i][1]:
+                by_section[ordered[i][2]].add(skill)
+        
+        if normalized_text is None:
+            normalized_text = self.text_processor.normalize_text(text)
+        all_skills = set(self.skill_taxonomy.extract_skills(normalized_text))
+        return {name: sorted(skills) for name, skills in by_section.items()}, all_skills
     
     def _extract_resume_sections(self, text: str) -> Dict[str, str]:
         """Extract main sections from resume text"""
-        sections = {}
-        
-        # Common section headers in resumes - using uppercase since many resumes have section headers in caps
-        section_patterns = {
-            'experience': r'(?:WORK\s+EXPERIENCE|PROFESSIONAL\s+EXPERIENCE|EMPLOYMENT|WORK\s+HISTORY)',
-            'education': r'(?:EDUCATION|ACADEMIC\s+BACKGROUND|ACADEMIC\s+HISTORY)',
-            'skills': r'(?:TECHNICAL\s+SKILLS|SKILLS|CORE\s+COMPETENCIES|EXPERTISE)',
-            'projects': r'(?:PROJECTS|PERSONAL\s+PROJECTS|ACADEMIC\s+PROJECTS)',
-            'certifications': r'(?:CERTIFICATIONS|CERTIFICATES|ACCREDITATIONS)',
-            'summary': r'(?:SUMMARY|PROFILE|OBJECTIVE|ABOUT\s+ME)'
-        }
-        
-        # Find each section header in the document
-        section_positions = []
-        for section_name, pattern in section_patterns.items():
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            for match in matches:
-                section_positions.append((match.start(), section_name))
-        
-        # Sort positions to determine section boundaries
-        section_positions.sort()
-        
-        # Extract content between consecutive section headers
-        for i, (start_pos, section_name) in enumerate(section_positions):
-            # Find the end of the header line
-            header_end = text.find('\n', start_pos)
-            if header_end == -1:  # If no newline found, use the entire rest of the document
-                header_end = len(text)
-            
-            # Determine section end (start of next section or end of text)
-            section_end = len(text)
-            if i < len(section_positions) - 1:
-                section_end = section_positions[i + 1][0]
-            
-            # Extract content
-            content = text[header_end:section_end].strip()
-            sections[section_name] = content
-        
-        return sections
+        return self._sections_from_spans(text, self._find_section_spans(text, SECTION_REGEXES['resume']))
     
     def _extract_job_sections(self, text: str) -> Dict[str, str]:
         """Extract main sections from job description"""
-        sections = {}
-        
-        # Common section headers in job descriptions
-        section_patterns = {
-            'responsibilities': r'(?:Responsibilities|Duties|What\s+You\'ll\s+Do|Role\s+Description|Key\s+Responsibilities)',
-            'requirements': r'(?:Requirements|Qualifications|What\s+You\'ll\s+Need|What\s+We\'re\s+Looking\s+For)',
-            'preferred': r'(?:Preferred\s+Qualifications|Nice\s+to\s+Have|Preferred\s+Skills|Desired\s+Skills)',
-            'benefits': r'(?:Benefits|What\s+We\s+Offer|Perks|Compensation)',
-            'company': r'(?:About\s+Us|Company\s+Overview|Who\s+We\s+Are)'
-        }
-        
-        # Find each section header in the document
+        return self._sections_from_spans(text, self._find_section_spans(text, SECTION_REGEXES['job']))
+    
+    def _find_section_spans(self, text: str, section_regex: re.Pattern) -> Dict[str, Tuple[int, int]]:
+        """
+        Locate the content of each section as (start, end) offsets into text.
+        Content runs from the end of the header line to the next header; when a
+        header appears more than once, the last occurrence wins.
+        """
+        spans = {}
+        
+        # Find every section header in one scan; the named group says which section it is
         section_positions = []
-        for section_name, pattern in section_patterns.items():
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            for match in matches:
-                section_positions.append((match.start(), section_name))
-        
-        # Sort positions to determine section boundaries
-        section_positions.sort()
+        header_ends = {}
+        for match in section_regex.finditer(text):
+            section_name = match.lastgroup
+            # Headers of the same section never overlap (e.g. "SKILLS" inside "TECHNICAL SKILLS")
+            if match.start() < header_ends.get(section_name, 0):
+                continue
+            header_ends[section_name] = match.end(section_name)
+            section_positions.append((match.start(), section_name))
         
         # Extract content between consecutive section headers
         for i, (start_pos, section_name) in enumerate(section_positions):
@@ -198,11 +318,22 @@ class FeatureExtractor:
             if i < len(section_positions) - 1:
                 section_end = section_positions[i + 1][0]
             
-            # Extract content
-            content = text[header_end:section_end].strip()
-            sections[section_name] = content
+            spans[section_name] = self._strip_span(text, header_end, section_end)
         
-        return sections
+        return spans
+    
+    def _strip_span(self, text: str, start: int, end: int) -> Tuple[int, int]:
+        """Offsets of text[start:end].strip() within text"""
+        content = text[start:end]
+        stripped = content.strip()
+        if not stripped:
+            return start, start
+        start += len(content) - len(content.lstrip())
+        return start, start + len(stripped)
+    
+    def _sections_from_spans(self, text: str, section_spans: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        """Turn section offsets into section contents"""
+        return {name: text[start:end] for name, (start, end) in section_spans.items()}
     
     def _calculate_months_between(self, start_date: datetime, end_date: datetime) -> int:
         """Calculate number of months between two dates"""
@@ -228,7 +359,7 @@ class FeatureExtractor:
         """Parse a date range string into start and end dates"""
         try:
             # Split into start and end dates
-            parts = re.split(r'\s*[–\-]\s*', date_range)  # Handle both hyphen and en-dash
+            parts = DATE_RANGE_SPLIT_REGEX.split(date_range)
             
             if len(parts) != 2:
                 print(f"Invalid date range format: {date_range}")
@@ -271,13 +402,8 @@ class FeatureExtractor:
         job_entries = []
         
         # Find all "Month Year - Month Year" or "Month Year - Present" patterns
-        date_patterns = [
-            r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}\s*[–\-]\s*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}',
-            r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}\s*[–\-]\s*present'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in DATE_RANGE_REGEXES:
+            matches = pattern.finditer(text)
             for match in matches:
                 job_entries.append(match.group(0))
         
@@ -285,10 +411,7 @@ class FeatureExtractor:
         
         # If no clear date ranges found, try to find individual dates and construct ranges
         if not job_entries:
-            dates = re.findall(
-                r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}|present',
-                text, re.IGNORECASE
-            )
+            dates = DATE_OR_PRESENT_REGEX.findall(text)
             print(f"Found individual dates: {dates}")
             
             # Work experience typically lists recent experience first
@@ -296,21 +419,14 @@ class FeatureExtractor:
             # We'll look for context clues to determine if date is a start or end date
             
             # Extract positions with dates
-            position_blocks = re.findall(
-                r'([^\n]+?(?:engineer|developer|analyst|manager|intern|specialist|consultant|director)[^\n]*?)' +
-                r'([^\n]*?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}[^\n]*)', 
-                text, re.IGNORECASE
-            )
+            position_blocks = POSITION_BLOCK_REGEX.findall(text)
             
             print(f"Found position blocks: {position_blocks}")
             
             # Process position blocks to extract date ranges
             for i in range(len(position_blocks)):
                 block_text = position_blocks[i][0] + ' ' + position_blocks[i][1]
-                block_dates = re.findall(
-                    r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}|present',
-                    block_text, re.IGNORECASE
-                )
+                block_dates = DATE_OR_PRESENT_REGEX.findall(block_text)
                 
                 if len(block_dates) >= 2:
                     job_entries.append(f"{block_dates[0]} - {block_dates[1]}")
@@ -337,16 +453,8 @@ class FeatureExtractor:
     def _extract_required_experience(self, text: str) -> Optional[float]:
         """Extract required years of experience from job description"""
         # Match patterns for experience requirements
-        experience_patterns = [
-            # General experience
-            r'(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?',
-            r'experience(?:\s*of)?\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)',
-            r'(?:with|having)\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?',
-            r'(?:minimum|at\s+least)\s*(\d+)(?:\+|\s*\+)?\s*(?:years|yrs)'
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in REQUIRED_EXPERIENCE_REGEXES:
+            matches = pattern.finditer(text)
             experience_values = []
             
             for match in matches:
@@ -380,17 +488,8 @@ class FeatureExtractor:
                     return experience_values[len(experience_values)//2]
         
         # Check for entry-level indicators if no specific experience mentioned
-        entry_level_patterns = [
-            r'entry[- ]level',
-            r'junior',
-            r'no experience required',
-            r'0-1 years',
-            r'recent graduate'
-        ]
-        
-        for pattern in entry_level_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return 0.0
+        if ENTRY_LEVEL_REGEX.search(text):
+            return 0.0
         
         # Default to None if no experience requirements found
         return None
@@ -406,6 +505,36 @@ class FeatureExtractor:
         # Return top 100 most frequent words
         return dict(word_counts.most_common(100))
 
+# Per-process extractor used by pool workers, built once by _init_feature_worker
+_worker_extractor: Optional[FeatureExtractor] = None
+
+# How feature worker processes are started. The API process runs thread pools and an event loop,
+# and a forked child inherits whatever locks those threads held at fork time, so workers are
+# started fresh (forkserver where the platform has it, spawn otherwise) instead of forked
+FEATURE_POOL_START_METHOD = os.getenv(
+    'FEATURE_POOL_START_METHOD',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+def _init_feature_worker(single_pass_skills: bool = False):
+    """Process pool initializer: load NLTK data and the skill taxonomy once per worker"""
+    global _worker_extractor
+    _worker_extractor = FeatureExtractor(single_pass_skills=single_pass_skills)
+
+def extract_job_features_in_worker(job_text: str) -> Dict[str, Any]:
+    if _worker_extractor is None:
+        _init_feature_worker()
+    return _worker_extractor.extract_job_features(job_text)
+
+def create_feature_pool(workers: Optional[int] = None, single_pass_skills: bool = False) -> ProcessPoolExecutor:
+    """Create a process pool whose workers each hold a ready FeatureExtractor"""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context(FEATURE_POOL_START_METHOD),
+        initializer=_init_feature_worker,
+        initargs=(single_pass_skills,)
+    )
+
 # Example usage
 if __name__ == "__main__":
     # Create feature extractor
@@ -0,0 +1,53 @@
+import json
+import logging
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Preloaded token -> lemma table shipped next to skills_taxonomy.json
+DEFAULT_LEMMA_TABLE_PATH = Path(__file__).parent / 'data' / 'lemmas.json'
+
+def load_lemma_table(path: Optional[Path] = None) -> Dict[str, str]:
+    """Load the lemma table, or return an empty table when none has been built"""
+    path = Path(path or DEFAULT_LEMMA_TABLE_PATH)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading lemma table {path}: {str(e)}")
+        return {}
+
+def build_lemma_table(texts: Iterable[str], path: Optional[Path] = None, min_count: int = 2) -> Dict[str, str]:
+    """
+    Lemmatize every token seen at least min_count times in texts and write the
+    table as JSON. Tokens missing from the table fall back to WordNet at runtime.
+    """
+    from backend.utils.text_processor import TextProcessor
+
+    processor = TextProcessor(lemma_cache_size=0, lemma_table={})
+    counts = Counter()
+    for text in texts:
+        counts.update(processor.preprocess(text, lemmatize=False))
+
+    table = {
+        token: processor.lemmatizer.lemmatize(token)
+        for token, count in counts.items()
+        if count >= min_count
+    }
+
+    path = Path(path or DEFAULT_LEMMA_TABLE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(table.items())), f, indent=0)
+    return table
+
+# python -m backend.utils.lemma_table descriptions1.txt descriptions2.txt ...
+if __name__ == "__main__":
+    texts = [Path(file_path).read_text() for file_path in sys.argv[1:]]
+    table = build_lemma_table(texts)
+    print(f"Wrote {len(table)} lemmas to {DEFAULT_LEMMA_TABLE_PATH}")
@@ -0,0 +1,81 @@
+import math
+from typing import Any, Dict, Optional
+from backend.utils.skills_taxonomy import SkillTaxonomy, get_skill_taxonomy
+
+# Bump when the profile layout or its derivation from resume features changes
+RESUME_PROFILE_VERSION = 1
+
+def resume_profile_version(taxonomy: Optional[SkillTaxonomy] = None) -> str:
+    """Profiles are only reusable with the same layout and the same skill ID assignment"""
+    taxonomy = taxonomy or get_skill_taxonomy()
+    return f"{RESUME_PROFILE_VERSION}:{taxonomy.skill_ids_version}"
+
+class ResumeProfile:
+    """
+    Resume-side inputs of matching, derived once from the resume features.
+
+    - skills: lowercase skill set (used when a skill has no taxonomy ID)
+    - skill_bits: bitset over canonical taxonomy skill IDs, or None
+    - experience_years: parsed work experience (NaN when unparseable)
+    - keywords: word frequencies scaled to a unit vector
+    """
+
+    def __init__(self, resume_id: str, skills, skill_bits: Optional[int], experience_years: float,
+                 keywords: Dict[str, float], keyword_norm: float, version: str):
+        self.resume_id = resume_id
+        self.skills = frozenset(skills)
+        self.skill_bits = skill_bits
+        self.experience_years = experience_years
+        self.keywords = keywords
+        self.keyword_norm = keyword_norm
+        self.version = version
+
+    @classmethod
+    def from_features(cls, resume_id: str, features: Dict, taxonomy: Optional[SkillTaxonomy] = None) -> "ResumeProfile":
+        """Build the profile from a resume's features dict"""
+        taxonomy = taxonomy or get_skill_taxonomy()
+        features = features or {}
+        skills = set(s.lower() for s in features.get("skills", []) or [])
+
+        try:
+            experience_years = float(features.get("work_experience_years", 0) or 0)
+        except (TypeError, ValueError):
+            experience_years = math.nan
+
+        words = features.get("word_frequencies", {}) or {}
+        keyword_norm = math.sqrt(sum(float(count) ** 2 for count in words.values()))
+        keywords = {word: float(count) / keyword_norm for word, count in words.items()} if keyword_norm else {}
+
+        return cls(
+            resume_id=resume_id,
+            skills=skills,
+            skill_bits=taxonomy.bitset_from_features(features),
+            experience_years=experience_years,
+            keywords=keywords,
+            keyword_norm=keyword_norm,
+            version=resume_profile_version(taxonomy)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for the Redis cache"""
+        return {
+            "resume_id": self.resume_id,
+            "skills": sorted(self.skills),
+            "skill_bits": None if self.skill_bits is None else format(self.skill_bits, 'x'),
+            "experience_years": None if math.isnan(self.experience_years) else self.experience_years,
+            "keywords": self.keywords,
+            "keyword_norm": self.keyword_norm,
+            "version": self.version
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeProfile":
+        return cls(
+            resume_id=data["resume_id"],
+            skills=data["skills"],
+            skill_bits=None if data["skill_bits"] is None else int(data["skill_bits"], 16),
+            experience_years=math.nan if data["experience_years"] is None else data["experience_years"],
+            keywords=data["keywords"],
+            keyword_norm=data["keyword_norm"],
+            version=data["version"]
+        )
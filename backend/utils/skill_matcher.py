@@ -0,0 +1,87 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the regex \\w class"""
+    return ch.isalnum() or ch == '_'
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over all skill names and aliases.
+
+    Finds every pattern occurrence in a single pass over the text, instead of one
+    regex search per skill. A hit only counts when both of its ends sit on a word
+    boundary, with the same semantics as wrapping the pattern in \\b...\\b.
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """patterns maps each lowercase pattern (skill or alias) to its canonical skill name"""
+        self.patterns: List[str] = []
+        self.canonical: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern, canonical in patterns.items():
+            if not pattern:
+                continue
+            self._add_pattern(pattern, canonical)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str, canonical: str):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+        self.canonical.append(canonical)
+
+    def _build_failure_links(self):
+        """Breadth-first pass that sets failure links and merges outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Return (start, end, canonical_skill) for every word-bounded skill occurrence.
+        Matching is case-sensitive; callers pass lowercased text.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        patterns = self.patterns
+        hits = []
+        state = 0
+        length = len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            end = i + 1
+            after_is_word = end < length and _is_word_char(text[end])
+            for pattern_index in output[state]:
+                start = end - len(patterns[pattern_index])
+                # \b at both ends: the characters on either side of each edge differ in "wordness"
+                before_is_word = start > 0 and _is_word_char(text[start - 1])
+                if (before_is_word == _is_word_char(text[start])) or (after_is_word == _is_word_char(text[i])):
+                    continue
+                hits.append((start, end, self.canonical[pattern_index]))
+        return hits
@@ -1,72 +1,230 @@
+import hashlib
 import json
-import re
+import logging
+import os
+import pickle
+import threading
+import uuid
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional
+from dotenv import load_dotenv
+from backend.core.config import settings, PROJECT_ROOT
+from backend.utils.skill_matcher import SkillMatcher
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Resolved relative to this file so the taxonomy loads from any working directory
+TAXONOMY_PATH = Path(__file__).parent / 'data' / 'skills_taxonomy.json'
+# Precompiled taxonomy, rebuilt whenever the JSON content (or the compiled format) changes.
+# Written to the data directory (relative paths are anchored at the project root), not next to the source.
+TAXONOMY_ARTIFACT_PATH = Path(settings.SKILL_TAXONOMY_ARTIFACT_PATH)
+if not TAXONOMY_ARTIFACT_PATH.is_absolute():
+    TAXONOMY_ARTIFACT_PATH = PROJECT_ROOT / TAXONOMY_ARTIFACT_PATH
+# Bump when the compiled form changes so stale artifacts are rebuilt
+TAXONOMY_ARTIFACT_VERSION = 2
+
+_MAPPING_ATTRIBUTES = ('taxonomy', 'skills_to_category', 'skill_aliases', 'skill_ids')
 
 class SkillTaxonomy:
-    def __init__(self):
+    """
+    Compiled skills taxonomy: canonical skill IDs, alias map and matcher automaton.
+    Treat instances as read-only and share them through get_skill_taxonomy().
+    """
+
+    def __init__(self, taxonomy_path: Optional[Path] = None):
         # Load skills taxonomy
-        taxonomy_path = Path('backend/utils/data/skills_taxonomy.json')
-        with open(taxonomy_path, 'r') as f:
-            self.taxonomy = json.load(f)
-            
+        raw = Path(taxonomy_path or TAXONOMY_PATH).read_bytes()
+        self.content_hash = taxonomy_content_hash(raw)
+        taxonomy = json.loads(raw)
+
         # Create a flattened skills list with aliases
-        self.skills_list = [] # List of all skill names
-        self.skills_to_category = {} # Maps skill name to (category, subcategory)
-        self.skill_aliases = {} # Maps alias to skill name
-        
-        for category, subcategories in self.taxonomy.items():
+        skills_list = [] # List of all skill names
+        skills_to_category = {} # Maps skill name to (category, subcategory)
+        skill_aliases = {} # Maps alias to skill name
+        skill_ids = {} # Maps canonical skill name to its ID (taxonomy file order)
+
+        for category, subcategories in taxonomy.items():
             for subcategory, skills in subcategories.items():
                 for skill in skills:
                     # Each skill can be a dict with name and aliases
                     if isinstance(skill, dict):
                         skill_name = skill['name']
                         aliases = skill.get('aliases', [])
-                        
-                        self.skills_list.append(skill_name.lower())
-                        self.skills_to_category[skill_name.lower()] = (category, subcategory)
-                        
+
+                        skills_list.append(skill_name.lower())
+                        skills_to_category[skill_name.lower()] = (category, subcategory)
+                        skill_ids.setdefault(skill_name.lower(), len(skill_ids))
+
                         for alias in aliases:
-                            self.skills_list.append(alias.lower())
-                            self.skills_to_category[alias.lower()] = (category, subcategory)
-                            self.skill_aliases[alias.lower()] = skill_name.lower()
+                            skills_list.append(alias.lower())
+                            skills_to_category[alias.lower()] = (category, subcategory)
+                            skill_aliases[alias.lower()] = skill_name.lower()
                     else:
-                        self.skills_list.append(skill.lower())
-                        self.skills_to_category[skill.lower()] = (category, subcategory)
-        
+                        skills_list.append(skill.lower())
+                        skills_to_category[skill.lower()] = (category, subcategory)
+                        skill_ids.setdefault(skill.lower(), len(skill_ids))
+
         # Sort by length (longest first) to prioritize longer skill names
-        self.skills_list = sorted(self.skills_list, key=len, reverse=True)
-    
+        self.skills_list = tuple(sorted(skills_list, key=len, reverse=True))
+        self.canonical_skills = tuple(skill_ids) # ID -> canonical skill name
+        # Identifies the ID assignment; skill bitsets are only comparable within one version
+        self.skill_ids_version = hashlib.sha256('\n'.join(self.canonical_skills).encode()).hexdigest()[:16]
+        self.taxonomy = MappingProxyType(taxonomy)
+        self.skills_to_category = MappingProxyType(skills_to_category)
+        self.skill_aliases = MappingProxyType(skill_aliases)
+        self.skill_ids = MappingProxyType(skill_ids)
+
+        # Single automaton over every skill and alias, resolving aliases to the primary skill name
+        self.matcher = SkillMatcher({
+            skill: skill_aliases.get(skill, skill) for skill in self.skills_list
+        })
+
+    def __getstate__(self):
+        # Mapping proxies cannot be pickled; store the underlying dicts
+        state = dict(self.__dict__)
+        for name in _MAPPING_ATTRIBUTES:
+            state[name] = dict(state[name])
+        return state
+
+    def __setstate__(self, state):
+        for name in _MAPPING_ATTRIBUTES:
+            state[name] = MappingProxyType(state[name])
+        self.__dict__.update(state)
+
+    def find_skill_spans(self, text):
+        """
+        Find every skill occurrence in text in a single pass.
+        Returns (start, end, canonical_skill) tuples with offsets into text.lower(),
+        which line up with text except for the few Unicode characters whose lowercase is longer.
+        """
+        return self.matcher.find_all(text.lower())
+
     def extract_skills(self, text):
         """Extract skills from text using the taxonomy"""
-        text = text.lower()
-        found_skills = set()
-        
-        # Look for exact matches
-        for skill in self.skills_list:
-            # Use word boundary for exact matching
-            if re.search(r'\b' + re.escape(skill) + r'\b', text):
-                # If it's an alias, use the primary skill name
-                canonical_skill = self.skill_aliases.get(skill, skill)
-                found_skills.add(canonical_skill)
-        
+        # If it's an alias, the matcher reports the primary skill name
+        found_skills = set(skill for _, _, skill in self.find_skill_spans(text))
+
         return list(found_skills)
-    
+
+    def canonical_skill(self, skill):
+        """Primary skill name for a skill or alias"""
+        skill = skill.lower()
+        return self.skill_aliases.get(skill, skill)
+
+    def skills_to_bitset(self, skills: Iterable[str]) -> Optional[int]:
+        """
+        Bitset with bit i set for canonical skill ID i, or None when a skill is not a
+        canonical taxonomy skill (aliases and unknown skills have no ID of their own)
+        """
+        bits = 0
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill.lower())
+            if skill_id is None:
+                return None
+            bits |= 1 << skill_id
+        return bits
+
+    def bitset_to_skills(self, bits: int) -> List[str]:
+        """Canonical skill names of the set bits, in ID order"""
+        skills = []
+        while bits:
+            lowest = bits & -bits
+            skills.append(self.canonical_skills[lowest.bit_length() - 1])
+            bits ^= lowest
+        return skills
+
+    def bitset_from_features(self, features: Dict) -> Optional[int]:
+        """
+        Skill bitset of a resume or job feature dict: the stored hex skill_bits when they
+        were built with this taxonomy, otherwise computed from the skills list
+        """
+        if features.get("skill_bits") is not None and features.get("skill_ids_version") == self.skill_ids_version:
+            return int(features["skill_bits"], 16)
+        return self.skills_to_bitset(features.get("skills", []) or [])
+
     def get_skill_vector(self, skills):
-        """Create a binary vector of all skills in the taxonomy"""
+        """Create a binary vector of all skills in the taxonomy, indexed by canonical skill ID"""
         # Create a set of unique, canonical skill names
-        canonical_skills = set()
-        for skill in skills:
-            canonical_skill = self.skill_aliases.get(skill.lower(), skill.lower())
-            canonical_skills.add(canonical_skill)
-        
+        canonical_skills = set(self.canonical_skill(skill) for skill in skills)
+
         # Create binary vector using only primary skill names (not aliases)
-        primary_skills = set(s for s in self.skills_list if s not in self.skill_aliases)
-        vector = [1 if skill in canonical_skills else 0 for skill in primary_skills]
+        vector = [1 if skill in canonical_skills else 0 for skill in self.canonical_skills]
         return vector
 
+
+def taxonomy_content_hash(raw: bytes) -> str:
+    """Hash identifying a taxonomy JSON document together with the compiled format version"""
+    return hashlib.sha256(raw + f"\nversion={TAXONOMY_ARTIFACT_VERSION}".encode()).hexdigest()
+
+def save_compiled_taxonomy(taxonomy: SkillTaxonomy, artifact_path: Path = TAXONOMY_ARTIFACT_PATH) -> bool:
+    """Pickle the compiled taxonomy (atomically replacing any previous artifact)"""
+    artifact_path = Path(artifact_path)
+    # Unique per writer, so processes compiling the taxonomy at the same time never share a temp file
+    tmp_path = artifact_path.with_name(f"{artifact_path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        artifact_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving compiled skill taxonomy: {str(e)}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
+
+def load_compiled_taxonomy(content_hash: str, artifact_path: Path = TAXONOMY_ARTIFACT_PATH) -> Optional[SkillTaxonomy]:
+    """Load the compiled taxonomy if the artifact exists and was built from the same content"""
+    artifact_path = Path(artifact_path)
+    if not artifact_path.exists():
+        return None
+    try:
+        with open(artifact_path, 'rb') as f:
+            taxonomy = pickle.load(f)
+        if getattr(taxonomy, 'content_hash', None) != content_hash:
+            return None
+        return taxonomy
+    except Exception as e:
+        logger.error(f"Error loading compiled skill taxonomy: {str(e)}")
+        return None
+
+def custom_artifact_path(taxonomy_path: Path) -> Path:
+    """Artifact for a taxonomy file other than the bundled one, kept beside the default artifact"""
+    path_hash = hashlib.sha256(str(taxonomy_path).encode()).hexdigest()[:12]
+    return TAXONOMY_ARTIFACT_PATH.with_name(f"{taxonomy_path.stem}.{path_hash}.pkl")
+
+
+_taxonomies: Dict[Path, SkillTaxonomy] = {}
+_taxonomies_lock = threading.Lock()
+
+def get_skill_taxonomy(taxonomy_path: Optional[Path] = None, artifact_path: Optional[Path] = None) -> SkillTaxonomy:
+    """
+    Process-wide SkillTaxonomy, loaded once per taxonomy file.
+    Uses the precompiled artifact when it matches the JSON content hash and
+    writes a fresh one otherwise. Forked workers inherit the loaded copy.
+    """
+    taxonomy_path = Path(taxonomy_path or TAXONOMY_PATH).resolve()
+    taxonomy = _taxonomies.get(taxonomy_path)
+    if taxonomy is not None:
+        return taxonomy
+    with _taxonomies_lock:
+        taxonomy = _taxonomies.get(taxonomy_path)
+        if taxonomy is None:
+            if artifact_path is None:
+                artifact_path = TAXONOMY_ARTIFACT_PATH if taxonomy_path == TAXONOMY_PATH.resolve() else custom_artifact_path(taxonomy_path)
+            content_hash = taxonomy_content_hash(taxonomy_path.read_bytes())
+            taxonomy = load_compiled_taxonomy(content_hash, artifact_path)
+            if taxonomy is None:
+                taxonomy = SkillTaxonomy(taxonomy_path)
+                save_compiled_taxonomy(taxonomy, artifact_path)
+            _taxonomies[taxonomy_path] = taxonomy
+        return taxonomy
+
 # Example usage
 if __name__ == "__main__":
-    taxonomy = SkillTaxonomy()
+    taxonomy = get_skill_taxonomy()
     text = "I have 5 years of experience with Python and Django. I also have experience with AWS and Docker."
     skills = taxonomy.extract_skills(text)
-    print(taxonomy.skill_aliases)
\ No newline at end of file
+    print(taxonomy.skill_aliases)
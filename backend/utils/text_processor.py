@@ -2,34 +2,87 @@ import re
 import string
 import nltk
 import os
+import threading
+from functools import lru_cache
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer, WordNetLemmatizer
 from nltk.tokenize import word_tokenize
+from backend.utils.lemma_table import load_lemma_table
 
-# Download all required NLTK data
-try:
-    # Create NLTK data directory if it doesn't exist
-    nltk_data_dir = os.path.expanduser('~/nltk_data')
-    if not os.path.exists(nltk_data_dir):
-        os.makedirs(nltk_data_dir)
-    
-    # Download required data
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-except Exception as e:
-    print(f"Error downloading NLTK data: {e}")
-    print("Please run this command in your terminal:")
-    print("python -m nltk.downloader punkt stopwords wordnet punkt_tab averaged_perceptron_tagger")
+# NLTK resources used by TextProcessor, as (nltk.data path, downloader package)
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+    ('tokenizers/punkt_tab', 'punkt_tab'),
+    ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger')
+]
+_nltk_data_checked = False
+_nltk_data_lock = threading.Lock()
+
+def ensure_nltk_data():
+    """
+    Make sure the NLTK data is installed, downloading only what is missing.
+    Runs once per process, on first TextProcessor construction, instead of
+    hitting the downloader for every package at import time.
+    """
+    global _nltk_data_checked
+    if _nltk_data_checked:
+        return
+    with _nltk_data_lock:
+        if _nltk_data_checked:
+            return
+        missing = []
+        for resource, package in NLTK_RESOURCES:
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                missing.append(package)
+        try:
+            if missing:
+                # Create NLTK data directory if it doesn't exist
+                nltk_data_dir = os.path.expanduser('~/nltk_data')
+                if not os.path.exists(nltk_data_dir):
+                    os.makedirs(nltk_data_dir)
+                for package in missing:
+                    nltk.download(package, quiet=True)
+        except Exception as e:
+            print(f"Error downloading NLTK data: {e}")
+            print("Please run this command in your terminal:")
+            print("python -m nltk.downloader punkt stopwords wordnet punkt_tab averaged_perceptron_tagger")
+        _nltk_data_checked = True
+
+# Precompiled patterns, built once at import instead of on every call
+URL_REGEX = re.compile(r'http\S+')
+NON_WORD_REGEX = re.compile(r'[^\w\s]')
+WHITESPACE_REGEX = re.compile(r'\s+')
+SENTENCE_SPLIT_REGEX = re.compile(r'[.!?]+')
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+TOKEN_SPLIT_REGEX = re.compile(r'\s+')
+
+TOKENIZERS = ('nltk', 'fast')
+# 'nltk' runs word_tokenize (Punkt/Treebank); 'fast' splits the punctuation-free text on whitespace
+TEXT_TOKENIZER = os.getenv('TEXT_TOKENIZER', 'nltk')
+
+# Max number of distinct tokens whose lemma is memoized per TextProcessor
+LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', 50000))
 
 class TextProcessor:
-    def __init__(self):
+    def __init__(self, lemma_cache_size: int = LEMMA_CACHE_SIZE, lemma_table=None, tokenizer: str = TEXT_TOKENIZER):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer: {tokenizer} (expected one of {', '.join(TOKENIZERS)})")
+        self.tokenizer = tokenizer
+        ensure_nltk_data()
         self.stemmer = PorterStemmer() # Cuts words down to their root form: "running" -> "run"
         self.lemmatizer = WordNetLemmatizer() # Convert words to their dictionary form: "better" -> "good"
         self.stop_words = set(stopwords.words('english')) # Common words to ignore: "the", "is", "and"
         
+        # Lemmas are looked up in the preloaded table first, then in a bounded LRU
+        # cache in front of WordNet, since documents reuse a small vocabulary
+        self.lemma_table = load_lemma_table() if lemma_table is None else lemma_table
+        self.lemma_table_hits = 0
+        self._lemmatize_cached = lru_cache(maxsize=lemma_cache_size)(self.lemmatizer.lemmatize)
+        
         # # Add domain-specific stopwords
         # with open('data/stopwords.txt', 'r') as f:
         #     custom_stopwords = [line.strip() for line in f]
@@ -44,29 +97,55 @@ class TextProcessor:
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http\S+', '', text)
+        text = URL_REGEX.sub('', text)
         
         # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.translate(PUNCTUATION_TABLE)
         
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self.tokenize(text)
         
         # Remove stopwords
         tokens = [word for word in tokens if word not in self.stop_words]
         
         # Lemmatize or stem
         if lemmatize:
-            tokens = [self.lemmatizer.lemmatize(word) for word in tokens]
+            tokens = [self.lemmatize(word) for word in tokens]
         elif stem:
             tokens = [self.stemmer.stem(word) for word in tokens]
             
         return tokens
     
+    def tokenize(self, text):
+        """Split text into tokens with the configured tokenizer backend"""
+        if self.tokenizer == 'fast':
+            return [token for token in TOKEN_SPLIT_REGEX.split(text) if token]
+        return word_tokenize(text)
+    
+    def lemmatize(self, word):
+        """Lemmatize a token via the lemma table, then the LRU cache, then WordNet"""
+        lemma = self.lemma_table.get(word)
+        if lemma is not None:
+            self.lemma_table_hits += 1
+            return lemma
+        return self._lemmatize_cached(word)
+    
+    def lemma_cache_info(self):
+        """Hit/miss counters for the lemma table and the LRU cache (misses are WordNet lookups)"""
+        info = self._lemmatize_cached.cache_info()
+        return {
+            "table_size": len(self.lemma_table),
+            "table_hits": self.lemma_table_hits,
+            "cache_hits": info.hits,
+            "cache_misses": info.misses,
+            "cache_size": info.currsize,
+            "cache_maxsize": info.maxsize
+        }
+    
     def extract_sentences(self, text):
         """Split text into sentences"""
         # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
+        sentences = SENTENCE_SPLIT_REGEX.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
     def normalize_text(self, text):
@@ -78,13 +157,13 @@ class TextProcessor:
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http\S+', '', text)
+        text = URL_REGEX.sub('', text)
         
         # Replace punctuation with space
-        text = re.sub(r'[^\w\s]', ' ', text)
+        text = NON_WORD_REGEX.sub(' ', text)
         
         # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_REGEX.sub(' ', text).strip()
         
         return text
 
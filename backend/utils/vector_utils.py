@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine
 
 def cosine_similarity(vec1, vec2):
@@ -32,4 +33,67 @@ def jaccard_similarity(set1, set2):
 
 def normalize_score(score, min_val=0, max_val=1):
     """Normalize score to 0-100 range"""
-    return max(0, min(100, (score - min_val) / (max_val - min_val) * 100))
\ No newline at end of file
+    return max(0, min(100, (score - min_val) / (max_val - min_val) * 100))
+
+def build_vocabulary(term_collections):
+    """Build a shared term -> column index mapping over several dicts/sets of terms"""
+    vocabulary = {}
+    for terms in term_collections:
+        for term in terms:
+            if term not in vocabulary:
+                vocabulary[term] = len(vocabulary)
+    return vocabulary
+
+def to_sparse_matrix(term_collections, vocabulary, binary=False):
+    """Stack frequency dicts (or sets of terms) into a CSR matrix over a shared vocabulary"""
+    indptr = [0]
+    indices = []
+    data = []
+    for terms in term_collections:
+        items = terms.items() if isinstance(terms, dict) else ((term, 1) for term in terms)
+        for term, count in items:
+            column = vocabulary.get(term)
+            if column is not None:
+                indices.append(column)
+                data.append(1.0 if binary else float(count))
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+
+def batch_cosine_similarity(query, matrix, query_norm=None):
+    """
+    Cosine similarity between a 1xV sparse query row and every row of an NxV sparse matrix.
+    Pass query_norm when the query has terms outside the matrix vocabulary.
+    """
+    if matrix.shape[0] == 0:
+        return np.zeros(0)
+    if query_norm is None:
+        query_norm = np.sqrt(query.multiply(query).sum())
+    row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    if query_norm == 0:
+        return np.zeros(matrix.shape[0])
+    dots = np.asarray(matrix.dot(query.T).todense()).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarity = np.where(row_norms > 0, dots / (row_norms * query_norm), 0.0)
+    return np.clip(similarity, 0.0, 1.0)
+
+def batch_overlap_ratio(query, matrix):
+    """Share of each binary matrix row's terms that are also present in the binary query row"""
+    if matrix.shape[0] == 0:
+        return np.zeros(0)
+    row_counts = np.asarray(matrix.sum(axis=1)).ravel()
+    overlap = np.asarray(matrix.dot(query.T).todense()).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(row_counts > 0, overlap / row_counts, 0.0)
+
+
+# Number of set bits for every possible byte value
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def packed_popcount(packed_bits):
+    """Count set bits per row of a uint8 matrix produced by np.packbits(..., axis=1)"""
+    if packed_bits.shape[1] == 0:
+        return np.zeros(packed_bits.shape[0], dtype=np.int64)
+    return _BYTE_POPCOUNT[packed_bits].sum(axis=1, dtype=np.int64)
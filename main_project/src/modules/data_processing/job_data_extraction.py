@@ -1,10 +1,17 @@
 import re
-import spacy
 import time
 import os
 
-# Load NLP model
-nlp = spacy.load("en_core_web_sm")
+# NLP model, loaded on first use instead of at import
+_nlp = None
+
+def get_nlp():
+    """Return the spaCy model, importing spaCy and loading the model on first call"""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 ### Constants
 SECTIONS = {
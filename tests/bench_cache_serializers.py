@@ -0,0 +1,67 @@
+"""
+Benchmark the Redis cache serializers on a job payload built from the sample job description.
+
+Reports bytes stored per job and encode/decode time for plain JSON (the legacy
+format) and every installed serializer.
+
+    python -m tests.bench_cache_serializers [--repeat 2000]
+"""
+import argparse
+import json
+import re
+import timeit
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from backend.utils.cache_serializers import SERIALIZERS, decode
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "main_project" / "src" / "scripts"
+
+def make_job_payload():
+    description = (SCRIPTS_DIR / "test.txt").read_text()
+    words = Counter(re.findall(r"[a-z]{3,}", description.lower()))
+    return {
+        "job_id": "3921234567",
+        "title": "Software Engineer",
+        "company": "Example Corp",
+        "location": "United States",
+        "workplace_type": "Remote",
+        "listed_time": "2024-01-02 10:00",
+        "apply_url": "https://example.com/apply/3921234567",
+        "description": description,
+        "features": {
+            "required_experience_years": 3,
+            "skills": ["python", "aws", "docker", "kubernetes", "sql", "react"],
+            "word_frequencies": dict(words.most_common(100)),
+            "skill_bits": "1f3a",
+        },
+        "processed_date": datetime(2024, 1, 2, 10, 0).isoformat(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    job = make_job_payload()
+    legacy = json.dumps(job).encode('utf-8')
+    rows = [("legacy json", len(legacy),
+             timeit.timeit(lambda: json.dumps(job).encode('utf-8'), number=args.repeat),
+             timeit.timeit(lambda: json.loads(legacy), number=args.repeat))]
+    for name, serializer in SERIALIZERS.items():
+        encoded = serializer.dumps(job)
+        assert decode(encoded) == json.loads(legacy)
+        rows.append((name, len(encoded),
+                     timeit.timeit(lambda: serializer.dumps(job), number=args.repeat),
+                     timeit.timeit(lambda: decode(encoded), number=args.repeat)))
+
+    print(f"{'format':<14} {'bytes/job':>10} {'vs json':>8} {'encode us':>10} {'decode us':>10} {'jobs/s enc':>11} {'jobs/s dec':>11}")
+    for name, size, encode_s, decode_s in rows:
+        encode_us = encode_s / args.repeat * 1e6
+        decode_us = decode_s / args.repeat * 1e6
+        print(f"{name:<14} {size:>10d} {size / len(legacy):>7.0%} {encode_us:>10.1f} {decode_us:>10.1f} "
+              f"{1e6 / encode_us:>11.0f} {1e6 / decode_us:>11.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark for the regex-heavy parts of feature extraction.
+
+Compares the precompiled module-level patterns in backend.utils.feature_extractors
+against the previous per-call inline patterns on the sample resumes.
+
+    python -m tests.bench_feature_extraction [--repeat 200]
+"""
+import argparse
+import asyncio
+import re
+import timeit
+from pathlib import Path
+
+from backend.utils.feature_extractors import (
+    FeatureExtractor, RESUME_SECTION_PATTERNS, JOB_SECTION_PATTERNS, SECTION_REGEXES, REQUIRED_EXPERIENCE_REGEXES
+)
+from backend.utils.file_processors import extract_text_from_file
+
+SAMPLE_DIR = Path(__file__).parent / "sample_data"
+
+SAMPLE_JOB = """About Us
+We build developer tooling used by thousands of teams.
+
+Key Responsibilities
+Design and operate backend services in Python and Go.
+
+Requirements
+5+ years of experience with distributed systems, at least 3 years with AWS.
+
+Preferred Qualifications
+Experience with Kubernetes, Kafka and Redis.
+
+Benefits
+Remote friendly, learning budget.
+"""
+
+LEGACY_EXPERIENCE_PATTERNS = [
+    r'(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?',
+    r'experience(?:\s*of)?\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)',
+    r'(?:with|having)\s*(\d+)(?:\+|\s*\+)?\s*(?:-|\s*to\s*)?\s*(\d*)\s*(?:years|yrs)(?:\s*of)?(?:\s*experience)?',
+    r'(?:minimum|at\s+least)\s*(\d+)(?:\+|\s*\+)?\s*(?:years|yrs)'
+]
+
+def legacy_section_spans(extractor, text, section_patterns):
+    """Previous implementation: one finditer per section pattern, then a sort"""
+    section_positions = []
+    for section_name, pattern in section_patterns.items():
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            section_positions.append((match.start(), section_name))
+    section_positions.sort()
+
+    spans = {}
+    for i, (start_pos, section_name) in enumerate(section_positions):
+        header_end = text.find('\n', start_pos)
+        if header_end == -1:
+            header_end = len(text)
+        section_end = section_positions[i + 1][0] if i < len(section_positions) - 1 else len(text)
+        spans[section_name] = extractor._strip_span(text, header_end, section_end)
+    return spans
+
+def legacy_experience_matches(text):
+    return [match.groups() for pattern in LEGACY_EXPERIENCE_PATTERNS
+            for match in re.finditer(pattern, text, re.IGNORECASE)]
+
+def compiled_experience_matches(text):
+    return [match.groups() for pattern in REQUIRED_EXPERIENCE_REGEXES for match in pattern.finditer(text)]
+
+def load_samples():
+    samples = []
+    for path in sorted(SAMPLE_DIR.iterdir()):
+        file_type = path.suffix.lstrip('.')
+        if file_type not in ('pdf', 'docx'):
+            continue
+        samples.append((path.name, asyncio.run(extract_text_from_file(str(path), file_type))))
+    return samples
+
+def bench(label, legacy, compiled, repeat):
+    legacy_time = timeit.timeit(legacy, number=repeat) / repeat * 1000
+    compiled_time = timeit.timeit(compiled, number=repeat) / repeat * 1000
+    print(f"{label:<40} legacy {legacy_time:8.3f} ms   compiled {compiled_time:8.3f} ms   x{legacy_time / max(compiled_time, 1e-9):.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    # The regex paths below do not touch the NLP models, so skip loading them
+    extractor = FeatureExtractor.__new__(FeatureExtractor)
+
+    texts = [(name, text) for name, text in load_samples()] + [("job", SAMPLE_JOB)]
+    for name, text in texts:
+        patterns, regex = (JOB_SECTION_PATTERNS, SECTION_REGEXES['job']) if name == "job" else (RESUME_SECTION_PATTERNS, SECTION_REGEXES['resume'])
+        assert legacy_section_spans(extractor, text, patterns) == extractor._find_section_spans(text, regex)
+        assert legacy_experience_matches(text) == compiled_experience_matches(text)
+        bench(f"{name}: sections", lambda: legacy_section_spans(extractor, text, patterns),
+              lambda: extractor._find_section_spans(text, regex), args.repeat)
+        bench(f"{name}: experience patterns", lambda: legacy_experience_matches(text),
+              lambda: compiled_experience_matches(text), args.repeat)
+
+if __name__ == '__main__':
+    main()
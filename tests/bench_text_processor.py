@@ -0,0 +1,45 @@
+"""
+Benchmark the TextProcessor tokenizer backends on the job descriptions in the repo.
+
+Times preprocess() and feature word-frequency extraction with the 'nltk' and
+'fast' tokenizers and reports how many tokens differ between the two.
+
+    python -m tests.bench_text_processor [--repeat 200]
+"""
+import argparse
+import ast
+import timeit
+from collections import Counter
+from pathlib import Path
+
+from backend.utils.text_processor import TextProcessor
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "main_project" / "src" / "scripts"
+
+def load_job_descriptions():
+    descriptions = [("test.txt", (SCRIPTS_DIR / "test.txt").read_text())]
+    # test.json holds a Python dict literal with one job split into sections
+    sections = ast.literal_eval((SCRIPTS_DIR / "test.json").read_text())
+    descriptions.append(("test.json", "\n\n".join(str(value) for value in sections.values())))
+    return descriptions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    processors = {name: TextProcessor(tokenizer=name) for name in ('nltk', 'fast')}
+    for name, text in load_job_descriptions():
+        timings = {}
+        for tokenizer, processor in processors.items():
+            processor.preprocess(text)  # warm the lemma cache so only tokenization differs
+            timings[tokenizer] = timeit.timeit(lambda: processor.preprocess(text), number=args.repeat) / args.repeat * 1000
+
+        nltk_counts = Counter(processors['nltk'].preprocess(text))
+        fast_counts = Counter(processors['fast'].preprocess(text))
+        differing = sum(((nltk_counts - fast_counts) + (fast_counts - nltk_counts)).values())
+        print(f"{name:<12} {len(text):6d} chars   nltk {timings['nltk']:7.3f} ms   fast {timings['fast']:7.3f} ms   "
+              f"x{timings['nltk'] / max(timings['fast'], 1e-9):.1f}   differing tokens {differing}/{sum(nltk_counts.values())}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+import os
+import tempfile
+import nltk
+import pytest
+
+# Keep log lines from test runs out of the tracked app.log
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.gettempdir(), "job_search_match_tests.log"))
+
+def nltk_data_available():
+    try:
+        for resource in ('corpora/stopwords', 'corpora/wordnet', 'tokenizers/punkt'):
+            nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+# For tests that build a TextProcessor or FeatureExtractor, which load the NLTK corpora
+requires_nltk_data = pytest.mark.skipif(not nltk_data_available(), reason="NLTK data is not installed")
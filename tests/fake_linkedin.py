@@ -0,0 +1,35 @@
+from datetime import datetime
+
+COMPANY_KEY = 'com.linkedin.voyager.deco.jobs.web.shared.WebCompactJobPostingCompany'
+
+def job_details(title: str, company: str, description: str) -> dict:
+    """A get_job response with the fields JobService reads"""
+    return {
+        "title": title,
+        "companyDetails": {COMPANY_KEY: {"companyResolutionResult": {"name": company, "url": "https://example.com"}}},
+        "formattedLocation": "United States",
+        "listedAt": int(datetime(2024, 1, 2).timestamp() * 1000),
+        "description": {"text": description},
+    }
+
+class FakeLinkedin:
+    """
+    Stands in for linkedin_api.Linkedin: job_id -> details dict, None, or an exception to raise.
+    Every search returns all of its jobs; calls are recorded.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.search_calls = []
+        self.get_job_calls = []
+
+    def search_jobs(self, **params):
+        self.search_calls.append(params)
+        return [{"entityUrn": f"urn:li:fs_normalized_jobPosting:{job_id}"} for job_id in self.jobs]
+
+    def get_job(self, job_id):
+        self.get_job_calls.append(job_id)
+        details = self.jobs[job_id]
+        if isinstance(details, Exception):
+            raise details
+        return details
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from backend.utils.ann_index import (
+    ANNIndex,
+    create_ann_index,
+    hash_word_vector,
+    hash_keyword_matrix,
+    faiss,
+    hnswlib,
+)
+from backend.utils.vector_utils import build_vocabulary, to_sparse_matrix
+
+BACKENDS = [
+    "brute",
+    pytest.param("faiss-flat", marks=pytest.mark.skipif(faiss is None, reason="faiss not installed")),
+    pytest.param("faiss-ivf", marks=pytest.mark.skipif(faiss is None, reason="faiss not installed")),
+    pytest.param("hnsw", marks=pytest.mark.skipif(hnswlib is None, reason="hnswlib not installed")),
+]
+
+@pytest.fixture
+def word_dicts():
+    rng = np.random.default_rng(7)
+    words = [f"word{i}" for i in range(300)]
+    return [
+        {str(w): int(rng.integers(1, 10)) for w in rng.choice(words, size=40, replace=False)}
+        for _ in range(500)
+    ]
+
+def test_ann_index_requires_add_and_search():
+    with pytest.raises(TypeError):
+        ANNIndex(8)
+
+def test_hash_keyword_matrix_matches_hash_word_vector(word_dicts):
+    vocabulary = build_vocabulary(word_dicts)
+    matrix = hash_keyword_matrix(to_sparse_matrix(word_dicts, vocabulary), vocabulary, 64)
+    for row, words in zip(matrix, word_dicts[:20]):
+        np.testing.assert_allclose(row, hash_word_vector(words, 64), atol=1e-5)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_index_finds_nearest_jobs(backend, word_dicts):
+    dim = 128
+    kwargs = {"nlist": 4} if backend == "faiss-ivf" else {}
+    index = create_ann_index(backend, dim, **kwargs)
+    vectors = np.stack([hash_word_vector(words, dim) for words in word_dicts])
+    # Add in two batches to exercise incremental appends
+    ids = [str(i) for i in range(len(word_dicts))]
+    index.add(ids[:100], vectors[:100])
+    index.add(ids[100:], vectors[100:])
+    assert len(index) == len(word_dicts)
+
+    results = index.search(vectors[123], 10)
+    assert results[0][0] == "123"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-4)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
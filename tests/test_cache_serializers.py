@@ -0,0 +1,39 @@
+import json
+import fakeredis
+import pytest
+from datetime import datetime
+from backend.utils.cache_serializers import SERIALIZERS, decode, get_serializer, is_encoded
+from backend.service.redis_service import RedisClient
+
+JOB = {
+    "job_id": "1",
+    "description": "Build backend services in Python. " * 50,
+    "listed_time": datetime(2024, 1, 2, 10, 0),
+    "features": {"skills": ["python", "aws"], "word_frequencies": {"python": 3, "service": 2}},
+}
+EXPECTED = json.loads(json.dumps({**JOB, "listed_time": "2024-01-02T10:00:00"}))
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_every_serializer_round_trips(name):
+    encoded = SERIALIZERS[name].dumps(JOB)
+    assert is_encoded(encoded)
+    assert decode(encoded) == EXPECTED
+
+def test_auto_picks_a_compressed_serializer():
+    serializer = get_serializer("auto")
+    assert len(serializer.dumps(JOB)) < len(json.dumps(EXPECTED))
+    assert get_serializer("legacy") is None
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
+
+def test_clients_read_entries_in_any_format():
+    server = fakeredis.FakeServer()
+    legacy = RedisClient(client=fakeredis.FakeRedis(server=server), serializer="legacy")
+    compact = RedisClient(client=fakeredis.FakeRedis(server=server), serializer="auto")
+
+    legacy.set("job:legacy", JOB)
+    compact.set("job:compact", JOB)
+
+    assert not is_encoded(legacy.client.get("job:legacy"))
+    assert compact.mget(["job:legacy", "job:compact"]) == [EXPECTED, EXPECTED]
+    assert legacy.get("job:compact") == EXPECTED
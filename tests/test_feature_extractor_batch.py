@@ -0,0 +1,42 @@
+import pytest
+from backend.utils.feature_extractors import FeatureExtractor, create_feature_pool
+from tests.conftest import requires_nltk_data
+
+pytestmark = requires_nltk_data
+
+JOB_TEXTS = [
+    f"Requirements\n{years}+ years of experience with Python, AWS and {tool}.\n\nBenefits\nRemote friendly."
+    for years, tool in zip(range(12), ["Docker", "Kubernetes", "React", "Java"] * 3)
+]
+
+@pytest.fixture(scope="module")
+def extractor():
+    return FeatureExtractor()
+
+def normalize(features):
+    return {**features, "skills": sorted(features["skills"])}
+
+def test_batch_features_match_sequential_in_order(extractor):
+    expected = [normalize(extractor.extract_job_features(text)) for text in JOB_TEXTS]
+
+    assert [normalize(f) for f in extractor.extract_job_features_batch(JOB_TEXTS, workers=2)] == expected
+    with create_feature_pool(2) as pool:
+        assert [normalize(f) for f in extractor.extract_job_features_batch(JOB_TEXTS, executor=pool)] == expected
+
+def test_batch_inline_and_empty(extractor):
+    assert extractor.extract_job_features_batch([]) == []
+    assert [normalize(f) for f in extractor.extract_job_features_batch(JOB_TEXTS[:2], workers=1)] == \
+        [normalize(extractor.extract_job_features(text)) for text in JOB_TEXTS[:2]]
+
+def test_single_pass_skills_match_the_section_by_section_path(extractor):
+    single_pass = FeatureExtractor(single_pass_skills=True)
+    # URLs and punctuation are dropped from the normalized text but not from the section text
+    job = ("Responsibilities\nBuild services in Python and Go. See https://github.com/acme/kubernetes-tools.\n"
+           "Requirements\n5+ years with PostgreSQL, React.js and C++.\nBenefits\nRemote friendly.")
+    resume = ("SUMMARY\nEngineer working with Node.js and AWS.\nEXPERIENCE\nSoftware Engineer  Jan 2020 - Present\n"
+              "Terraform (https://terraform.io/java).\nSKILLS\nPython, SQL, C#, CI/CD\n")
+
+    for text in [job] + JOB_TEXTS[:2]:
+        assert sorted(single_pass.extract_job_features(text)["skills"]) == sorted(extractor.extract_job_features(text)["skills"])
+    assert sorted(single_pass.extract_resume_features(resume)["skills"]) == \
+        sorted(extractor.extract_resume_features(resume)["skills"])
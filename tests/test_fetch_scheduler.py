@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+import pytest
+import requests
+from backend.service import fetch_scheduler
+from backend.service.fetch_scheduler import CircuitBreaker, CircuitOpenError, TokenBucket, UpstreamScheduler
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(fetch_scheduler, "UPSTREAM_BACKOFF_BASE", 0.001)
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=50, burst=2)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    # 2 tokens up front, 3 more at 50/s
+    assert time.monotonic() - started >= 0.05
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_calls_run_off_the_loop():
+    scheduler = UpstreamScheduler("test", max_concurrency=2, rate=0, burst=1)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def blocking_call(i):
+        with lock:
+            running.append(i)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(i)
+        return i
+
+    results = await asyncio.gather(*[scheduler.call(blocking_call, i) for i in range(6)])
+    assert results == list(range(6))
+    assert max(peak) == 2
+    stats = scheduler.stats()
+    assert (stats["succeeded"], stats["queue_depth"], stats["in_flight"]) == (6, 0, 0)
+    assert stats["latency_p50"] >= 0.02
+    scheduler.shutdown()
+
+@pytest.mark.asyncio
+async def test_retries_then_opens_circuit():
+    scheduler = UpstreamScheduler("test", max_concurrency=1, rate=0, burst=1, max_retries=2,
+                                  breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.05))
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert await scheduler.call(flaky) == "ok"
+    assert scheduler.stats()["retries"] == 2
+
+    def down():
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    # Each call counts once toward the breaker, however many attempts it made
+    for _ in range(3):
+        attempts.clear()
+        with pytest.raises(ConnectionError):
+            await scheduler.call(down)
+        assert len(attempts) == 3
+    assert scheduler.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await scheduler.call(flaky)
+
+    # After the reset timeout one trial call closes it again
+    await asyncio.sleep(0.06)
+    assert await scheduler.call(lambda: "back") == "back"
+    assert scheduler.breaker.state == "closed"
+    scheduler.shutdown()
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_not_retried():
+    scheduler = UpstreamScheduler("test", max_concurrency=1, rate=0, burst=1, max_retries=2,
+                                  breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30))
+    attempts = []
+
+    def not_found():
+        attempts.append(1)
+        raise KeyError("job")
+
+    def rate_limited():
+        attempts.append(1)
+        response = requests.Response()
+        response.status_code = 429
+        raise requests.HTTPError(response=response)
+
+    with pytest.raises(KeyError):
+        await scheduler.call(not_found)
+    assert len(attempts) == 1
+    assert scheduler.breaker.state == "closed"
+
+    attempts.clear()
+    with pytest.raises(requests.HTTPError):
+        await scheduler.call(rate_limited)
+    assert len(attempts) == 3
+    assert scheduler.breaker.state == "open"
+    scheduler.shutdown()
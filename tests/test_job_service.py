@@ -0,0 +1,85 @@
+import fakeredis.aioredis
+import pytest
+from backend.service import job_service
+from backend.service.job_service import JobService, SKIP_BLACKLISTED, SKIP_NOT_FOUND, SKIP_FETCH_FAILED
+from backend.service.redis_service import AsyncRedisClient
+from tests.fake_linkedin import COMPANY_KEY, FakeLinkedin, job_details
+from tests.conftest import requires_nltk_data
+
+# JobService builds a FeatureExtractor, which loads the NLTK corpora
+pytestmark = requires_nltk_data
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(job_service, "BLACK_LIST", ["Blocked Inc"])
+    service = JobService(async_redis_client=AsyncRedisClient(client=fakeredis.aioredis.FakeRedis()))
+    # A failed fetch is recorded after one attempt
+    service.linkedin_scheduler.max_retries = 0
+
+    async def not_in_database(job_id):
+        return None
+
+    async def save_jobs_bulk(jobs):
+        return {"inserted": [job["job_id"] for job in jobs], "updated": [], "failed": []}
+    monkeypatch.setattr(service.job_repo, "get_job_by_id", not_in_database)
+    monkeypatch.setattr(service.job_repo, "save_jobs_bulk", save_jobs_bulk)
+    yield service
+    service.shutdown()
+
+@pytest.mark.asyncio
+async def test_discarded_jobs_are_not_fetched_again(service):
+    service.linkedin_api = FakeLinkedin({
+        "1": {"companyDetails": {COMPANY_KEY: {"companyResolutionResult": {"name": "Blocked Inc"}}}},
+        "2": None,
+        "3": RuntimeError("rate limited"),
+    })
+
+    failures = []
+    assert await service.search_jobs({"keywords": "Engineer"}, failures) == []
+    assert failures == ["3"]
+    assert sorted(service.linkedin_api.get_job_calls) == ["1", "2", "3"]
+    _, skipped = await service.get_cached_jobs_and_skips(["1", "2", "3"])
+    assert skipped == {"1": SKIP_BLACKLISTED, "2": SKIP_NOT_FOUND, "3": SKIP_FETCH_FAILED}
+
+    # Served from the negative cache, without calling LinkedIn
+    service.job_skip_cache.local.clear()
+    failures = []
+    assert await service.search_jobs({"keywords": "Engineer"}, failures) == []
+    assert failures == []
+    assert await service.process_job({"entityUrn": "urn:li:fs_normalized_jobPosting:2"}) is None
+    assert len(service.linkedin_api.get_job_calls) == 3
+
+    # Short TTLs for transient failures
+    ttl = await service.async_redis_client.client.ttl("job_skip:3")
+    assert 0 < ttl <= job_service.JOB_SKIP_TTLS[SKIP_FETCH_FAILED]
+
+@pytest.mark.asyncio
+async def test_blacklist_entries_lapse_when_company_is_unblocked(service, monkeypatch):
+    await service.skip_job("1", SKIP_BLACKLISTED, "Blocked Inc")
+    assert await service.get_job_skip_reason("1") == SKIP_BLACKLISTED
+    monkeypatch.setattr(job_service, "BLACK_LIST", [])
+    assert await service.get_job_skip_reason("1") is None
+
+@pytest.mark.asyncio
+async def test_jobs_that_fail_to_save_are_not_left_cached(service, monkeypatch):
+    service.linkedin_api = FakeLinkedin({
+        "1": job_details("Engineer", "Acme", "Python developer"),
+        "2": job_details("Engineer", "Acme", "Java developer"),
+    })
+    saved = []
+
+    async def save_jobs_bulk(jobs):
+        ids = [job["job_id"] for job in jobs]
+        saved.extend(ids)
+        # Job 2 fails the first time it is saved
+        return {"inserted": [i for i in ids if i != "2" or saved.count("2") > 1], "updated": [],
+                "failed": [i for i in ids if i == "2" and saved.count("2") == 1]}
+    monkeypatch.setattr(service.job_repo, "save_jobs_bulk", save_jobs_bulk)
+
+    assert len(await service.search_jobs({"keywords": "Engineer"})) == 2
+    assert await service.get_cached_jobs(["1", "2"]) == {"1": await service.get_cached_job("1")}
+
+    # The unsaved job is fetched and saved again on the next search
+    assert len(await service.search_jobs({"keywords": "Engineer"})) == 2
+    assert saved == ["1", "2", "2"]
+    assert sorted(service.linkedin_api.get_job_calls) == ["1", "2", "2"]
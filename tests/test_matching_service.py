@@ -0,0 +1,276 @@
+import json
+import os
+import random
+import fakeredis.aioredis
+import numpy as np
+import pytest
+from backend.service.matching_service import MatchingService, select_top_k
+from backend.repository.jobFeatureStore import JobFeatureStore
+from backend.repository.resumeRepository import ResumeRepository
+from backend.service.redis_service import AsyncRedisClient
+from backend.service.tiered_cache import TieredCache
+
+SKILLS = ["python", "java", "react", "aws", "docker", "kubernetes", "sql", "redis", "go", "rust"]
+WORDS = ["engineer", "backend", "service", "cloud", "team", "data", "api", "scale", "design", "test"]
+
+def make_features(rng, experience_key):
+    return {
+        experience_key: rng.choice([None, 0, 1, 2.5, 4, 6, 10]),
+        "skills": rng.sample(SKILLS, rng.randint(0, 6)),
+        "word_frequencies": {word: rng.randint(1, 9) for word in rng.sample(WORDS, rng.randint(0, 8))}
+    }
+
+@pytest.fixture(autouse=True)
+def profile_cache(monkeypatch):
+    cache = TieredCache("test_resume_profiles", "resume_profile:", 60,
+                        AsyncRedisClient(client=fakeredis.aioredis.FakeRedis()))
+    monkeypatch.setattr(ResumeRepository, "profile_cache", cache)
+    return cache
+
+@pytest.fixture
+def matching_service():
+    return MatchingService(resume_service=None, job_service=None)
+
+@pytest.fixture
+def resume_and_jobs():
+    rng = random.Random(42)
+    resume = {"resume_id": "r1", "features": make_features(rng, "work_experience_years")}
+    jobs = [
+        {"job_id": str(i), "features": make_features(rng, "required_experience_years")}
+        for i in range(200)
+    ]
+    jobs.append({"job_id": "empty", "features": {}})
+    return resume, jobs
+
+def test_batch_scores_match_per_job_scores(matching_service, resume_and_jobs):
+    resume, jobs = resume_and_jobs
+    batch_scores = matching_service.score_jobs_batch(resume, jobs)
+
+    assert len(batch_scores) == len(jobs)
+    for job, score in zip(jobs, batch_scores):
+        assert score == pytest.approx(matching_service._calculate_match_score(resume, job), abs=1e-6)
+
+def test_batch_scores_empty_inputs(matching_service, resume_and_jobs):
+    resume, jobs = resume_and_jobs
+    assert len(matching_service.score_jobs_batch(resume, [])) == 0
+    assert not matching_service.score_jobs_batch({"resume_id": "r2", "features": {}}, jobs).any()
+
+def test_store_scores_match_per_job_scores(matching_service, resume_and_jobs, tmp_path):
+    resume, jobs = resume_and_jobs
+    store = JobFeatureStore(path=tmp_path / "jobs.npz", role="owner")
+    for job in jobs:
+        store.upsert(job["job_id"], job["features"])
+    # Replacing a row must drop its previous contents
+    store.snapshot()
+    store.upsert(jobs[0]["job_id"], jobs[1]["features"])
+    jobs[0] = {**jobs[0], "features": jobs[1]["features"]}
+    assert store.flush()
+
+    reloaded = JobFeatureStore(path=tmp_path / "jobs.npz")
+    job_ids, scores = matching_service.score_resume_against_store(resume, reloaded)
+
+    assert job_ids == [job["job_id"] for job in jobs]
+    for job, score in zip(jobs, scores):
+        assert score == pytest.approx(matching_service._calculate_match_score(resume, job), abs=1e-6)
+
+def test_reader_reloads_owner_flush_and_keeps_its_own_rows(resume_and_jobs, tmp_path):
+    _, jobs = resume_and_jobs
+    owner = JobFeatureStore(path=tmp_path / "jobs.npz", role="owner")
+    reader = JobFeatureStore(path=tmp_path / "jobs.npz", role="reader")
+    reader.upsert("reader-only", jobs[0]["features"])
+    assert not reader.flush()
+    assert not (tmp_path / "jobs.npz").exists()
+
+    for job in jobs[:10]:
+        owner.upsert(job["job_id"], job["features"])
+    assert owner.flush()
+    assert reader.reload_if_changed()
+    assert not reader.reload_if_changed()
+
+    assert len(reader) == 11
+    assert "reader-only" in reader and jobs[9]["job_id"] in reader
+
+def test_stored_job_candidates_are_rescored_exactly(matching_service, resume_and_jobs, tmp_path):
+    resume, jobs = resume_and_jobs
+    store = JobFeatureStore(path=tmp_path / "jobs.npz")
+    for job in jobs:
+        store.upsert(job["job_id"], job["features"])
+
+    job_ids, scores = matching_service.match_resume_to_stored_jobs(resume, k=25, store=store)
+
+    assert len(job_ids) == 25
+    jobs_by_id = {job["job_id"]: job for job in jobs}
+    for job_id, score in zip(job_ids, scores):
+        assert score == pytest.approx(matching_service._calculate_match_score(resume, jobs_by_id[job_id]), abs=1e-6)
+
+@pytest.mark.asyncio
+async def test_top_stored_matches_come_from_ann_candidates(matching_service, resume_and_jobs, tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.service.matching_service.ANN_CANDIDATES", 30)
+    resume, jobs = resume_and_jobs
+    store = JobFeatureStore(path=tmp_path / "jobs.npz")
+    for job in jobs:
+        store.upsert(job["job_id"], job["features"])
+    jobs_by_id = {job["job_id"]: job for job in jobs}
+
+    lookups = []
+
+    class JobServiceStub:
+        class job_repo:
+            async def get_jobs_by_ids(job_ids):
+                lookups.append(job_ids)
+                return [jobs_by_id[job_id] for job_id in job_ids]
+
+    matching_service.job_service = JobServiceStub()
+    candidates = set(matching_service.retrieve_candidate_jobs(resume, k=30, store=store))
+    matches = await matching_service.get_top_stored_matches(resume, limit=10, min_score=0, store=store)
+
+    assert len(matches) == 10
+    assert len(lookups) == 1 and len(lookups[0]) == 10
+    assert {match["job_id"] for match in matches} <= candidates
+    scores = [match["match_score"] for match in matches]
+    assert scores == sorted(scores, reverse=True)
+
+def test_ann_index_is_rebuilt_when_a_reload_renumbers_rows(matching_service, tmp_path):
+    path = tmp_path / "jobs.npz"
+    features = {"skills": ["python"], "word_frequencies": {"python": 3, "api": 1}}
+    owner = JobFeatureStore(path=path, role="owner")
+    for job_id in ["A", "B", "Z"]:
+        owner.upsert(job_id, features)
+    assert owner.flush()
+    reader = JobFeatureStore(path=path, role="reader")
+    resume = {"resume_id": "r1", "features": features}
+    assert sorted(matching_service.retrieve_candidate_jobs(resume, k=10, store=reader)) == ["A", "B", "Z"]
+
+    # The owner rewrites the file with new jobs ahead of the old ones
+    owner = JobFeatureStore(path=tmp_path / "other.npz", role="owner")
+    for job_id in ["X", "Y", "A", "B", "Z"]:
+        owner.upsert(job_id, features)
+    owner.path = path
+    assert owner.flush()
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert reader.reload_if_changed()
+
+    candidates = matching_service.retrieve_candidate_jobs(resume, k=10, store=reader)
+    assert sorted(candidates) == ["A", "B", "X", "Y", "Z"]
+    job_ids, _ = matching_service.score_resume_against_store(resume, reader, job_ids=["A", "A", "X"])
+    assert job_ids == ["A", "X"]
+
+@pytest.mark.asyncio
+async def test_sync_picks_up_jobs_committed_behind_the_cursor(tmp_path, monkeypatch):
+    from backend.repository import jobRepository
+    database = []
+
+    async def execute_query(query, params):
+        cursor, limit = params
+        return sorted((row for row in database if row["sync_seq"] > cursor), key=lambda row: row["sync_seq"])[:limit]
+    monkeypatch.setattr(jobRepository, "execute_query", execute_query)
+
+    def job(job_id, seq, skill="python"):
+        return {"job_id": job_id, "features": json.dumps({"skills": [skill]}), "sync_seq": seq}
+
+    store = JobFeatureStore(path=tmp_path / "jobs.npz", role="owner")
+    database.extend([job("1", 1), job("2", 2), job("4", 4)])
+    assert await jobRepository.JobRepository.sync_feature_store(store, batch_size=2) == 3
+    assert store.synced_seq == 4
+
+    # Sequence value 3 was taken before 4 but committed after the last sync
+    database.append(job("3", 3))
+    assert await jobRepository.JobRepository.sync_feature_store(store, batch_size=2) == 1
+    assert "3" in store and len(store) == 4
+
+    database.append(job("1", 5, skill="java"))
+    assert await jobRepository.JobRepository.sync_feature_store(store) == 1
+    assert store.skill_vocabulary["java"] in np.flatnonzero(np.unpackbits(store.snapshot()["skill_bits"][store.row_index["1"]]))
+
+def test_snapshot_is_not_changed_by_later_upserts(tmp_path):
+    store = JobFeatureStore(path=tmp_path / "jobs.npz")
+    store.upsert("1", {"skills": ["python"], "word_frequencies": {"python": 1}, "required_experience_years": 2})
+    snapshot = store.snapshot()
+    bits = snapshot["skill_bits"].copy()
+
+    store.upsert("1", {"skills": ["rust"], "word_frequencies": {"rust": 1}, "required_experience_years": 9})
+    store.upsert("2", {"skills": ["newskill"], "word_frequencies": {"other": 1}})
+
+    assert snapshot["job_ids"] == ["1"]
+    assert "rust" not in snapshot["word_vocabulary"] and "newskill" not in snapshot["skill_vocabulary"]
+    assert np.array_equal(snapshot["skill_bits"], bits)
+    assert snapshot["required_experience"].tolist() == [2.0]
+    assert not snapshot["skill_bits"].flags.writeable
+    assert store.snapshot() is not snapshot and store.snapshot()["required_experience"].tolist() == [9.0, 0.0]
+
+def test_select_top_k_matches_full_sort():
+    rng = random.Random(3)
+    scored = [(float(rng.randint(0, 100)), i) for i in range(1000)]
+
+    expected = sorted((pair for pair in scored if pair[0] >= 40), key=lambda pair: (-pair[0], pair[1]))[:50]
+    assert select_top_k(scored, k=50, min_score=40) == expected
+    assert select_top_k(scored, k=0) == []
+    assert len(select_top_k(scored)) == len(scored)
+
+@pytest.mark.asyncio
+async def test_match_resume_to_jobs_top_k(matching_service, resume_and_jobs):
+    resume, jobs = resume_and_jobs
+
+    class ResumeServiceStub:
+        async def get_resume_by_user_id(self, user_id):
+            return resume
+
+    matching_service.resume_service = ResumeServiceStub()
+    all_matches = await matching_service.match_resume_to_jobs(jobs, "1")
+    top_matches = await matching_service.match_resume_to_jobs(jobs, "1", k=10, min_score=20)
+
+    assert len(top_matches) == 10
+    assert [m["match_score"] for m in top_matches] == [m["match_score"] for m in all_matches[:10]]
+    assert all(m["match_score"] >= 20 for m in top_matches)
+
+def test_skill_bitsets_match_string_sets(matching_service, resume_and_jobs):
+    resume, jobs = resume_and_jobs
+    taxonomy = matching_service.skill_taxonomy
+    resume_skills = resume["features"]["skills"]
+    resume_bits = taxonomy.skills_to_bitset(resume_skills)
+
+    for job in jobs[:50]:
+        job_skills = job["features"].get("skills", [])
+        job_bits = taxonomy.skills_to_bitset(job_skills)
+        assert matching_service._calculate_skill_match_bits(resume_bits, job_bits) == \
+            matching_service._calculate_skill_match(resume_skills, job_skills)
+        details = matching_service._get_match_details(resume, job)
+        assert details["matched_skills"] == sorted(set(resume_skills) & set(job_skills))
+        assert details["missing_skills"] == sorted(set(job_skills) - set(resume_skills))
+
+def test_batch_scores_with_hex_bits_and_unknown_skills(matching_service, resume_and_jobs):
+    resume, jobs = resume_and_jobs
+    taxonomy = matching_service.skill_taxonomy
+    encoded = [
+        {**job, "features": {
+            **job["features"],
+            "skill_bits": format(taxonomy.skills_to_bitset(job["features"].get("skills", [])), 'x'),
+            "skill_ids_version": taxonomy.skill_ids_version
+        }} if job["features"] else job
+        for job in jobs
+    ]
+    expected = matching_service.score_jobs_batch(resume, jobs)
+    assert matching_service.score_jobs_batch(resume, encoded) == pytest.approx(expected)
+
+    # A skill outside the taxonomy switches the whole batch to string matching
+    jobs[0] = {**jobs[0], "features": {**jobs[0]["features"], "skills": jobs[0]["features"]["skills"] + ["cobol-on-mars"]}}
+    for job, score in zip(jobs, matching_service.score_jobs_batch(resume, jobs)):
+        assert score == pytest.approx(matching_service._calculate_match_score(resume, job), abs=1e-6)
+
+@pytest.mark.asyncio
+async def test_resume_profile_is_cached_and_reused(matching_service, resume_and_jobs, profile_cache):
+    resume, jobs = resume_and_jobs
+    resume = {**resume, "resume_id": "profile-r1"}
+    expected = matching_service.score_jobs_batch(resume, jobs)
+
+    assert await ResumeRepository.get_resume_profile("profile-r1") is None
+    profile = await matching_service.get_resume_profile(resume)
+    assert profile.skills == set(resume["features"]["skills"])
+
+    # Another worker reads the profile from Redis, and it scores identically
+    profile_cache.local.clear()
+    cached = await ResumeRepository.get_resume_profile("profile-r1")
+    assert cached.to_dict() == json.loads(json.dumps(profile.to_dict()))
+    assert matching_service.score_jobs_batch(resume, jobs, cached) == pytest.approx(expected)
+    assert profile_cache.stats()["redis_hits"] == 1
@@ -0,0 +1,120 @@
+import fakeredis.aioredis
+import pytest
+from backend.service import job_service, prefetch_service
+from backend.service.job_service import JobService
+from backend.service.prefetch_service import JobPrefetcher, PrefetchRegistry, search_key
+from backend.service.redis_service import AsyncRedisClient
+from tests.fake_linkedin import FakeLinkedin, job_details
+from tests.conftest import requires_nltk_data
+
+SEARCH = {"keywords": "Backend", "location_name": "United States", "experience": ["3", "2"], "limit": 10}
+
+@pytest.fixture
+def redis_client():
+    return AsyncRedisClient(client=fakeredis.aioredis.FakeRedis())
+
+def test_search_key_ignores_list_order():
+    assert search_key(SEARCH) == search_key({**SEARCH, "experience": ["2", "3"]})
+    assert search_key(SEARCH) != search_key({**SEARCH, "keywords": "Frontend"})
+
+@pytest.mark.asyncio
+async def test_registry_schedules_and_prunes_searches(redis_client, monkeypatch):
+    monkeypatch.setattr(prefetch_service, "PREFETCH_MAX_SEARCHES", 1)
+    registry = PrefetchRegistry(redis_client)
+
+    key = await registry.record_search(SEARCH, now=1000)
+    assert await registry.due_searches(now=1000) == [(key, SEARCH)]
+
+    await registry.store_results(key, ["1", "2"], now=1000)
+    assert await registry.get_results(key) == ["1", "2"]
+    assert await registry.due_searches(now=1001) == []
+    assert await registry.due_searches(now=1000 + 2 * prefetch_service.PREFETCH_INTERVAL) == [(key, SEARCH)]
+
+    # Only the most recently requested search is kept
+    other = await registry.record_search({**SEARCH, "keywords": "Frontend"}, now=2000)
+    assert await registry.prune(now=2000) == [key]
+    assert [due_key for due_key, _ in await registry.due_searches(now=2000)] == [other]
+
+    token = await registry.acquire(other)
+    assert token
+    assert await registry.acquire(other) is None
+    # A stale holder cannot release a lock another worker has since taken
+    assert not await registry.release(other, "stale-token")
+    assert await registry.acquire(other) is None
+    assert await registry.release(other, token)
+    assert await registry.acquire(other)
+
+class StubJobService:
+    """search_jobs returns the given jobs and reports the given job IDs as failed to fetch"""
+
+    def __init__(self, redis_client, jobs, failed_ids=()):
+        self.async_redis_client = redis_client
+        self.jobs = jobs
+        self.failed_ids = failed_ids
+
+    async def search_jobs(self, search_params, failures=None):
+        if failures is not None:
+            failures.extend(self.failed_ids)
+        return self.jobs
+
+    async def search_jobs_parallel(self, search_params_list, failures=None):
+        return await self.search_jobs(search_params_list[0], failures)
+
+@pytest.mark.asyncio
+async def test_incomplete_searches_do_not_replace_prefetched_results(redis_client):
+    prefetcher = JobPrefetcher(StubJobService(redis_client, [{"job_id": "1"}, {"job_id": "2"}]))
+    key = await prefetcher.registry.record_search(SEARCH)
+    assert await prefetcher.refresh(key, SEARCH) == 2
+    assert await prefetcher.registry.get_results(key) == ["1", "2"]
+
+    # Calls failed during the run, or it found nothing: the previous results stay
+    prefetcher.job_service.jobs, prefetcher.job_service.failed_ids = [{"job_id": "1"}], ["2"]
+    assert await prefetcher.refresh(key, SEARCH) is None
+    prefetcher.job_service.jobs, prefetcher.job_service.failed_ids = [], []
+    assert await prefetcher.refresh(key, SEARCH) is None
+    await prefetcher.search_live(SEARCH)
+    assert await prefetcher.registry.get_results(key) == ["1", "2"]
+    assert prefetcher.stats()["partial_results"] == 3
+
+@pytest.mark.asyncio
+@requires_nltk_data
+async def test_requests_read_jobs_prefetched_in_the_background(redis_client, monkeypatch):
+    monkeypatch.setattr(job_service, "FEATURE_EXTRACTION_WORKERS", 0)
+    service = JobService(async_redis_client=redis_client)
+    saved = {}
+
+    async def not_in_database(job_id):
+        return None
+
+    async def save_jobs_bulk(jobs):
+        saved.update((job["job_id"], job) for job in jobs)
+        return {"inserted": [job["job_id"] for job in jobs], "updated": [], "failed": []}
+
+    async def get_jobs_by_ids(job_ids):
+        return [saved[job_id] for job_id in job_ids if job_id in saved]
+    monkeypatch.setattr(service.job_repo, "get_job_by_id", not_in_database)
+    monkeypatch.setattr(service.job_repo, "save_jobs_bulk", save_jobs_bulk)
+    monkeypatch.setattr(service.job_repo, "get_jobs_by_ids", get_jobs_by_ids)
+    service.linkedin_api = FakeLinkedin({
+        "1": job_details("Backend Engineer", "Example Corp", "Python, AWS and PostgreSQL. 3+ years of experience."),
+        "2": job_details("Platform Engineer", "Example Corp", "Kubernetes and Go. 5+ years of experience."),
+    })
+    prefetcher = JobPrefetcher(service)
+
+    # A user's search is saved; the background run ingests and featurizes its jobs
+    assert await prefetcher.get_prefetched_jobs(SEARCH) is None
+    await prefetcher.record_search(SEARCH)
+    assert list((await prefetcher.run_once()).values()) == [2]
+    assert len(service.linkedin_api.search_calls) == 1
+
+    # The next request is served without LinkedIn, from the cache, or the database once the cache is cold
+    jobs = await prefetcher.get_prefetched_jobs(SEARCH)
+    assert [job["job_id"] for job in jobs] == ["1", "2"]
+    assert "skills" in jobs[0]["features"]
+    service.job_cache.local.clear()
+    await redis_client.client.flushdb()
+    await prefetcher.registry.store_results(search_key(SEARCH), ["1", "2"])
+    assert [job["job_id"] for job in await prefetcher.get_prefetched_jobs(SEARCH)] == ["1", "2"]
+    assert len(service.linkedin_api.search_calls) == 1
+    assert sorted(service.linkedin_api.get_job_calls) == ["1", "2"]
+    service.shutdown()
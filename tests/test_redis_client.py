@@ -0,0 +1,62 @@
+import asyncio
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from datetime import datetime
+from backend.service.redis_service import RedisClient, AsyncRedisClient, get_connection_pool
+
+@pytest.fixture
+def redis_client():
+    client = RedisClient(client=fakeredis.FakeRedis())
+    yield client
+    client.client.flushall()
+
+def test_clients_share_one_connection_pool():
+    assert RedisClient().client.connection_pool is RedisClient().client.connection_pool
+    assert get_connection_pool("localhost", 6379, 0) is get_connection_pool("localhost", 6379, 0)
+    assert get_connection_pool("localhost", 6379, 1) is not get_connection_pool("localhost", 6379, 0)
+
+def test_mget_and_mset_with_ttl(redis_client):
+    redis_client.mset_with_ttl({
+        "job:1": {"job_id": "1", "processed_date": datetime(2024, 1, 2)},
+        "job:2": "plain"
+    }, ex=60)
+
+    assert redis_client.mget(["job:1", "missing", "job:2"]) == [
+        {"job_id": "1", "processed_date": "2024-01-02T00:00:00"}, None, "plain"
+    ]
+    assert 0 < redis_client.client.ttl("job:1") <= 60
+    assert redis_client.mget([]) == []
+
+def test_pipeline_decodes_replies_in_order(redis_client):
+    with redis_client.pipeline() as pipe:
+        pipe.set("a", {"x": 1}).get("a").exists("a").get("b")
+
+    assert pipe.results == [True, {"x": 1}, 1, None]
+
+@pytest.mark.asyncio
+async def test_async_client_mirrors_sync_serialization():
+    client = AsyncRedisClient(client=fakeredis.aioredis.FakeRedis())
+    await client.set("job:1", {"job_id": "1", "listed_time": datetime(2024, 1, 2)}, ex=60)
+    await client.mset_with_ttl({"job:2": [1, 2], "job:3": "plain"}, ex=60)
+
+    assert await client.get("job:1") == {"job_id": "1", "listed_time": "2024-01-02T00:00:00"}
+    assert await client.mget(["job:2", "missing", "job:3"]) == [[1, 2], None, "plain"]
+    assert await client.exists("job:3")
+
+    async with client.pipeline() as pipe:
+        pipe.delete("job:3").get("job:3")
+    assert pipe.results == [1, None]
+
+def test_async_clients_get_one_pool_per_event_loop():
+    client = AsyncRedisClient()
+
+    async def pool():
+        # The same client and pool are reused within a loop
+        assert client.client is client.client
+        return client.client.connection_pool
+
+    first, second = asyncio.run(pool()), asyncio.run(pool())
+    assert first is not second
+    with pytest.raises(RuntimeError):
+        client.client
@@ -0,0 +1,51 @@
+import random
+import re
+import pytest
+from backend.utils.skill_matcher import SkillMatcher
+from backend.utils.skills_taxonomy import SkillTaxonomy
+
+def extract_skills_with_regex(taxonomy, text):
+    """The original per-skill regex scan that SkillMatcher replaces"""
+    text = text.lower()
+    return {
+        taxonomy.skill_aliases.get(skill, skill)
+        for skill in taxonomy.skills_list
+        if re.search(r'\b' + re.escape(skill) + r'\b', text)
+    }
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy()
+
+def test_matcher_respects_word_boundaries():
+    matcher = SkillMatcher({"java": "java", "javascript": "javascript", "c++": "c++", "react.js": "react"})
+    text = "javascript, java_x, java. react.js c++x"
+
+    assert matcher.find_all(text) == [
+        (0, 10, "javascript"),
+        (20, 24, "java"),
+        (26, 34, "react"),
+        # Like \bc\+\+\b, "c++" only matches when a word character follows it
+        (35, 38, "c++"),
+    ]
+
+def test_extract_skills_matches_regex_scan(taxonomy):
+    rng = random.Random(1)
+    vocabulary = list(taxonomy.skills_list) + ["foo", "bar", "+", ".", "#", "_", "c", "x"]
+    texts = ["Python3, React.js and Node.js on AWS; CI/CD with C++ and C#, Golang"]
+    for _ in range(200):
+        texts.append(" ".join(
+            rng.choice(vocabulary) + rng.choice(["", " ", ", ", ".", "-", "_"]) for _ in range(30)
+        ))
+
+    for text in texts:
+        assert set(taxonomy.extract_skills(text)) == extract_skills_with_regex(taxonomy, text)
+
+def test_find_skill_spans_offsets(taxonomy):
+    text = "Built APIs in Python and ReactJS"
+    spans = taxonomy.find_skill_spans(text)
+
+    assert ("python" in {skill for _, _, skill in spans}) and ("react" in {skill for _, _, skill in spans})
+    for start, end, skill in spans:
+        matched = text[start:end].lower()
+        assert taxonomy.skill_aliases.get(matched, matched) == skill
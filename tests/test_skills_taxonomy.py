@@ -0,0 +1,56 @@
+import json
+import pickle
+import pytest
+from backend.utils.skills_taxonomy import (
+    SkillTaxonomy, get_skill_taxonomy, load_compiled_taxonomy, save_compiled_taxonomy, TAXONOMY_PATH
+)
+
+@pytest.fixture
+def taxonomy_file(tmp_path):
+    path = tmp_path / "skills_taxonomy.json"
+    path.write_text(json.dumps({
+        "Backend": {"Languages": [{"name": "Python", "aliases": ["py"]}, "Go"]},
+        "Cloud": {"Providers": [{"name": "AWS", "aliases": ["Amazon Web Services"]}]}
+    }))
+    return path
+
+def test_registry_returns_one_shared_taxonomy():
+    assert get_skill_taxonomy() is get_skill_taxonomy()
+    assert get_skill_taxonomy().content_hash == SkillTaxonomy(TAXONOMY_PATH).content_hash
+
+def test_canonical_ids_follow_file_order(taxonomy_file):
+    taxonomy = SkillTaxonomy(taxonomy_file)
+    assert taxonomy.canonical_skills == ("python", "go", "aws")
+    assert dict(taxonomy.skill_ids) == {"python": 0, "go": 1, "aws": 2}
+    assert taxonomy.get_skill_vector(["PY", "aws"]) == [1, 0, 1]
+    with pytest.raises(TypeError):
+        taxonomy.skill_aliases["js"] = "javascript"
+
+def test_compiled_artifact_round_trip_and_invalidation(taxonomy_file, tmp_path):
+    artifact = tmp_path / "compiled.pkl"
+    taxonomy = get_skill_taxonomy(taxonomy_file, artifact_path=artifact)
+    assert artifact.exists()
+
+    loaded = load_compiled_taxonomy(taxonomy.content_hash, artifact)
+    assert loaded.extract_skills("Python and Amazon Web Services") == taxonomy.extract_skills("Python and Amazon Web Services")
+    assert dict(pickle.loads(pickle.dumps(taxonomy)).skill_aliases) == dict(taxonomy.skill_aliases)
+
+    # Editing the taxonomy changes its hash, so the old artifact is ignored
+    taxonomy_file.write_text(taxonomy_file.read_text().replace('"Go"', '"Rust"'))
+    assert load_compiled_taxonomy(SkillTaxonomy(taxonomy_file).content_hash, artifact) is None
+
+def test_artifact_is_written_to_its_own_directory_without_leftover_temp_files(taxonomy_file, tmp_path):
+    artifact = tmp_path / "cache" / "compiled.pkl"
+    assert save_compiled_taxonomy(SkillTaxonomy(taxonomy_file), artifact)
+    assert save_compiled_taxonomy(SkillTaxonomy(taxonomy_file), artifact)
+    assert [path.name for path in artifact.parent.iterdir()] == ["compiled.pkl"]
+
+def test_skill_bitsets_round_trip(taxonomy_file):
+    taxonomy = SkillTaxonomy(taxonomy_file)
+    bits = taxonomy.skills_to_bitset(["AWS", "python"])
+    assert bits == 0b101
+    assert taxonomy.bitset_to_skills(bits) == ["python", "aws"]
+    assert taxonomy.skills_to_bitset(["py"]) is None  # aliases have no ID of their own
+    assert taxonomy.bitset_from_features({"skills": ["go"]}) == 0b010
+    assert taxonomy.bitset_from_features({"skills": [], "skill_bits": "4", "skill_ids_version": taxonomy.skill_ids_version}) == 0b100
+    assert taxonomy.bitset_from_features({"skills": ["go"], "skill_bits": "4", "skill_ids_version": "stale"}) == 0b010
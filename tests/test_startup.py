@@ -0,0 +1,40 @@
+from backend.core.startup import warm_up
+from backend.api import routes
+
+def test_importing_routes_does_not_create_services():
+    assert routes.get_resume_service.cache_info().currsize == 0
+    assert routes.get_job_service.cache_info().currsize == 0
+    assert routes.get_matching_service.cache_info().currsize == 0
+    assert routes.get_job_prefetcher.cache_info().currsize == 0
+
+def test_warm_up_times_each_step_and_survives_failures():
+    calls = []
+
+    def failing_step():
+        raise RuntimeError("model missing")
+
+    timings = warm_up([("first", lambda: calls.append("first")), ("broken", failing_step), ("last", lambda: calls.append("last"))])
+
+    assert calls == ["first", "last"]
+    assert list(timings) == ["first", "broken", "last"]
+    assert all(seconds >= 0 for seconds in timings.values())
+
+def test_job_feature_store_loads_on_warm_up_not_on_import(monkeypatch, tmp_path):
+    from backend.core import startup
+    from backend.core.config import settings
+    from backend.repository import jobFeatureStore
+
+    monkeypatch.setattr(jobFeatureStore, "_store", None)
+    monkeypatch.setattr(settings, "JOB_FEATURE_STORE_PATH", str(tmp_path / "jobs.npz"))
+    saved = jobFeatureStore.JobFeatureStore(role="owner")
+    saved.upsert("1", {"skills": ["python"], "word_frequencies": {"python": 2}})
+    assert saved.flush()
+
+    assert jobFeatureStore._store is None
+    warm_up([("job_feature_store", startup._warm_up_job_feature_store)])
+    assert jobFeatureStore._store is not None
+    assert "1" in jobFeatureStore.get_job_feature_store()
+
+def test_job_feature_store_is_a_reader_unless_configured_as_owner(tmp_path):
+    from backend.repository.jobFeatureStore import JobFeatureStore, ROLE_READER
+    assert JobFeatureStore(path=tmp_path / "jobs.npz").role == ROLE_READER
@@ -0,0 +1,37 @@
+import pytest
+from backend.utils.text_processor import TextProcessor
+from backend.utils.lemma_table import build_lemma_table, load_lemma_table
+from tests.conftest import requires_nltk_data
+
+pytestmark = requires_nltk_data
+
+TEXT = "Engineers building services and APIs. Our engineers own services, APIs and databases."
+
+def test_lemma_cache_matches_wordnet():
+    processor = TextProcessor(lemma_table={})
+    tokens = processor.preprocess(TEXT, lemmatize=False)
+
+    assert processor.preprocess(TEXT) == [processor.lemmatizer.lemmatize(token) for token in tokens]
+    processor.preprocess(TEXT)
+    info = processor.lemma_cache_info()
+    assert info["cache_misses"] == len(set(tokens))
+    assert info["cache_hits"] == 2 * len(tokens) - len(set(tokens))
+
+def test_lemma_table_skips_wordnet(tmp_path):
+    path = tmp_path / "lemmas.json"
+    table = build_lemma_table([TEXT], path=path, min_count=1)
+    assert load_lemma_table(path) == table
+
+    processor = TextProcessor(lemma_table=table)
+    assert processor.preprocess(TEXT) == TextProcessor(lemma_table={}).preprocess(TEXT)
+    assert processor.lemma_cache_info()["cache_misses"] == 0
+
+def test_missing_lemma_table(tmp_path):
+    assert load_lemma_table(tmp_path / "missing.json") == {}
+
+def test_fast_tokenizer_matches_nltk_on_plain_text():
+    assert TextProcessor(tokenizer='fast').preprocess(TEXT) == TextProcessor(tokenizer='nltk').preprocess(TEXT)
+
+def test_unknown_tokenizer():
+    with pytest.raises(ValueError):
+        TextProcessor(tokenizer='spacy')
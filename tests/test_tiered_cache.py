@@ -0,0 +1,127 @@
+import asyncio
+import json
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from backend.service import tiered_cache
+from backend.service.redis_service import AsyncRedisClient
+from backend.service.tiered_cache import (
+    LocalTTLCache, TieredCache, handle_invalidation_message, get_cache_stats, CACHE_INVALIDATION_CHANNEL
+)
+
+@pytest.fixture
+def cache():
+    client = AsyncRedisClient(client=fakeredis.aioredis.FakeRedis())
+    return TieredCache("test_jobs", "job:", 60, client)
+
+def test_local_cache_is_bounded_and_expires():
+    local = LocalTTLCache(max_entries=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)  # evicts b, the least recently used
+    assert [local.get(key) for key in "abc"] == [(True, 1), (False, None), (True, 3)]
+
+    local.set("d", 4, ttl=-1)
+    assert local.get("d") == (False, None)
+
+@pytest.mark.asyncio
+async def test_read_through_fills_both_tiers_and_counts_hits(cache):
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return {"job_id": "1"}
+
+    assert await cache.get("1", loader) == {"job_id": "1"}
+    assert await cache.get("1", loader) == {"job_id": "1"}
+    assert len(loads) == 1
+    assert await cache.redis_client.get("job:1") == {"job_id": "1"}
+
+    # Another worker's local tier is empty, so it reads Redis
+    cache.local.clear()
+    assert await cache.get("1") == {"job_id": "1"}
+    assert await cache.get("missing") is None
+
+    stats = get_cache_stats()["test_jobs"]
+    assert (stats["loader_hits"], stats["local_hits"], stats["redis_hits"], stats["misses"]) == (1, 1, 1, 1)
+    assert stats["local_hit_rate"] == 0.25
+
+@pytest.mark.asyncio
+async def test_write_through_publishes_invalidation(cache):
+    pubsub = cache.redis_client.client.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+
+    await cache.set_many({"1": {"v": 1}, "2": {"v": 2}})
+    assert await cache.get_many(["1", "2", "3"]) == {"1": {"v": 1}, "2": {"v": 2}}
+    assert await cache.redis_client.mget(["job:1", "job:2"]) == [{"v": 1}, {"v": 2}]
+
+    # The first read may only consume the subscribe confirmation
+    message = await pubsub.get_message(timeout=1) or await pubsub.get_message(timeout=1)
+    assert json.loads(message["data"])["keys"] == ["1", "2"]
+    # Messages from this process are ignored; other workers evict their local copy
+    assert not handle_invalidation_message(message["data"])
+    other = json.dumps({"origin": "other-worker", "cache": "test_jobs", "keys": ["1"]})
+    assert handle_invalidation_message(other)
+    assert cache.local.get("1") == (False, None)
+
+    await cache.invalidate("2")
+    assert await cache.get("2") is None
+    await pubsub.aclose()
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(cache):
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return {"job_id": "1"}
+
+    results = await asyncio.gather(*[cache.get("1", loader) for _ in range(10)])
+    assert results == [{"job_id": "1"}] * 10
+    assert len(loads) == 1
+    assert cache.stats()["coalesced_loads"] == 9
+    assert await cache.redis_client.client.get("job:1:lock") is None
+
+@pytest.mark.asyncio
+async def test_expired_lock_taken_by_another_worker_is_not_released(cache):
+    await cache.redis_client.client.set("job:1:lock", "other-worker")
+    await cache._release_lock("job:1:lock", "expired-token")
+    assert await cache.redis_client.client.get("job:1:lock") == b"other-worker"
+    await cache._release_lock("job:1:lock", "other-worker")
+    assert await cache.redis_client.client.get("job:1:lock") is None
+    assert cache.stats()["redis_errors"] == 0
+
+@pytest.mark.asyncio
+async def test_waits_for_load_locked_by_another_worker(cache, monkeypatch):
+    monkeypatch.setattr(tiered_cache, "LOAD_LOCK_POLL_INTERVAL", 0.01)
+    other = TieredCache("test_jobs_other_worker", "job:", 60, cache.redis_client)
+    await cache.redis_client.client.set("job:1:lock", "other-worker")
+
+    async def loader():
+        raise AssertionError("the worker holding the lock loads this key")
+
+    async def other_worker_loads():
+        await asyncio.sleep(0.05)
+        await other.set("1", {"job_id": "1"})
+
+    value, _ = await asyncio.gather(cache.get("1", loader), other_worker_loads())
+    assert value == {"job_id": "1"}
+    assert cache.stats()["lock_waits"] == 1
+
+@pytest.mark.asyncio
+async def test_hot_key_is_refreshed_before_expiry(cache):
+    versions = iter([1, 2])
+
+    async def loader():
+        return {"version": next(versions)}
+
+    assert await cache.get("1", loader) == {"version": 1}
+    # Loads "take" far longer than the remaining TTL, so the next Redis hit refreshes
+    cache._load_seconds = 1e9
+    cache.local.clear()
+    assert await cache.get("1", loader) == {"version": 1}
+    await asyncio.gather(*cache._refreshes.values())
+    assert await cache.redis_client.get("job:1") == {"version": 2}
+    assert cache.stats()["early_refreshes"] == 1